@@ -0,0 +1,32 @@
+"""title_lower_indexes
+
+Revision ID: d73363f07a76
+Revises: 394e2f71958e
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd73363f07a76'
+down_revision: Union[str, None] = '394e2f71958e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expression indexes backing lower(col) LIKE lower(:q) title/name search
+    op.create_index('idx_movies_title_lower', 'movies', [sa.text('lower(title) text_pattern_ops')], unique=False)
+    op.create_index('idx_movies_original_title_lower', 'movies', [sa.text('lower(original_title) text_pattern_ops')], unique=False)
+    op.create_index('idx_cast_name_lower', 'cast', [sa.text('lower(name) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cast_name_lower', table_name='cast')
+    op.drop_index('idx_movies_original_title_lower', table_name='movies')
+    op.drop_index('idx_movies_title_lower', table_name='movies')
@@ -0,0 +1,33 @@
+"""title_trigram_indexes
+
+Revision ID: cb8e17ab58df
+Revises: d73363f07a76
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb8e17ab58df'
+down_revision: Union[str, None] = 'd73363f07a76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Trigram indexes serve substring title/name search (lower(col) LIKE '%q%')
+    op.create_index('idx_movies_title_trgm', 'movies', [sa.text('lower(title) gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('idx_movies_original_title_trgm', 'movies', [sa.text('lower(original_title) gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('idx_cast_name_trgm', 'cast', [sa.text('lower(name) gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cast_name_trgm', table_name='cast', postgresql_using='gin')
+    op.drop_index('idx_movies_original_title_trgm', table_name='movies', postgresql_using='gin')
+    op.drop_index('idx_movies_title_trgm', table_name='movies', postgresql_using='gin')
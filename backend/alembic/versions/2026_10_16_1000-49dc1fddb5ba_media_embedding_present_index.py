@@ -0,0 +1,27 @@
+"""media_embedding_present_index
+
+Revision ID: 49dc1fddb5ba
+Revises: cb8e17ab58df
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '49dc1fddb5ba'
+down_revision: Union[str, None] = 'cb8e17ab58df'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_media_embedding_present', 'media_embedding', ['media_id'], unique=False, postgresql_where=sa.text('embedding IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_media_embedding_present', table_name='media_embedding', postgresql_where=sa.text('embedding IS NOT NULL'))
@@ -0,0 +1,30 @@
+"""popular_top_rated_indexes
+
+Revision ID: 020aac76b4e7
+Revises: 49dc1fddb5ba
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '020aac76b4e7'
+down_revision: Union[str, None] = '49dc1fddb5ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partial ordered indexes serving get_popular / get_top_rated ORDER BY ... LIMIT
+    op.create_index('idx_movies_popular', 'movies', [sa.text('popularity DESC')], unique=False, postgresql_where=sa.text('vote_count >= 100'))
+    op.create_index('idx_movies_top_rated', 'movies', [sa.text('vote_average DESC'), sa.text('vote_count DESC')], unique=False, postgresql_where=sa.text('vote_count >= 500'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_movies_top_rated', table_name='movies', postgresql_where=sa.text('vote_count >= 500'))
+    op.drop_index('idx_movies_popular', table_name='movies', postgresql_where=sa.text('vote_count >= 100'))
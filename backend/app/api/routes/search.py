@@ -9,6 +9,7 @@ Provides endpoints for:
 - Trending movies
 """
 
+import threading
 import time
 
 from fastapi import APIRouter, Depends, status
@@ -33,6 +34,7 @@ from app.api.dependencies import (
     get_filter_engine,
     make_rate_limit_dependency,
 )
+from app.core.cache_manager import get_cache_manager
 from app.core.config import settings
 from app.api.exceptions import ValidationException
 from app.core.cache_strategies import (
@@ -43,7 +45,7 @@ from app.core.cache_strategies import (
     TrendingCacheStrategy,
 )
 from app.schemas.movie import MovieResponse
-from app.schemas.query import ParsedQuery, QueryConstraints, QueryIntent
+from app.schemas.query import ParsedQuery, QueryConstraints, QueryIntent, QueryParserConfig
 from app.schemas.search import SearchFilters, SearchRequest, SearchResponse
 from app.services.constraint_validator import ConstraintValidator
 from app.services.filter_engine import FilterEngine
@@ -103,9 +105,28 @@ _search_rate_limit = make_rate_limit_dependency(settings.RATE_LIMIT_SEARCH_PER_M
 
 
 
+_query_parser: QueryParser | None = None
+_query_parser_lock = threading.Lock()
+
+
 def get_query_parser() -> QueryParser:
-    """Dependency for query parser service."""
-    return QueryParser()
+    """
+    Dependency for query parser service.
+
+    Shared, so its parse cache persists across requests; parse results are also
+    kept in Redis so other workers and restarts reuse them.
+    """
+    global _query_parser  # noqa: PLW0603
+
+    if _query_parser is None:
+        with _query_parser_lock:
+            if _query_parser is None:
+                _query_parser = QueryParser(
+                    config=QueryParserConfig(titles_index_path=settings.QUERY_TITLES_INDEX_PATH),
+                    shared_cache=get_cache_manager(),
+                )
+
+    return _query_parser
 
 
 def get_retrieval_engine(db: DatabaseSession) -> SemanticRetrievalEngine:
@@ -188,7 +209,7 @@ async def search_movies(
 
     # Step 1: Parse query to extract intent
     try:
-        query_intent = query_parser.parse(request.query)
+        query_intent = await query_parser.aparse(request.query)
         logger.info(f"Parsed intent: {query_intent.model_dump()}")
     except Exception as exc:
         logger.error(f"Query parsing failed: {exc}")
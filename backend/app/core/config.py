@@ -78,6 +78,10 @@ class Settings(BaseSettings):
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
     GROQ_MAX_TOKENS: int = 1024
     GROQ_TEMPERATURE: float = 0.7
+    GROQ_RPS: float = 0.0  # client-side throttle (free tier: 0.5 = 30 RPM); <= 0 disables
+    GROQ_BURST: int = 30
+    GROQ_ACQUIRE_TIMEOUT: float = 2.0  # fail over to the next provider past this throttle wait
+    GROQ_MAX_PAUSE: float = 60.0  # cap on server-requested (Retry-After / reset) pauses
 
     # Ollama (Local LLM)
     OLLAMA_BASE_URL: str = "http://localhost:11434"
@@ -91,6 +95,8 @@ class Settings(BaseSettings):
     SEARCH_TOP_K: int = 50  # Initial retrieval count
     RERANK_TOP_K: int = 10  # Final results after re-ranking
     MIN_SIMILARITY_SCORE: float = 0.5
+    QUERY_TEXT_CACHE: bool = True  # LRU-cache embedding text built from parsed queries
+    QUERY_TITLES_INDEX_PATH: str | None = None  # Known titles, one per line, for query parsing
 
     # Multi-Signal Scoring Weights
     WEIGHT_SEMANTIC: float = 0.5
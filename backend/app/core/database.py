@@ -1,9 +1,8 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
 
@@ -15,7 +14,14 @@ def _engine_kwargs() -> dict:
     Supabase free tier has a 60-connection limit — keep pool small.
     pool_recycle=300 handles Supabase's 5-minute idle connection timeout.
     Upgrading to Supabase Pro raises the limit to 200+; bump pool_size then.
+    executemany_mode="values_plus_batch" batches executemany INSERTs into
+    multi-row VALUES and other executemany statements with execute_batch;
+    it is a psycopg2 dialect argument, so other drivers go without it.
     """
+    dialect_kwargs: dict[str, str] = {}
+    if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+        dialect_kwargs["executemany_mode"] = "values_plus_batch"
+
     is_supabase = "supabase.co" in settings.DATABASE_URL or "pooler.supabase.com" in settings.DATABASE_URL
     if is_supabase:
         return {
@@ -28,12 +34,14 @@ def _engine_kwargs() -> dict:
                 "connect_timeout": 10,
                 "application_name": "filmfind-backend",
             },
+            **dialect_kwargs,
         }
     return {
         "echo": settings.DB_ECHO,
         "pool_pre_ping": True,
         "pool_size": 10,
         "max_overflow": 20,
+        **dialect_kwargs,
     }
 
 
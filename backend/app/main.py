@@ -18,6 +18,7 @@ from app.core.middleware import (
 from app.api.routes import admin, health, search, sixty
 from app.core.config import settings
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.services.llm_client import close_http_pool
 from app.utils.logger import get_logger
 
 
@@ -65,6 +66,9 @@ async def lifespan(app: FastAPI):  # noqa: ARG001, ANN201
     # Stop background job scheduler
     stop_scheduler()
 
+    # Close pooled LLM provider connections
+    close_http_pool()
+
     logger.info("Application shutdown complete")
 
 
@@ -26,6 +26,7 @@ from sqlalchemy import (
     String,
     Table,
     Text,
+    func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship, validates
@@ -192,6 +193,49 @@ class Movie(Resource, Base):
         return "movie"
 
 
+# Expression indexes for case-insensitive title search (lower(col) LIKE lower(:q)).
+# text_pattern_ops lets prefix patterns ('q%') use a B-tree regardless of collation;
+# pg_trgm GIN indexes serve substring patterns ('%q%'), which no B-tree can.
+# Declared after the class because the title columns come from the Resource mixin.
+Index(
+    "idx_movies_title_lower",
+    func.lower(Movie.title).label("title_lower"),
+    postgresql_ops={"title_lower": "text_pattern_ops"},
+)
+Index(
+    "idx_movies_original_title_lower",
+    func.lower(Movie.original_title).label("original_title_lower"),
+    postgresql_ops={"original_title_lower": "text_pattern_ops"},
+)
+Index(
+    "idx_movies_title_trgm",
+    func.lower(Movie.title).label("title_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"title_lower": "gin_trgm_ops"},
+)
+Index(
+    "idx_movies_original_title_trgm",
+    func.lower(Movie.original_title).label("original_title_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"original_title_lower": "gin_trgm_ops"},
+)
+
+# Partial ordered indexes for the popular / top-rated listings: the planner reads
+# the first `limit` qualifying rows straight off the index instead of sorting.
+# Thresholds match the smallest default min_vote_count of MovieRepository
+# get_popular (100) / get_top_rated (500); larger thresholds are implied by them.
+Index(
+    "idx_movies_popular",
+    Movie.popularity.desc(),
+    postgresql_where=Movie.vote_count >= 100,
+)
+Index(
+    "idx_movies_top_rated",
+    Movie.vote_average.desc(),
+    Movie.vote_count.desc(),
+    postgresql_where=Movie.vote_count >= 500,
+)
+
 
 # TVShow (concrete table — all Resource columns live here)
 
@@ -288,6 +332,13 @@ class MediaEmbedding(Base):
             postgresql_ops={"embedding": "vector_cosine_ops"},
             postgresql_with={"m": 16, "ef_construction": 64},
         ),
+        # Narrow partial index for "which media have an embedding" counts and
+        # joins, so they skip the vector heap rows
+        Index(
+            "idx_media_embedding_present",
+            "media_id",
+            postgresql_where=embedding.isnot(None),
+        ),
     )
 
 
@@ -363,3 +414,17 @@ class Cast(Base):
     updated_at   = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     media_items = relationship("Media", secondary=media_cast, back_populates="cast_members")
+
+    __table_args__ = (
+        Index(
+            "idx_cast_name_lower",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "idx_cast_name_trgm",
+            func.lower(name).label("name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"name_lower": "gin_trgm_ops"},
+        ),
+    )
@@ -13,6 +13,7 @@ Design Patterns:
 
 from typing import Generic, Optional, TypeVar
 
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session
 
 from app.core.database import Base
@@ -88,13 +89,18 @@ class BaseRepository(Generic[ModelType]):
             List of created model instances
 
         Note:
-            More efficient than multiple create() calls as it uses bulk insert.
+            More efficient than multiple create() calls: one commit for the
+            batch, and one SELECT reloading the whole batch (server defaults
+            included) instead of a refresh per object.
         """
 
         self.db.add_all(objects)
+        self.db.flush()
+        ids = [obj.id for obj in objects]
         self.db.commit()
-        for obj in objects:
-            self.db.refresh(obj)
+
+        # Equivalent to refresh() on every object, in a single round-trip
+        self.db.query(self.model).filter(self.model.id.in_(ids)).populate_existing().all()
         return objects
 
     # =============================================================================
@@ -123,10 +129,10 @@ class BaseRepository(Generic[ModelType]):
             limit: Maximum number of records to return
 
         Returns:
-            List of model instances
+            List of model instances, ordered by ID so pages are stable
         """
 
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return self.db.query(self.model).order_by(self.model.id).offset(skip).limit(limit).all()
 
     def count(self) -> int:
         """
@@ -136,7 +142,8 @@ class BaseRepository(Generic[ModelType]):
             Total count of records in table
         """
 
-        return self.db.query(self.model).count()
+        # A bare COUNT(id), not Query.count()'s COUNT(*) over a wrapping subquery
+        return int(self.db.query(func.count(self.model.id)).scalar())
 
     def exists(self, id: int) -> bool:
         """
@@ -149,7 +156,8 @@ class BaseRepository(Generic[ModelType]):
             True if exists, False otherwise
         """
 
-        return self.db.query(self.model.id).filter(self.model.id == id).first() is not None
+        # SELECT EXISTS(...) returns a single boolean instead of a row
+        return bool(self.db.query(exists().where(self.model.id == id)).scalar())
 
     # =============================================================================
     # Update Operations
@@ -10,13 +10,33 @@ Design Patterns:
 from datetime import UTC, datetime
 from typing import Optional
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import and_, bindparam, delete, desc, exists, func, insert, or_, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, selectinload
 
 from app.models.media import Cast, Genre, Keyword, Media, MediaEmbedding, Movie, TVShow
 from app.repositories.base import BaseRepository
 
 
+# Movie columns an upsert never overwrites on an existing row
+_UPSERT_KEEP = frozenset({"id", "tmdb_id", "media_id", "created_at"})
+
+# Movies and MediaEmbedding share the media_id key, so embedding lookups join
+# (or anti-join) on it directly rather than going through the Media anchor
+_HAS_EMBEDDING_ROW = exists().where(MediaEmbedding.media_id == Movie.media_id)
+_JOIN_EMBEDDING = MediaEmbedding.media_id == Movie.media_id
+
+
+# Escape character for LIKE patterns built by _like_pattern
+_LIKE_ESCAPE = "\\"
+
+
+def _like_pattern(query: str, prefix: bool) -> str:
+    """LIKE pattern matching ``query`` literally at the start of a value, or anywhere in it."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
 class MovieRepository(BaseRepository[Movie]):
     """
     Repository for Movie entity with domain-specific queries.
@@ -95,6 +115,7 @@ class MovieRepository(BaseRepository[Movie]):
         skip: int = 0,
         limit: int = 20,
         include_adult: bool = False,
+        prefix: bool = False,
     ) -> list[Movie]:
         """
         Search movies by title (case-insensitive partial match).
@@ -104,14 +125,21 @@ class MovieRepository(BaseRepository[Movie]):
             skip: Offset for pagination
             limit: Maximum results to return
             include_adult: Include adult content in results
+            prefix: Only match titles starting with the query
 
         Returns:
             List of matching movies, ordered by popularity
+
+        Note:
+            Prefix searches use the lower(title) text_pattern_ops B-tree
+            indexes; substring searches use the pg_trgm GIN indexes.
         """
+        # lower(col) LIKE lower(:q) matches the lower() expression indexes
+        pattern = func.lower(_like_pattern(query, prefix))
         filters = [
             or_(
-                Movie.title.ilike(f"%{query}%"),
-                Movie.original_title.ilike(f"%{query}%"),
+                func.lower(Movie.title).like(pattern, escape=_LIKE_ESCAPE),
+                func.lower(Movie.original_title).like(pattern, escape=_LIKE_ESCAPE),
             )
         ]
         if not include_adult:
@@ -363,14 +391,12 @@ class MovieRepository(BaseRepository[Movie]):
         """
         return (
             self.db.query(Movie)
-            .outerjoin(Movie.media)
-            .outerjoin(Media.embedding)
             .options(
                 selectinload(Movie.media).selectinload(Media.genres),
                 selectinload(Movie.media).selectinload(Media.keywords),
                 selectinload(Movie.media).selectinload(Media.cast_members),
             )
-            .filter(MediaEmbedding.media_id.is_(None))
+            .filter(~_HAS_EMBEDDING_ROW)
             .order_by(desc(Movie.popularity))
             .offset(offset)
             .limit(limit)
@@ -390,33 +416,31 @@ class MovieRepository(BaseRepository[Movie]):
         """
         return (
             self.db.query(Movie)
-            .join(Movie.media)
-            .join(Media.embedding)
+            .join(MediaEmbedding, _JOIN_EMBEDDING)
             .filter(MediaEmbedding.embedding.isnot(None))
+            .order_by(Movie.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
     def count_movies_with_embeddings(self) -> int:
-        """Count how many movies have embeddings."""
-        return (
-            self.db.query(Movie)
-            .join(Movie.media)
-            .join(Media.embedding)
+        """
+        Count how many movies have embeddings.
+
+        The embedding filter matches the idx_media_embedding_present partial
+        index, so the count never reads the wide vector rows.
+        """
+        return int(
+            self.db.query(func.count(Movie.id))
+            .join(MediaEmbedding, _JOIN_EMBEDDING)
             .filter(MediaEmbedding.embedding.isnot(None))
-            .count()
+            .scalar()
         )
 
     def count_movies_without_embeddings(self) -> int:
         """Count how many movies don't have embeddings yet."""
-        return (
-            self.db.query(Movie)
-            .outerjoin(Movie.media)
-            .outerjoin(Media.embedding)
-            .filter(MediaEmbedding.media_id.is_(None))
-            .count()
-        )
+        return int(self.db.query(func.count(Movie.id)).filter(~_HAS_EMBEDDING_ROW).scalar())
 
     def update_embedding(
         self,
@@ -495,8 +519,7 @@ class MovieRepository(BaseRepository[Movie]):
         """
         Insert or update a Movie by tmdb_id. Creates a Media anchor if needed.
 
-        If movie exists (by tmdb_id), updates its fields. Otherwise creates a
-        Media anchor first, then the Movie row pointing at it.
+        Single-row wrapper around ``upsert_movies``.
 
         Args:
             movie_data: Dictionary with movie fields (must include tmdb_id)
@@ -504,29 +527,96 @@ class MovieRepository(BaseRepository[Movie]):
         Returns:
             Created or updated Movie instance
         """
-        from app.models.media import Media
+        return self.upsert_movies([movie_data])[0]
 
-        tmdb_id = movie_data.get("tmdb_id")
-        if not tmdb_id:
-            raise ValueError("tmdb_id is required for upsert")
+    def upsert_movies(self, rows: list[dict]) -> list[Movie]:
+        """
+        Insert or update many Movies by tmdb_id in a few batched statements.
 
-        existing = self.find_by_tmdb_id(tmdb_id)
-        if existing:
-            for key, value in movie_data.items():
-                if hasattr(existing, key) and key not in ("id", "media_id"):
-                    setattr(existing, key, value)
-            existing.updated_at = datetime.now(UTC)
-            self.db.commit()
-            self.db.refresh(existing)
-            return existing
+        Existing movies (by tmdb_id) get the given fields updated; new ones get
+        a Media anchor first. Anchors are created with one multi-row
+        INSERT ... RETURNING, new movies with one
+        INSERT ... ON CONFLICT (tmdb_id) DO UPDATE and existing ones with one
+        UPDATE per distinct set of row keys, instead of a SELECT, flush and
+        commit per movie. Anchors left unused because a movie was inserted
+        concurrently are deleted again.
 
-        # Create Media anchor first, then Movie
-        anchor = Media(content_type="Movie")
-        self.db.add(anchor)
-        self.db.flush()  # get anchor.id
+        Args:
+            rows: Dictionaries with movie fields (each must include tmdb_id);
+                keys that are not Movie columns are ignored, and for a tmdb_id
+                given twice the last row wins
+
+        Returns:
+            Created or updated Movie instances, in the order of ``rows``
 
-        movie = Movie(media_id=anchor.id, **{k: v for k, v in movie_data.items() if k != "media_id"})
-        return self.create(movie)
+        Raises:
+            ValueError: If a row has no tmdb_id
+        """
+        if any(not row.get("tmdb_id") for row in rows):
+            raise ValueError("tmdb_id is required for upsert")
+
+        columns = Movie.__table__.columns.keys()
+        by_tmdb_id = {
+            row["tmdb_id"]: {k: v for k, v in row.items() if k in columns and k != "id"}
+            for row in rows
+        }
+        if not by_tmdb_id:
+            return []
+
+        found = self.db.query(Movie.tmdb_id, Movie.media_id).filter(Movie.tmdb_id.in_(by_tmdb_id))
+        media_ids: dict[int, int] = dict(found.tuples())
+        existing_ids = media_ids.keys() & by_tmdb_id.keys()
+        new_ids = [tmdb_id for tmdb_id in by_tmdb_id if tmdb_id not in existing_ids]
+        if new_ids:
+            anchor_ids = self.db.scalars(
+                insert(Media).returning(Media.id, sort_by_parameter_order=True),
+                [{"content_type": "Movie"}] * len(new_ids),
+            ).all()
+            media_ids.update(zip(new_ids, anchor_ids, strict=True))
+
+        # Group rows by (existing, key set): one executemany statement per shape
+        now = datetime.now(UTC)
+        groups: dict[tuple[bool, tuple[str, ...]], list[dict]] = {}
+        for tmdb_id, fields in by_tmdb_id.items():
+            values = {**fields, "media_id": media_ids[tmdb_id], "updated_at": now}
+            groups.setdefault((tmdb_id in existing_ids, tuple(sorted(values))), []).append(values)
+
+        for (existing, keys), group in groups.items():
+            if existing:
+                # An UPDATE, not ON CONFLICT: the INSERT half of an upsert checks
+                # NOT NULL columns (e.g. title) that a partial update leaves out
+                self.db.execute(
+                    update(Movie.__table__).where(Movie.tmdb_id == bindparam("match_tmdb_id")),
+                    [
+                        {key: value for key, value in values.items() if key not in _UPSERT_KEEP}
+                        | {"match_tmdb_id": values["tmdb_id"]}
+                        for values in group
+                    ],
+                )
+                continue
+
+            # ON CONFLICT covers a movie inserted concurrently since the lookup above;
+            # such a row keeps its own media_id, so the anchor made here goes unused
+            stmt = pg_insert(Movie.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Movie.tmdb_id],
+                set_={key: stmt.excluded[key] for key in keys if key not in _UPSERT_KEEP},
+            )
+            attached = set(self.db.scalars(stmt.returning(Movie.__table__.c.media_id), group))
+            orphaned = {values["media_id"] for values in group} - attached
+            if orphaned:
+                self.db.execute(delete(Media).where(Media.id.in_(orphaned)))
+        self.db.commit()
+
+        # Core statements bypass the identity map: reload any stale instances
+        movies = (
+            self.db.query(Movie)
+            .filter(Movie.tmdb_id.in_(by_tmdb_id))
+            .populate_existing()
+            .all()
+        )
+        by_id = {movie.tmdb_id: movie for movie in movies}
+        return [by_id[row["tmdb_id"]] for row in rows]
 
     
     # Stats
@@ -547,6 +637,33 @@ class MovieRepository(BaseRepository[Movie]):
             query = query.filter(Movie.adult == False)  
         return query.scalar()
 
+    def get_total_movies_approx(self, exact_fallback: bool = True) -> int | None:
+        """
+        Estimate the total number of movies (adult included) without a scan.
+
+        On PostgreSQL this reads the planner's row estimate (pg_class.reltuples),
+        which autovacuum/ANALYZE keep current, in constant time. Elsewhere, or
+        while the estimate is unset, it falls back to an exact count.
+
+        Args:
+            exact_fallback: Run the exact count when no estimate is available;
+                when False, return None instead so the call stays constant time
+
+        Returns:
+            Approximate movie count, or None without an estimate or fallback
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": Movie.__tablename__},
+            ).scalar()
+            # -1 (never analyzed) or 0 (possibly stale) are not trusted
+            if estimate is not None and estimate > 0:
+                return int(estimate)
+        if not exact_fallback:
+            return None
+        return int(self.db.query(func.count(Movie.id)).scalar())
+
     def get_languages_count(self) -> list[tuple]:
         """
         Get count of movies per language.
@@ -615,11 +732,15 @@ class CastRepository(BaseRepository[Cast]):
         """Find cast member by TMDB ID."""
         return self.db.query(Cast).filter(Cast.tmdb_id == tmdb_id).first()
 
-    def search_by_name(self, query: str, limit: int = 20) -> list[Cast]:
-        """Search cast members by name (partial match)."""
+    def search_by_name(self, query: str, limit: int = 20, prefix: bool = False) -> list[Cast]:
+        """Search cast members by name (partial match, or leading match if ``prefix``)."""
         return (
             self.db.query(Cast)
-            .filter(Cast.name.ilike(f"%{query}%"))
+            .filter(
+                func.lower(Cast.name).like(
+                    func.lower(_like_pattern(query, prefix)), escape=_LIKE_ESCAPE
+                )
+            )
             .order_by(desc(Cast.popularity))
             .limit(limit)
             .all()
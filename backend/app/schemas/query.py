@@ -9,14 +9,36 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.utils.string_utils import normalize_string
+
 if TYPE_CHECKING:
     from app.schemas.search import SearchFilters
 
 
+_E = TypeVar("_E", bound=Enum)
+
+
+def _members_by_value(enum_cls: type[_E]) -> dict[str, _E]:
+    """
+    Map each raw value of an enum to its member.
+
+    A dict lookup gives O(1) membership checks and skips ``Enum.__call__``
+    (and its ValueError on invalid input) on hot parse paths.
+    """
+    return {member.value: member for member in enum_cls}
+
+
+@lru_cache(maxsize=256)
+def _normalized_set(values: tuple[str, ...]) -> frozenset[str]:
+    """Normalize (lowercase, trim) a tuple of strings into a set, once per distinct tuple."""
+    return frozenset(normalize_string(v) for v in values)
+
+
 class MediaType(str, Enum):
     """Media type enumeration"""
 
@@ -51,6 +73,12 @@ class EmotionType(str, Enum):
     DARK_TONE = "dark_tone"
 
 
+# Raw value -> member lookups for the enums above, used when parsing LLM output
+MEDIA_TYPE_BY_VALUE: dict[str, MediaType] = _members_by_value(MediaType)
+TONE_BY_VALUE: dict[str, ToneType] = _members_by_value(ToneType)
+EMOTION_BY_VALUE: dict[str, EmotionType] = _members_by_value(EmotionType)
+
+
 class QueryConstraints(BaseModel):
     """Constraints and filters extracted from the query"""
 
@@ -104,20 +132,37 @@ class QueryConstraints(BaseModel):
     popular_only: bool = Field(default=False, description="Only include popular titles")
     hidden_gems: bool = Field(default=False, description="Focus on lesser-known titles")
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+    # Normalized views for case-insensitive matching. The model is frozen and
+    # updated by copying (see merge_with_filters), so each instance's lists are
+    # fixed; the views are memoized on their contents and shared between copies.
+
+    @property
+    def normalized_languages(self) -> frozenset[str]:
+        """Lowercased language codes."""
+        return _normalized_set(tuple(self.languages))
+
+    @property
+    def normalized_genres(self) -> frozenset[str]:
+        """Lowercased required genre names."""
+        return _normalized_set(tuple(self.genres))
+
+    @property
+    def normalized_exclude_genres(self) -> frozenset[str]:
+        """Lowercased excluded genre names."""
+        return _normalized_set(tuple(self.exclude_genres))
+
+    @property
+    def normalized_streaming_providers(self) -> frozenset[str]:
+        """Lowercased streaming provider names."""
+        return _normalized_set(tuple(self.streaming_providers))
 
     @classmethod
     def from_search_filters(cls, filters: SearchFilters) -> QueryConstraints:
         """Build a QueryConstraints from explicit SearchFilters."""
-        media_type = MediaType.BOTH
-        if filters.media_type is not None:
-            try:
-                media_type = MediaType(filters.media_type)
-            except ValueError:
-                media_type = MediaType.BOTH
-
         return cls(
-            media_type=media_type,
+            media_type=MEDIA_TYPE_BY_VALUE.get(filters.media_type or "", MediaType.BOTH),
             year_min=filters.year_min,
             year_max=filters.year_max,
             rating_min=filters.rating_min,
@@ -137,45 +182,41 @@ class QueryConstraints(BaseModel):
         semantic signals for the embedding model, not hard filter requirements.
         Explicit filters (from request.filters) always win.
         """
-        # Start from a copy with genres cleared — LLM-extracted genres are not
-        # hard filters; forcing them causes 0-result searches.
-        merged = self.model_copy(deep=True)
-        merged.genres = []
-
-        if not filters:
-            return merged
-
-        if filters.year_min is not None:
-            merged.year_min = filters.year_min
-        if filters.year_max is not None:
-            merged.year_max = filters.year_max
-        if filters.rating_min is not None:
-            merged.rating_min = filters.rating_min
-        if filters.runtime_min is not None:
-            merged.runtime_min = filters.runtime_min
-        if filters.runtime_max is not None:
-            merged.runtime_max = filters.runtime_max
-        if filters.genres:
-            merged.genres = filters.genres
-        if filters.language:
-            merged.languages = [filters.language]
-        if filters.exclude_adult is not None:
-            merged.adult_content = not filters.exclude_adult
-        if filters.streaming_providers:
-            merged.streaming_providers = filters.streaming_providers
-        if filters.media_type is not None:
-            try:
-                merged.media_type = MediaType(filters.media_type)
-            except ValueError:
-                pass  # keep LLM-parsed media_type
-
-        return merged
+        # Genres are cleared from the base: LLM-extracted genres are not hard
+        # filters, and forcing them causes 0-result searches.
+        updates: dict[str, object] = {"genres": []}
+
+        if filters:
+            if filters.year_min is not None:
+                updates["year_min"] = filters.year_min
+            if filters.year_max is not None:
+                updates["year_max"] = filters.year_max
+            if filters.rating_min is not None:
+                updates["rating_min"] = filters.rating_min
+            if filters.runtime_min is not None:
+                updates["runtime_min"] = filters.runtime_min
+            if filters.runtime_max is not None:
+                updates["runtime_max"] = filters.runtime_max
+            if filters.genres:
+                updates["genres"] = filters.genres
+            if filters.language:
+                updates["languages"] = [filters.language]
+            if filters.exclude_adult is not None:
+                updates["adult_content"] = not filters.exclude_adult
+            if filters.streaming_providers:
+                updates["streaming_providers"] = filters.streaming_providers
+            if filters.media_type in MEDIA_TYPE_BY_VALUE:
+                # Invalid values keep the LLM-parsed media_type
+                updates["media_type"] = MEDIA_TYPE_BY_VALUE[filters.media_type]
+
+        # The model is frozen, so the overrides go through model_copy
+        return self.model_copy(update=updates, deep=True)
 
 
 class QueryIntent(BaseModel):
     """Intent and semantic information extracted from the query"""
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
 
     # Core query elements
     raw_query: str = Field(..., description="Original user query")
@@ -218,7 +259,9 @@ class QueryIntent(BaseModel):
 class ParsedQuery(BaseModel):
     """Complete parsed query with intent and constraints"""
 
-    model_config = ConfigDict(use_enum_values=True)
+    # Frozen: a parse result is shared (e.g. by the parse cache) and never edited
+    # in place; derive changed copies with model_copy(update=...)
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
 
     # Core components
     intent: QueryIntent = Field(..., description="Extracted intent and semantic information")
@@ -233,7 +276,8 @@ class ParsedQuery(BaseModel):
         default=1.0, description="Parser confidence (0-1)", ge=0.0, le=1.0
     )
     parsing_method: str = Field(
-        default="llm", description="Method used for parsing (llm, rule-based, hybrid)"
+        default="llm",
+        description="Method used for parsing (llm, rule-based, rule-based-fast, hybrid)",
     )
 
     # Embedding-ready text
@@ -255,3 +299,11 @@ class QueryParserConfig(BaseModel):
     timeout: int = Field(default=10, description="Timeout for LLM calls in seconds", ge=1, le=30)
     cache_results: bool = Field(default=True, description="Cache parsing results")
     cache_ttl: int = Field(default=3600, description="Cache TTL in seconds")
+    fast_path_trivial: bool = Field(
+        default=True,
+        description="Parse queries made only of genre/media/year words without the LLM",
+    )
+    titles_index_path: str | None = Field(
+        default=None,
+        description="File of known titles (one per line) for rule-based reference matching",
+    )
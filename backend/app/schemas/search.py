@@ -9,6 +9,10 @@ from pydantic import BaseModel, Field, field_validator
 from app.schemas.movie import MovieSearchResult
 
 
+# Compiled once at import; checked on every search query
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+
+
 class SearchFilters(BaseModel):
     """Search filters"""
 
@@ -36,7 +40,7 @@ class SearchRequest(BaseModel):
     @field_validator("query")
     @classmethod
     def no_html_tags(cls, v: str) -> str:
-        if re.search(r"<[^>]+>", v):
+        if _RE_HTML_TAG.search(v):
             raise ValueError("Invalid characters in query")
         return v.strip()
 
@@ -348,7 +348,9 @@ class EmbeddingBatchProcessor:
                 model_name="sentence-transformers/all-mpnet-base-v2",
             )
             self.db.add(emb)
-        emb.embedding = embedding.tolist()
+        # pgvector binds ndarrays directly; keep the vector as contiguous float32
+        # (the column's storage type) instead of boxing 768 Python floats
+        emb.embedding = np.asarray(embedding, dtype=np.float32)  # type: ignore[assignment]
         emb.needs_rebuild = False
 
     def get_progress(self) -> dict:
@@ -431,12 +433,12 @@ class EmbeddingBatchProcessor:
                     results["errors"].append(f"Movie {movie.id}: embedding is NULL")
                     continue
 
-                emb_list = list(emb) if not isinstance(emb, list) else emb
-                if len(emb_list) != settings.EMBEDDING_DIMENSION:
+                dimensions = len(emb)
+                if dimensions != settings.EMBEDDING_DIMENSION:
                     results["invalid"] += 1
                     results["errors"].append(
                         f"Movie {movie.id}: embedding has "
-                        f"{len(emb_list)} dimensions "
+                        f"{dimensions} dimensions "
                         f"(expected {settings.EMBEDDING_DIMENSION})"
                     )
                     continue
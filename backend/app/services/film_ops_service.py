@@ -6,6 +6,7 @@ from __future__ import annotations
 import json
 from typing import Optional
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.models.media import MediaEmbedding, MediaEnrichment, Movie, TVShow
@@ -23,11 +24,11 @@ except FileNotFoundError:
 
 
 def _clamp(value: object, lo: int, hi: int) -> Optional[int]:
-    if value is None:
+    if not isinstance(value, int | float | str):
         return None
     try:
-        return max(lo, min(hi, int(value)))  # type: ignore[arg-type]
-    except (TypeError, ValueError):
+        return max(lo, min(hi, int(value)))
+    except (OverflowError, ValueError):
         return None
 
 
@@ -107,16 +108,17 @@ class EmbeddingRegenerationService:
         genres = (anchor.genres if anchor else []) or []
         genre_names = " ".join(g.name for g in genres)
         text = f"{film.title} {film.overview or ''} {genre_names}".strip()
-        vector = svc.encode(text)
-        vector_list = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+        # Stored as float32 (pgvector's storage type), bound without a list copy
+        vector = np.asarray(svc.encode(text), dtype=np.float32).ravel()
 
         emb = db.query(MediaEmbedding).filter(MediaEmbedding.media_id == film.media_id).first()
         if emb is None:
             emb = MediaEmbedding(media_id=film.media_id)
             db.add(emb)
-        emb.embedding = vector_list
+        # Legacy Column declarations type the instance attribute as Column
+        emb.embedding = vector  # type: ignore[assignment]
         emb.needs_rebuild = False
         db.commit()
 
         logger.info(f"Regenerated embedding for film {film.media_id}: {film.title!r}")
-        return len(vector_list)
+        return len(vector)
@@ -9,15 +9,24 @@ Design Patterns:
 - Strategy Pattern: Different filter strategies can be applied
 - Chain of Responsibility: Filters are applied sequentially
 - Immutable Operations: Returns new filtered lists, doesn't modify inputs
+
+Scalar filters (adult, language, year, rating, runtime) are evaluated as
+vectorised NumPy predicates over a column read once per filter. Filters are
+ordered by a moving average of how many candidates each one removed in past
+runs, so the most selective ones shrink the list first.
 """
 
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Sequence
 from datetime import UTC, datetime
+from enum import IntEnum
+import threading
+from typing import ClassVar
+
+import numpy as np
 
 from app.models.media import Movie, TVShow
 from app.schemas.query import QueryConstraints
 from app.utils.logger import get_logger
-from app.utils.stats_utils import calculate_median
 from app.utils.string_utils import normalize_string
 
 
@@ -31,6 +40,64 @@ def _get_attr(obj: Movie | TVShow | dict, attr: str, default=None):
     return getattr(obj, attr, default)
 
 
+def _get_year(obj: Movie | TVShow | dict) -> int | None:
+    """Get release year from an explicit year or the release date."""
+    year = _get_attr(obj, 'year')
+    if not year:
+        release_date = _get_attr(obj, 'release_date')
+        year = getattr(release_date, 'year', None)
+    return year or None
+
+
+def _genre_name_set(obj: Movie | TVShow | dict) -> frozenset[str]:
+    """Get the normalized genre names of a candidate (strings, dicts or Genre objects)."""
+    genres = _get_attr(obj, 'genres')
+    if not isinstance(genres, list | tuple) or not genres:
+        return frozenset()
+
+    return frozenset(
+        normalize_string(
+            g if isinstance(g, str) else g.get('name', '') if isinstance(g, dict) else g.name
+        )
+        for g in genres
+    )
+
+
+def _float_column(values: Iterable[float | None]) -> np.ndarray:
+    """Build a float64 column from an iterable of values, using NaN for missing ones."""
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64)
+
+
+class FilterKind(IntEnum):
+    """Filters applied by FilterEngine, used as row indices in FilterStatistics."""
+
+    ADULT = 0
+    LANGUAGE = 1
+    YEAR = 2
+    RATING = 3
+    RUNTIME = 4
+    GENRE = 5
+    STREAMING = 6
+    POPULARITY = 7
+
+
+_FILTER_KIND_BY_NAME: dict[str, FilterKind] = {kind.name.lower(): kind for kind in FilterKind}
+
+
+def _filter_name(filter_name: str | FilterKind) -> str:
+    """Get the recorded name for a filter given by name or FilterKind."""
+    return filter_name.name.lower() if isinstance(filter_name, FilterKind) else filter_name
+
+
+_FilterFn = Callable[
+    [list[Movie | TVShow | dict], QueryConstraints], list[Movie | TVShow | dict]
+]
+
+# Moving-average weight of the latest run, and the prior for filters not yet seen
+_SELECTIVITY_ALPHA = 0.1
+_DEFAULT_SELECTIVITY = 0.5
+
+
 class FilterEngine:
     """
     Applies hard constraints to movie candidates.
@@ -49,6 +116,14 @@ class FilterEngine:
         >>> filtered = engine.apply_filters(movies, constraints)
     """
 
+    # Exponential moving average of the fraction of candidates each filter
+    # removes. Shared across instances on purpose: one engine is created per
+    # request, so per-instance averages would never learn. Order only affects
+    # cost, never results, so other requests influencing it is harmless; the
+    # lock keeps concurrent updates (threadpool requests) from being lost.
+    _selectivity_ewma: ClassVar[dict[FilterKind, float]] = {}
+    _selectivity_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def apply_filters(
         self, candidates: Sequence[Movie | TVShow | dict], constraints: QueryConstraints
     ) -> list[Movie | TVShow | dict]:
@@ -63,8 +138,9 @@ class FilterEngine:
             Filtered list of movies that satisfy all constraints
 
         Note:
-            Filters are applied in order of selectivity (most selective first)
-            to minimize processing on subsequent filters.
+            Independent filters run in order of their observed selectivity and
+            stop early once no candidates remain, so expensive per-candidate
+            filters (genres, streaming) only see the survivors.
         """
         if not candidates:
             return []
@@ -74,30 +150,18 @@ class FilterEngine:
 
         logger.info(f"Applying filters to {initial_count} candidates")
 
-        # Apply filters in order of expected selectivity (most selective first)
-
-        # 1. Adult content filter (very selective, fast)
-        filtered = self._filter_adult_content(filtered, constraints)
-
-        # 2. Language filter (highly selective)
-        filtered = self._filter_language(filtered, constraints)
-
-        # 3. Year range filter (moderately selective)
-        filtered = self._filter_year_range(filtered, constraints)
-
-        # 4. Rating filter (moderately selective)
-        filtered = self._filter_rating(filtered, constraints)
-
-        # 5. Runtime filter (less selective)
-        filtered = self._filter_runtime(filtered, constraints)
-
-        # 6. Genre filters (can be selective or not)
-        filtered = self._filter_genres(filtered, constraints)
-
-        # 7. Streaming provider filter (least selective, but complex)
-        filtered = self._filter_streaming_providers(filtered, constraints)
-
-        # 8. Popularity filters
+        # 1-7. Independent filters, most selective first so later (and more
+        # expensive) predicates only see the survivors
+        stats = FilterStatistics()
+        for kind, filter_fn in self._plan_filters(constraints):
+            before_count = len(filtered)
+            filtered = filter_fn(filtered, constraints)
+            stats.record(kind, before_count, len(filtered))
+            if not filtered:
+                break
+        self._update_selectivity(stats)
+
+        # 8. Popularity filters (median depends on the survivors, so always last)
         filtered = self._filter_popularity(filtered, constraints)
 
         final_count = len(filtered)
@@ -108,125 +172,143 @@ class FilterEngine:
 
         return filtered
 
+    def _plan_filters(self, constraints: QueryConstraints) -> list[tuple[FilterKind, _FilterFn]]:
+        """
+        Get the active independent filters, ordered by observed selectivity.
+
+        Filters whose constraint is unset are left out. The rest are commutative,
+        so running the ones that historically prune the most first only changes
+        cost, not the result. Ties keep the default order below.
+        """
+        plan: list[tuple[FilterKind, _FilterFn]] = []
+        if not constraints.adult_content:
+            plan.append((FilterKind.ADULT, self._filter_adult_content))
+        if constraints.languages:
+            plan.append((FilterKind.LANGUAGE, self._filter_language))
+        if constraints.year_min is not None or constraints.year_max is not None:
+            plan.append((FilterKind.YEAR, self._filter_year_range))
+        if constraints.rating_min is not None:
+            plan.append((FilterKind.RATING, self._filter_rating))
+        if constraints.runtime_min is not None or constraints.runtime_max is not None:
+            plan.append((FilterKind.RUNTIME, self._filter_runtime))
+        if constraints.genres or constraints.exclude_genres:
+            plan.append((FilterKind.GENRE, self._filter_genres))
+        if constraints.streaming_providers:
+            plan.append((FilterKind.STREAMING, self._filter_streaming_providers))
+
+        with self._selectivity_lock:
+            ewma = dict(self._selectivity_ewma)
+        plan.sort(key=lambda step: -ewma.get(step[0], _DEFAULT_SELECTIVITY))
+        return plan
+
+    @classmethod
+    def _update_selectivity(cls, stats: "FilterStatistics") -> None:
+        """Fold this run's selectivities into the shared moving averages."""
+        observed = [
+            (_FILTER_KIND_BY_NAME[name], (before_count - after_count) / before_count)
+            for name, (before_count, after_count) in stats.filter_counts.items()
+            if before_count
+        ]
+        with cls._selectivity_lock:
+            ewma = cls._selectivity_ewma
+            for kind, selectivity in observed:
+                prev = ewma.get(kind, _DEFAULT_SELECTIVITY)
+                ewma[kind] = (1 - _SELECTIVITY_ALPHA) * prev + _SELECTIVITY_ALPHA * selectivity
+
+    @staticmethod
+    def _select(
+        movies: list[Movie | TVShow | dict], keep: np.ndarray, label: str
+    ) -> list[Movie | TVShow | dict]:
+        """Select the candidates where ``keep`` is True, preserving order."""
+        if keep.all():
+            return movies
+        filtered = [movies[i] for i in np.flatnonzero(keep)]
+        logger.debug(f"{label}: {len(movies)} → {len(filtered)}")
+        return filtered
+
+    # Scalar filters build a vectorised mask over a column read once from the
+    # candidates. Missing values are stored as NaN, so every comparison against
+    # them is False and those candidates are excluded.
+
     def _filter_adult_content(
         self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints
     ) -> list[Movie | TVShow | dict]:
-        """Filter based on adult content preference."""
+        """Filter out adult content unless explicitly allowed."""
         if constraints.adult_content:
-            # No filtering needed if adult content is allowed
             return movies
 
-        # Exclude adult content
-        filtered = [m for m in movies if not _get_attr(m, 'adult', False)]
-        if len(filtered) < len(movies):
-            logger.debug(f"Adult content filter: {len(movies)} → {len(filtered)}")
-        return filtered
+        adult = np.fromiter(
+            (bool(_get_attr(m, 'adult', False)) for m in movies), dtype=bool, count=len(movies)
+        )
+        return self._select(movies, ~adult, "Adult content filter")
 
-    def _filter_language(self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints) -> list[Movie | TVShow | dict]:
-        """Filter based on language constraints."""
+    def _filter_language(
+        self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints
+    ) -> list[Movie | TVShow | dict]:
+        """Filter based on original language."""
         if not constraints.languages:
             return movies
 
-        # Normalize language codes to lowercase
-        allowed_languages = {normalize_string(lang) for lang in constraints.languages}
-
-        filtered = [
-            m
-            for m in movies
-            if _get_attr(m, 'original_language') and normalize_string(_get_attr(m, 'original_language')) in allowed_languages
-        ]
-
-        if len(filtered) < len(movies):
-            logger.debug(
-                f"Language filter ({', '.join(constraints.languages)}): "
-                f"{len(movies)} → {len(filtered)}"
-            )
-        return filtered
+        # A set lookup per candidate beats building a unicode array for np.isin
+        allowed_languages = constraints.normalized_languages - {""}
+        keep = np.fromiter(
+            (
+                normalize_string(_get_attr(m, 'original_language') or "") in allowed_languages
+                for m in movies
+            ),
+            dtype=bool,
+            count=len(movies),
+        )
+        return self._select(
+            movies, keep, f"Language filter ({', '.join(constraints.languages)})"
+        )
 
-    def _filter_year_range(self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints) -> list[Movie | TVShow | dict]:
+    def _filter_year_range(
+        self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints
+    ) -> list[Movie | TVShow | dict]:
         """Filter based on release year range."""
         year_min = constraints.year_min
         year_max = constraints.year_max
-
         if year_min is None and year_max is None:
             return movies
 
-        current_year = datetime.now(UTC).year
-        year_max = year_max or current_year  # Default to current year if not specified
+        year_max = year_max or datetime.now(UTC).year  # Default to current year
+        years = _float_column(_get_year(m) for m in movies)
+        in_range = years <= year_max
+        if year_min:
+            in_range &= years >= year_min
+        return self._select(movies, in_range, f"Year range filter ({year_min or 'any'}-{year_max})")
 
-        filtered = []
-        for movie in movies:
-            # Skip movies without release date or year
-            release_date = _get_attr(movie, 'release_date')
-            year = _get_attr(movie, 'year')
-
-            if not year and not release_date:
-                continue
-
-            if not year and release_date:
-                year = release_date.year if hasattr(release_date, 'year') else None
-
-            if not year:
-                continue
-
-            # Apply year constraints
-            if year_min and year < year_min:
-                continue
-            if year_max and year > year_max:
-                continue
-
-            filtered.append(movie)
-
-        if len(filtered) < len(movies):
-            range_str = f"{year_min or 'any'}-{year_max or 'any'}"
-            logger.debug(f"Year range filter ({range_str}): {len(movies)} → {len(filtered)}")
-
-        return filtered
-
-    def _filter_rating(self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints) -> list[Movie | TVShow | dict]:
+    def _filter_rating(
+        self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints
+    ) -> list[Movie | TVShow | dict]:
         """Filter based on minimum rating."""
         if constraints.rating_min is None:
             return movies
 
-        min_rating = constraints.rating_min
-
-        filtered = [
-            m for m in movies if _get_attr(m, 'vote_average') is not None and _get_attr(m, 'vote_average') >= min_rating
-        ]
-
-        if len(filtered) < len(movies):
-            logger.debug(f"Rating filter (≥{min_rating}): {len(movies)} → {len(filtered)}")
-
-        return filtered
+        ratings = _float_column(_get_attr(m, 'vote_average') for m in movies)
+        return self._select(
+            movies, ratings >= constraints.rating_min, f"Rating filter (≥{constraints.rating_min})"
+        )
 
-    def _filter_runtime(self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints) -> list[Movie | TVShow | dict]:
-        """Filter based on runtime constraints."""
+    def _filter_runtime(
+        self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints
+    ) -> list[Movie | TVShow | dict]:
+        """Filter based on runtime range; TMDB uses 0 for unknown runtime."""
         runtime_min = constraints.runtime_min
         runtime_max = constraints.runtime_max
-
         if runtime_min is None and runtime_max is None:
             return movies
 
-        filtered = []
-        for movie in movies:
-            # Skip entries without a known runtime (TMDB uses 0 for unknown)
-            runtime = _get_attr(movie, 'runtime')
-            if not runtime:
-                continue
-
-            # Apply runtime constraints
-            if runtime_min is not None and runtime < runtime_min:
-                continue
-            if runtime_max is not None and runtime > runtime_max:
-                continue
-
-            filtered.append(movie)
-
-        if len(filtered) < len(movies):
-            range_str = f"{runtime_min or 0}-{runtime_max or '∞'} min"
-            logger.debug(f"Runtime filter ({range_str}): {len(movies)} → {len(filtered)}")
-
-        return filtered
+        runtimes = _float_column(_get_attr(m, 'runtime') or None for m in movies)
+        in_range = ~np.isnan(runtimes)
+        if runtime_min is not None:
+            in_range &= runtimes >= runtime_min
+        if runtime_max is not None:
+            in_range &= runtimes <= runtime_max
+        return self._select(
+            movies, in_range, f"Runtime filter ({runtime_min or 0}-{runtime_max or '∞'} min)"
+        )
 
     def _filter_genres(self, movies: list[Movie | TVShow | dict], constraints: QueryConstraints) -> list[Movie | TVShow | dict]:
         """Filter based on genre requirements and exclusions."""
@@ -236,18 +318,13 @@ class FilterEngine:
         if not required_genres and not excluded_genres:
             return movies
 
+        required_set = constraints.normalized_genres
+        excluded_set = constraints.normalized_exclude_genres
+
         filtered = []
         for movie in movies:
             # Get movie genre names (case-insensitive)
-            genres = _get_attr(movie, 'genres', [])
-            if isinstance(genres, list) and len(genres) > 0:
-                # Handle both objects and dicts/strings
-                if isinstance(genres[0], str):
-                    movie_genres = {normalize_string(g) for g in genres}
-                else:
-                    movie_genres = {normalize_string(g.name if hasattr(g, 'name') else g) for g in genres}
-            else:
-                movie_genres = set()
+            movie_genres = _genre_name_set(movie)
 
             # If movie has no genres, skip genre filtering (include the movie)
             # This allows semantic search to work even without genre metadata
@@ -256,16 +333,12 @@ class FilterEngine:
                 continue
 
             # Check required genres (must have ALL)
-            if required_genres:
-                required_set = {normalize_string(g) for g in required_genres}
-                if not required_set.issubset(movie_genres):
-                    continue
+            if not required_set <= movie_genres:
+                continue
 
             # Check excluded genres (must have NONE)
-            if excluded_genres:
-                excluded_set = {normalize_string(g) for g in excluded_genres}
-                if movie_genres.intersection(excluded_set):
-                    continue
+            if not excluded_set.isdisjoint(movie_genres):
+                continue
 
             filtered.append(movie)
 
@@ -289,7 +362,7 @@ class FilterEngine:
             return movies
 
         # Normalize provider names (case-insensitive)
-        desired_providers = {normalize_string(p) for p in constraints.streaming_providers}
+        desired_providers = constraints.normalized_streaming_providers
 
         filtered = []
         for movie in movies:
@@ -322,31 +395,26 @@ class FilterEngine:
         if not movies:
             return movies
 
-        # Calculate median popularity for threshold
-        popularities = [_get_attr(m, 'popularity') for m in movies if _get_attr(m, 'popularity') is not None]
-        if not popularities:
+        # Read popularity once into a column; missing values become NaN
+        popularities = _float_column(_get_attr(m, 'popularity') for m in movies)
+        known = popularities[~np.isnan(popularities)]
+        if known.size == 0:
             return movies
 
-        median_popularity = calculate_median(popularities)
+        # Median threshold computed once per call (selection-based, O(n))
+        median_popularity = float(np.median(known))
 
         if constraints.popular_only:
             # Keep only movies above median popularity
-            filtered = [
-                m for m in movies if _get_attr(m, 'popularity') is not None and _get_attr(m, 'popularity') >= median_popularity
-            ]
-            logger.debug(
-                f"Popular only filter (≥{median_popularity:.1f}): "
-                f"{len(movies)} → {len(filtered)}"
-            )
+            mask = popularities >= median_popularity
+            label = f"Popular only filter (≥{median_popularity:.1f})"
         else:  # hidden_gems
             # Keep only movies below median popularity
-            filtered = [
-                m for m in movies if _get_attr(m, 'popularity') is not None and _get_attr(m, 'popularity') < median_popularity
-            ]
-            logger.debug(
-                f"Hidden gems filter (<{median_popularity:.1f}): "
-                f"{len(movies)} → {len(filtered)}"
-            )
+            mask = popularities < median_popularity
+            label = f"Hidden gems filter (<{median_popularity:.1f})"
+
+        filtered = [movies[i] for i in np.flatnonzero(mask)]
+        logger.debug(f"{label}: {len(movies)} → {len(filtered)}")
 
         return filtered
 
@@ -357,41 +425,73 @@ class FilterStatistics:
 
     This class helps analyze which filters are most selective and how
     many candidates are removed at each step.
+
+    Counts are kept in an (n_filters, 2) int64 array with one row per filter.
+    Known filters use their FilterKind row; other names get extra rows on
+    first use.
     """
 
     def __init__(self) -> None:
         """Initialize filter statistics tracking."""
-        self.filter_counts: dict[str, tuple[int, int]] = {}  # {filter_name: (before, after)}
+        self._counts = np.zeros((len(FilterKind), 2), dtype=np.int64)  # [before, after]
+        self._rows: dict[str, int] = {}  # recorded filter name -> row, in record order
+        self._next_row = len(FilterKind)  # next free row for filters outside FilterKind
+
+    def _row(self, filter_name: str | FilterKind) -> int:
+        """Get the counts row for a filter, allocating one on first use."""
+        name = _filter_name(filter_name)
+        row = self._rows.get(name)
+        if row is None:
+            kind = _FILTER_KIND_BY_NAME.get(name)
+            if kind is not None:
+                row = int(kind)
+            else:
+                row = self._next_row
+                self._next_row += 1
+                if row >= len(self._counts):
+                    self._counts = np.vstack([self._counts, np.zeros_like(self._counts)])
+            self._rows[name] = row
+        return row
+
+    @property
+    def filter_counts(self) -> dict[str, tuple[int, int]]:
+        """Recorded counts as {filter_name: (before, after)}."""
+        return {
+            name: (int(self._counts[row, 0]), int(self._counts[row, 1]))
+            for name, row in self._rows.items()
+        }
 
-    def record(self, filter_name: str, before_count: int, after_count: int) -> None:
+    def record(self, filter_name: str | FilterKind, before_count: int, after_count: int) -> None:
         """
         Record filter application statistics.
 
         Args:
-            filter_name: Name of the filter applied
+            filter_name: Name (or FilterKind) of the filter applied
             before_count: Number of candidates before filter
             after_count: Number of candidates after filter
         """
-        self.filter_counts[filter_name] = (before_count, after_count)
+        row = self._row(filter_name)
+        self._counts[row] = (before_count, after_count)
 
-    def get_selectivity(self, filter_name: str) -> float | None:
+    def get_selectivity(self, filter_name: str | FilterKind) -> float | None:
         """
         Calculate filter selectivity (percentage of candidates removed).
 
         Args:
-            filter_name: Name of the filter
+            filter_name: Name (or FilterKind) of the filter
 
         Returns:
             Selectivity as percentage (0-100), or None if filter not recorded
         """
-        if filter_name not in self.filter_counts:
+        row = self._rows.get(_filter_name(filter_name))
+        if row is None:
             return None
 
-        before, after = self.filter_counts[filter_name]
+        before, after = self._counts[row]
         if before == 0:
             return 0.0
 
-        return 100.0 * (before - after) / before
+        return float(100.0 * (before - after) / before)
 
     def get_summary(self) -> dict[str, dict[str, int | float]]:
         """
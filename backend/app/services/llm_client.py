@@ -8,6 +8,14 @@ Provides a unified interface for LLM inference with support for:
 - Automatic provider chain fallback and retry logic
 """
 
+import asyncio
+from collections import OrderedDict
+from collections.abc import Sequence
+import hashlib
+from pathlib import Path
+import re
+import threading
+import time
 from typing import Any
 
 import httpx
@@ -20,10 +28,215 @@ from app.services.exceptions import (
     LLMRateLimitError,
     LLMRetriableError,
 )
-from app.utils.json_utils import safe_json_parse
+from app.utils.json_utils import json_dumps_bytes, safe_json_parse
+from app.utils.rate_limiter import TokenBucket
 from app.utils.retry import retry_with_backoff
 
 
+# Keep-alive pool shared by all Groq/Ollama requests in the process.
+# Long JSON generations can hold a connection for a while, so keep the expiry
+# above the typical request time to avoid reconnecting between calls.
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0
+)
+
+# Request bodies are pre-serialized with json_dumps_bytes and sent via content=,
+# so the content type has to be set explicitly.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Groq reports reset times as Go-style durations, e.g. "7.66s" or "2m59.56s"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Terminal batch statuses other than "completed"
+_BATCH_FAILED_STATUSES = frozenset({"failed", "expired", "cancelling", "cancelled"})
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse plain seconds ("2", "1.5") or a Go-style duration ("1m30s") into seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _rate_limit_delay(headers: httpx.Headers) -> float | None:
+    """
+    Seconds to hold off before the next request, from rate-limit response headers.
+
+    Honours ``Retry-After`` first, then an exhausted
+    ``x-ratelimit-remaining-requests`` with its ``x-ratelimit-reset-requests``.
+    Returns None when the headers do not ask for a delay.
+    """
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        return _parse_duration(retry_after)
+    if headers.get("x-ratelimit-remaining-requests") == "0":
+        reset = headers.get("x-ratelimit-reset-requests")
+        if reset:
+            return _parse_duration(reset)
+    return None
+
+
+class _JsonObjectCollector:
+    """
+    Accumulates streamed text and detects when the first top-level JSON object closes.
+
+    Tracks brace depth, ignoring braces inside JSON strings. Text before the
+    object (e.g. a markdown fence) is kept but trimmed from ``text`` once the
+    object is complete.
+    """
+
+    __slots__ = ("_depth", "_end", "_escaped", "_in_string", "_length", "_parts", "_start")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = 0
+        self._end: int | None = None
+
+    def feed(self, chunk: str) -> bool:
+        """Append a chunk; return True once the first object is complete."""
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "{":
+                if not self._depth:
+                    self._start = self._length + i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    self._end = self._length + i + 1
+                    break
+
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        """The completed object, or everything received if none closed."""
+        joined = "".join(self._parts)
+        if self._end is None:
+            return joined
+        return joined[self._start : self._end]
+
+
+class CompletionCache:
+    """
+    Thread-safe in-memory LRU cache of LLM completions.
+
+    Keys are digests of everything that determines a response (provider chain,
+    model, sampling parameters and prompts), so a hit skips the HTTP round trip.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of completions kept; least recently used go first
+        """
+        self._entries: OrderedDict[bytes, str] = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> str | None:
+        """Get a cached completion, marking it most recently used."""
+        with self._lock:
+            completion = self._entries.get(key)
+            if completion is not None:
+                self._entries.move_to_end(key)
+            return completion
+
+    def store(self, key: bytes, completion: str) -> None:
+        """Store a completion, evicting the least recently used beyond maxsize."""
+        with self._lock:
+            self._entries[key] = completion
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        """Remove a completion if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of cached completions."""
+        return len(self._entries)
+
+
+# Shared by all clients; keys include the provider chain and model
+_completion_cache = CompletionCache()
+
+# One pooled HTTP client for the process. Services create an LLMClient per
+# request or per call, so a pool per client would rarely be reused and was
+# never closed. Created on first use; closed by close_http_pool() at shutdown.
+_shared_http_client: httpx.Client | None = None
+_shared_http_lock = threading.Lock()
+
+
+def _get_shared_http_client() -> httpx.Client:
+    """Get the process-wide pooled HTTP client, creating it on first use."""
+    global _shared_http_client  # noqa: PLW0603
+    client = _shared_http_client
+    if client is not None:
+        return client
+    with _shared_http_lock:
+        if _shared_http_client is None:
+            # Retries are handled per provider by retry_with_backoff, so the
+            # transport itself never retries (limits must be set on it directly)
+            transport = httpx.HTTPTransport(retries=0, limits=_HTTP_LIMITS)
+            _shared_http_client = httpx.Client(transport=transport)
+        return _shared_http_client
+
+
+def close_http_pool() -> None:
+    """Close the process-wide pooled HTTP client, if one was opened."""
+    global _shared_http_client
+    with _shared_http_lock:
+        client, _shared_http_client = _shared_http_client, None
+    if client is not None:
+        client.close()
+
+
+# Provider rate limits apply per API key, not per client: every client using
+# the same (provider, key) pair draws from one bucket
+_rate_limit_buckets: dict[tuple[str, str], TokenBucket] = {}
+_rate_limit_buckets_lock = threading.Lock()
+
+
+def _shared_bucket(provider: str, api_key: str, rate: float, capacity: int) -> TokenBucket:
+    """Get the process-wide token bucket for ``provider`` and ``api_key``."""
+    with _rate_limit_buckets_lock:
+        bucket = _rate_limit_buckets.get((provider, api_key))
+        if bucket is None:
+            bucket = TokenBucket(rate=rate, capacity=capacity)
+            _rate_limit_buckets[(provider, api_key)] = bucket
+        return bucket
+
+
 class LLMClient:
     """
     Unified LLM client supporting Gemini, Groq, and Ollama.
@@ -38,6 +251,9 @@ class LLMClient:
     - Per-provider retry logic
     """
 
+    # Appended to JSON prompts that don't already mention JSON
+    _JSON_INSTR = "\n\nRespond with valid JSON only."
+
     def __init__(
         self,
         provider: str | None = None,
@@ -61,6 +277,9 @@ class LLMClient:
         self._api_key_override = api_key
         self._base_url_override = base_url
         self._model_override = model
+        self._groq_bucket = _shared_bucket(
+            "groq", self._groq_api_key, settings.GROQ_RPS, settings.GROQ_BURST
+        )
 
         requested = provider or settings.LLM_PROVIDER
         self._provider_chain = self._build_provider_chain(requested)
@@ -111,6 +330,36 @@ class LLMClient:
 
         return chain
 
+    @property
+    def model_name(self) -> str:
+        """Model used by the primary provider."""
+        if self._model_override:
+            return self._model_override
+        return {
+            "gemini": settings.GEMINI_MODEL,
+            "groq": settings.GROQ_MODEL,
+            "ollama": settings.OLLAMA_MODEL,
+        }[self.provider]
+
+    @property
+    def _http(self) -> httpx.Client:
+        """
+        Pooled HTTP client for Groq/Ollama.
+
+        The pool is shared by every LLMClient, so TCP/TLS connections stay alive
+        across calls and clients instead of paying a new handshake per request.
+        Requests pass this client's timeout explicitly.
+        """
+        return _get_shared_http_client()
+
+    def close(self) -> None:
+        """
+        Release this client.
+
+        The HTTP pool is shared by all clients and outlives them; it is closed
+        once by close_http_pool() on application shutdown.
+        """
+
     def _compress_prompt(
         self,
         prompt: str,
@@ -155,6 +404,7 @@ class LLMClient:
         temperature: float = 0.7,
         max_tokens: int = 1024,
         response_format: dict[str, Any] | None = None,
+        use_cache: bool = False,
     ) -> str:
         """
         Generate completion from LLM, trying providers in chain order.
@@ -165,6 +415,8 @@ class LLMClient:
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
             response_format: Response format hint ({"type": "json_object"} for JSON mode)
+            use_cache: Reuse the completion of an identical earlier call. Only
+                       for idempotent calls, e.g. re-extracting from the same text
 
         Returns:
             Generated text completion
@@ -172,8 +424,19 @@ class LLMClient:
         Raises:
             LLMClientError: If all providers in the chain fail
         """
-        prompt, system_prompt = self._compress_prompt(prompt, system_prompt)
         use_json_mode = response_format is not None and response_format.get("type") == "json_object"
+
+        cache_key = None
+        if use_cache:
+            cache_key = self._completion_key(
+                prompt, system_prompt, temperature, max_tokens, use_json_mode
+            )
+            cached = _completion_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM completion cache hit")
+                return cached
+
+        prompt, system_prompt = self._compress_prompt(prompt, system_prompt)
         last_error: Exception | None = None
 
         for provider in self._provider_chain:
@@ -191,12 +454,14 @@ class LLMClient:
                     )
                 elif provider == "ollama":
                     result = self._ollama_completion_with_retry(
-                        prompt, system_prompt, temperature, max_tokens
+                        prompt, system_prompt, temperature, max_tokens, use_json_mode
                     )
                 else:
                     continue
 
                 logger.info(f"LLM call succeeded with provider: {provider}")
+                if cache_key is not None:
+                    _completion_cache.store(cache_key, result)
                 return result
 
             except Exception as e:
@@ -210,6 +475,27 @@ class LLMClient:
         logger.error(f"All LLM providers failed. Last error: {last_error}")
         raise LLMClientError("LLM service unavailable") from last_error
 
+    def _completion_key(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+        use_json_mode: bool,
+    ) -> bytes:
+        """Digest of everything that determines a completion, for the cache."""
+        key_str = "|".join(
+            (
+                ",".join(self._provider_chain),
+                self._model_override or "",
+                self._base_url_override or "",
+                f"{temperature}:{max_tokens}:{use_json_mode}",
+                system_prompt or "",
+                prompt,
+            )
+        )
+        return hashlib.blake2b(key_str.encode(), digest_size=16).digest()
+
     # -------------------------------------------------------------------------
     # Gemini
     # -------------------------------------------------------------------------
@@ -305,32 +591,37 @@ class LLMClient:
             prompt, system_prompt, temperature, max_tokens, response_format
         )
 
-    def _groq_completion(
+    @property
+    def _groq_base_url(self) -> str:
+        """Groq OpenAI-compatible API root."""
+        return self._base_url_override or "https://api.groq.com/openai/v1"
+
+    @property
+    def _groq_api_key(self) -> str:
+        """API key used for Groq requests."""
+        return self._api_key_override or settings.GROQ_API_KEY or ""
+
+    @property
+    def _groq_auth_headers(self) -> dict[str, str]:
+        """Groq bearer-token header."""
+        return {"Authorization": f"Bearer {self._groq_api_key}"}
+
+    def _groq_payload(
         self,
         prompt: str,
         system_prompt: str | None,
         temperature: float,
         max_tokens: int,
         response_format: dict[str, Any] | None,
-    ) -> str:
-        """Generate completion using Groq API"""
-        api_key = self._api_key_override or settings.GROQ_API_KEY
-        base_url = self._base_url_override or "https://api.groq.com/openai/v1"
-        model = self._model_override or settings.GROQ_MODEL
-
-        url = f"{base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-
+    ) -> dict[str, Any]:
+        """Build a Groq chat completion request body."""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
         payload: dict[str, Any] = {
-            "model": model,
+            "model": self._model_override or settings.GROQ_MODEL,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
@@ -339,18 +630,45 @@ class LLMClient:
         if response_format:
             payload["response_format"] = response_format
 
+        return payload
+
+    def _groq_completion(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict[str, Any] | None,
+    ) -> str:
+        """Generate completion using Groq API"""
+        url = f"{self._groq_base_url}/chat/completions"
+        headers = {**self._groq_auth_headers, **_JSON_HEADERS}
+        payload = self._groq_payload(
+            prompt, system_prompt, temperature, max_tokens, response_format
+        )
+
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(url, headers=headers, json=payload)
+            if not self._groq_bucket.acquire(settings.GROQ_ACQUIRE_TIMEOUT):
+                logger.warning("Groq client-side rate limit: no request slot available")
+                msg = "Rate limit exceeded for Groq API (client-side throttle)"
+                raise LLMRateLimitError(msg)
+
+            response = self._http.post(
+                url, headers=headers, content=json_dumps_bytes(payload), timeout=self.timeout
+            )
 
-                if response.status_code == 429:
-                    logger.warning("Groq rate limit hit")
-                    msg = "Rate limit exceeded for Groq API"
-                    raise LLMRateLimitError(msg)
+            delay = _rate_limit_delay(response.headers)
+            if delay:
+                self._groq_bucket.pause(min(delay, settings.GROQ_MAX_PAUSE))
 
-                response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            if response.status_code == 429:
+                logger.warning("Groq rate limit hit")
+                msg = "Rate limit exceeded for Groq API"
+                raise LLMRateLimitError(msg)
+
+            response.raise_for_status()
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
 
         except LLMRateLimitError:
             raise
@@ -380,6 +698,7 @@ class LLMClient:
         system_prompt: str | None,
         temperature: float,
         max_tokens: int,
+        use_json_mode: bool = False,
     ) -> str:
         """
         Wrapper with retry logic for Ollama completions.
@@ -387,7 +706,9 @@ class LLMClient:
         Only catches LLMRetriableError (LLMClientError, LLMInvalidResponseError).
         LLMRateLimitError inherits from LLMNonRetriableError and will propagate.
         """
-        return self._ollama_completion(prompt, system_prompt, temperature, max_tokens)
+        return self._ollama_completion(
+            prompt, system_prompt, temperature, max_tokens, use_json_mode
+        )
 
     def _ollama_completion(
         self,
@@ -395,8 +716,15 @@ class LLMClient:
         system_prompt: str | None,
         temperature: float,
         max_tokens: int,
+        use_json_mode: bool = False,
     ) -> str:
-        """Generate completion using Ollama"""
+        """
+        Generate completion using Ollama.
+
+        In JSON mode the response is streamed and the request is closed as soon
+        as the first top-level JSON object is complete, so any text the model
+        appends after it is never generated.
+        """
         base_url = self._base_url_override or settings.OLLAMA_BASE_URL
         model = self._model_override or settings.OLLAMA_MODEL
         url = f"{base_url}/api/generate"
@@ -410,15 +738,19 @@ class LLMClient:
             "prompt": full_prompt,
             "temperature": temperature,
             "num_predict": max_tokens,
-            "stream": False,
+            "stream": use_json_mode,
         }
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                return data["response"]
+            if use_json_mode:
+                return self._ollama_stream_json(url, payload)
+
+            response = self._http.post(
+                url, headers=_JSON_HEADERS, content=json_dumps_bytes(payload), timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["response"]
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Ollama API error: {e.response.status_code} - {e.response.text}")
@@ -437,6 +769,32 @@ class LLMClient:
             msg = f"Unexpected error: {e}"
             raise LLMClientError(msg) from e
 
+    def _ollama_stream_json(self, url: str, payload: dict[str, Any]) -> str:
+        """Stream an Ollama generation, stopping once a JSON object has closed."""
+        collector = _JsonObjectCollector()
+        with self._http.stream(
+            "POST",
+            url,
+            headers=_JSON_HEADERS,
+            content=json_dumps_bytes(payload),
+            timeout=self.timeout,
+        ) as response:
+            if response.status_code >= 400:
+                response.read()  # load the body so the error handler can log it
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = safe_json_parse(line, extract_markdown=False, error_context="Ollama stream")
+                if collector.feed(chunk.get("response", "")):
+                    logger.debug("Ollama JSON object complete, closing stream early")
+                    break
+                if chunk.get("done"):
+                    break
+
+        return collector.text
+
     # -------------------------------------------------------------------------
     # JSON helper
     # -------------------------------------------------------------------------
@@ -447,6 +805,7 @@ class LLMClient:
         system_prompt: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        use_cache: bool = False,
     ) -> dict[str, Any]:
         """
         Generate structured JSON output from LLM.
@@ -458,6 +817,7 @@ class LLMClient:
             system_prompt: System prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            use_cache: Reuse the completion of an identical earlier call
 
         Returns:
             Parsed JSON as dictionary
@@ -469,7 +829,7 @@ class LLMClient:
         response_format = {"type": "json_object"}
 
         if "json" not in prompt.lower():
-            prompt = f"{prompt}\n\nRespond with valid JSON only."
+            prompt += self._JSON_INSTR
 
         completion = self.generate_completion(
             prompt=prompt,
@@ -477,16 +837,242 @@ class LLMClient:
             temperature=temperature,
             max_tokens=max_tokens,
             response_format=response_format,
+            use_cache=use_cache,
         )
 
         try:
-            return safe_json_parse(
-                text=completion, extract_markdown=True, error_context=f"{self.provider} LLM"
+            # JSON mode returns a bare object; only look for markdown fences when
+            # the completion doesn't start like JSON (e.g. a provider ignored the mode)
+            # Typed as object: the completion may parse to any JSON value
+            result: object = safe_json_parse(
+                text=completion,
+                extract_markdown=not completion.lstrip().startswith(("{", "[")),
+                error_context=f"{self.provider} LLM",
             )
+            if not isinstance(result, dict):
+                kind = type(result).__name__
+                msg = f"Expected a JSON object from {self.provider} LLM, got {kind}"
+                raise LLMInvalidResponseError(msg)
+            return result
         except LLMInvalidResponseError:
             logger.error(f"Failed to parse JSON from LLM\nResponse: {completion}")
+            if use_cache:
+                # Don't keep serving a response that can't be parsed
+                _completion_cache.discard(
+                    self._completion_key(prompt, system_prompt, temperature, max_tokens, True)
+                )
             raise
 
+    async def agenerate_json(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> dict[str, Any]:
+        """
+        Async variant of generate_json.
+
+        Runs the blocking call in a worker thread, so provider fallback, retries
+        and the pooled HTTP connections are shared with the sync path.
+        """
+        return await asyncio.to_thread(
+            self.generate_json, prompt, system_prompt, temperature, max_tokens
+        )
+
+    def generate_json_batch(
+        self,
+        prompts: Sequence[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        concurrency: int = 16,
+    ) -> list[dict[str, Any] | BaseException]:
+        """
+        Generate JSON for many prompts with up to `concurrency` requests in flight.
+
+        Must be called from synchronous code (it starts its own event loop);
+        async callers should gather agenerate_json directly.
+
+        Args:
+            prompts: User prompts, one request each
+            system_prompt: System prompt shared by all requests
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per request
+            concurrency: Maximum number of concurrent requests
+
+        Returns:
+            One entry per prompt, in order: the parsed JSON, or the exception
+            raised for that prompt
+        """
+
+        async def run_all() -> list[dict[str, Any] | BaseException]:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def run_one(prompt: str) -> dict[str, Any]:
+                async with semaphore:
+                    return await self.agenerate_json(prompt, system_prompt, temperature, max_tokens)
+
+            return await asyncio.gather(
+                *(run_one(prompt) for prompt in prompts), return_exceptions=True
+            )
+
+        return asyncio.run(run_all())
+
+    # -------------------------------------------------------------------------
+    # Groq batch API (offline, non-latency-sensitive workloads)
+    # -------------------------------------------------------------------------
+
+    def batch_json_request(
+        self,
+        custom_id: str,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> dict[str, Any]:
+        """
+        Build one line of a Groq batch input file for a JSON-mode completion.
+
+        Args:
+            custom_id: Caller-chosen id used to match the result back
+            prompt: User prompt (JSON instruction appended if missing)
+            system_prompt: System prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Batch request dict (custom_id, method, url, body)
+        """
+        if "json" not in prompt.lower():
+            prompt += self._JSON_INSTR
+
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._groq_payload(
+                prompt, system_prompt, temperature, max_tokens, {"type": "json_object"}
+            ),
+        }
+
+    def submit_batch(self, requests: Sequence[dict[str, Any]], input_path: Path) -> str:
+        """
+        Write requests to a JSONL input file, upload it and start a Groq batch.
+
+        Batches run within a 24h window at a lower price than real-time calls
+        and do not count against the online rate limit.
+
+        Args:
+            requests: Batch request lines, e.g. from batch_json_request
+            input_path: Where to write the JSONL input file (kept for auditing)
+
+        Returns:
+            Batch id
+
+        Raises:
+            LLMClientError: If the upload or batch creation fails
+        """
+        input_path.write_bytes(b"\n".join(json_dumps_bytes(r) for r in requests) + b"\n")
+
+        with input_path.open("rb") as f:
+            uploaded = self._groq_batch_call(
+                "post",
+                "/files",
+                data={"purpose": "batch"},
+                files={"file": (input_path.name, f, "application/jsonl")},
+            )
+        batch: dict[str, Any] = self._groq_batch_call(
+            "post",
+            "/batches",
+            headers=_JSON_HEADERS,
+            content=json_dumps_bytes(
+                {
+                    "input_file_id": uploaded["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h",
+                }
+            ),
+        )
+        logger.info(f"Submitted Groq batch {batch['id']} with {len(requests)} requests")
+        return str(batch["id"])
+
+    def poll_batch(
+        self, batch_id: str, poll_interval: float = 30.0, timeout: float | None = None
+    ) -> dict[str, Any]:
+        """
+        Wait for a batch to reach a terminal status.
+
+        Args:
+            batch_id: Id returned by submit_batch
+            poll_interval: Seconds between status checks
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            The completed batch object
+
+        Raises:
+            LLMClientError: If the batch fails, expires, is cancelled or times out
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch: dict[str, Any] = self._groq_batch_call("get", f"/batches/{batch_id}")
+            status = batch.get("status")
+            if status == "completed":
+                return batch
+            if status in _BATCH_FAILED_STATUSES:
+                msg = f"Groq batch {batch_id} ended with status '{status}'"
+                raise LLMClientError(msg)
+            if deadline is not None and time.monotonic() >= deadline:
+                msg = f"Timed out waiting for Groq batch {batch_id} (status '{status}')"
+                raise LLMClientError(msg)
+            logger.debug(f"Groq batch {batch_id} status: {status}")
+            time.sleep(poll_interval)
+
+    def batch_results(self, batch: dict[str, Any]) -> dict[str, str]:
+        """
+        Download the completions of a completed batch.
+
+        Args:
+            batch: Completed batch object from poll_batch
+
+        Returns:
+            Completion text by custom_id; requests that errored are omitted
+        """
+        output_file_id = batch.get("output_file_id")
+        if not output_file_id:
+            return {}
+
+        text = self._groq_batch_call("get", f"/files/{output_file_id}/content", raw=True)
+        results: dict[str, str] = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            item = safe_json_parse(line, extract_markdown=False, error_context="Groq batch")
+            body = (item.get("response") or {}).get("body") or {}
+            try:
+                results[item["custom_id"]] = body["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                logger.warning(f"Groq batch request {item.get('custom_id')} failed: {item}")
+        return results
+
+    def _groq_batch_call(self, method: str, path: str, raw: bool = False, **kwargs: Any) -> Any:
+        """Call a Groq files/batches endpoint, wrapping HTTP errors in LLMClientError."""
+        url = f"{self._groq_base_url}{path}"
+        headers = {**self._groq_auth_headers, **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = getattr(self._http, method)(url, headers=headers, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Groq batch API error: {e.response.status_code} - {e.response.text}")
+            msg = f"Groq batch API error: {e.response.status_code}"
+            raise LLMClientError(msg) from e
+        except httpx.HTTPError as e:
+            msg = f"Groq batch API request failed: {e}"
+            raise LLMClientError(msg) from e
+        return response.text if raw else response.json()
+
     def __enter__(self) -> "LLMClient":
         """Context manager entry"""
         return self
@@ -495,3 +1081,4 @@ class LLMClient:
         self, exc_type: type | None, exc_val: BaseException | None, exc_tb: object
     ) -> None:
         """Context manager exit"""
+        self.close()
@@ -12,11 +12,14 @@ Design Patterns:
 - Strategy Pattern: Different embedding strategies for different query types
 """
 
+from collections.abc import Callable, Iterable
+from functools import lru_cache
 import logging
 from typing import Any
 
 import numpy as np
 
+from app.core.config import settings
 from app.schemas.query import ParsedQuery
 from app.services.embedding_service import EmbeddingService
 from app.services.exceptions import EmbeddingGenerationError
@@ -25,6 +28,77 @@ from app.services.exceptions import EmbeddingGenerationError
 logger = logging.getLogger(__name__)
 
 
+def _compose_query_text(
+    raw_query: str,
+    *,
+    reference_titles: tuple[str, ...],
+    themes: tuple[str, ...],
+    tones: tuple[str, ...],
+    emotions: tuple[str, ...],
+    genres: tuple[str, ...],
+    undesired_themes: tuple[str, ...],
+    undesired_tones: tuple[str, ...],
+) -> str:
+    """
+    Join query components into embedding text.
+
+    See ``_compose_query_text_cached`` for the memoized variant.
+    """
+    parts = []
+
+    # 1. Start with original query (primary signal)
+    if raw_query:
+        parts.append(raw_query)
+
+    # 2. Add reference titles (strong signal for similarity)
+    if reference_titles:
+        # Reference titles are very important - add them prominently
+        parts.append(f"Similar to: {' '.join(reference_titles)}")
+
+    # 3. Add themes (core concepts)
+    if themes:
+        parts.append(f"Themes: {', '.join(themes)}")
+
+    # 4. Add tones (mood/atmosphere)
+    if tones:
+        parts.append(f"Tone: {', '.join(tones)}")
+
+    # 5. Add emotions (emotional dimensions)
+    if emotions:
+        parts.append(f"Emotions: {', '.join(emotions)}")
+
+    # 6. Add genres (if specified)
+    if genres:
+        parts.append(f"Genres: {', '.join(genres)}")
+
+    # 7. Add undesired elements as negative context
+    # Note: This helps differentiate, but semantic search may not fully exclude them
+    undesired_parts = []
+    if undesired_themes:
+        undesired_parts.append(f"less {', '.join(undesired_themes)}")
+    if undesired_tones:
+        undesired_parts.append(f"not {', '.join(undesired_tones)}")
+
+    if undesired_parts:
+        parts.append(f"Avoid: {' and '.join(undesired_parts)}")
+
+    # Combine all parts
+    return ". ".join(parts)
+
+
+# Cached on the components themselves, so repeated queries (retries,
+# popular searches) skip rebuilding the string.
+_compose_query_text_cached = lru_cache(maxsize=256)(_compose_query_text)
+
+
+def _lower_title_index(titles: Iterable[str]) -> dict[str, str]:
+    """Map lowercased titles to their original spelling (first one wins)."""
+    index: dict[str, str] = {}
+    for title in titles:
+        index.setdefault(title.lower(), title)
+    return index
+
+
 class QueryEmbeddingService:
     """
     Service for converting parsed queries into semantic embeddings.
@@ -126,7 +200,8 @@ class QueryEmbeddingService:
         - Genres (if specified)
 
         This creates a comprehensive semantic representation that
-        captures the user's intent from multiple angles.
+        captures the user's intent from multiple angles. Results are
+        LRU-cached unless settings.QUERY_TEXT_CACHE is disabled.
 
         Args:
             parsed_query: Parsed query with extracted intent
@@ -134,60 +209,23 @@ class QueryEmbeddingService:
         Returns:
             Rich query text optimized for embedding generation
         """
-        parts = []
-
-        # 1. Start with original query (primary signal)
-        if parsed_query.intent.raw_query:
-            parts.append(parsed_query.intent.raw_query)
-
         intent = parsed_query.intent
-
-        # 2. Add reference titles (strong signal for similarity)
-        if intent.reference_titles:
-            # Reference titles are very important - add them prominently
-            titles_text = " ".join(intent.reference_titles)
-            parts.append(f"Similar to: {titles_text}")
-
-        # 3. Add themes (core concepts)
-        if intent.themes:
-            themes_text = ", ".join(intent.themes)
-            parts.append(f"Themes: {themes_text}")
-
-        # 4. Add tones (mood/atmosphere)
-        if intent.tones:
-            # Tones are already strings due to use_enum_values=True
-            tones_text = ", ".join([str(tone) for tone in intent.tones])
-            parts.append(f"Tone: {tones_text}")
-
-        # 5. Add emotions (emotional dimensions)
-        if intent.emotions:
-            # Emotions are already strings due to use_enum_values=True
-            emotions_text = ", ".join([str(emotion) for emotion in intent.emotions])
-            parts.append(f"Emotions: {emotions_text}")
-
-        # 6. Add genres (if specified)
-        if parsed_query.constraints and parsed_query.constraints.genres:
-            genres_text = ", ".join(parsed_query.constraints.genres)
-            parts.append(f"Genres: {genres_text}")
-
-        # 7. Add undesired elements as negative context
-        # Note: This helps differentiate, but semantic search may not fully exclude them
-        undesired_parts = []
-        if intent.undesired_themes:
-            undesired_parts.append(f"less {', '.join(intent.undesired_themes)}")
-        if intent.undesired_tones:
-            undesired_tones_text = ", ".join(
-                [tone.value for tone in intent.undesired_tones]
-            )
-            undesired_parts.append(f"not {undesired_tones_text}")
-
-        if undesired_parts:
-            parts.append(f"Avoid: {' and '.join(undesired_parts)}")
-
-        # Combine all parts
-        query_text = ". ".join(parts)
-
-        return query_text
+        genres = parsed_query.constraints.genres if parsed_query.constraints else ()
+
+        # Tones/emotions are already strings due to use_enum_values=True
+        compose: Callable[..., str] = _compose_query_text
+        if settings.QUERY_TEXT_CACHE:
+            compose = _compose_query_text_cached
+        return compose(
+            intent.raw_query,
+            reference_titles=tuple(intent.reference_titles),
+            themes=tuple(intent.themes),
+            tones=tuple(map(str, intent.tones)),
+            emotions=tuple(map(str, intent.emotions)),
+            genres=tuple(genres),
+            undesired_themes=tuple(intent.undesired_themes),
+            undesired_tones=tuple(map(str, intent.undesired_tones)),
+        )
 
     def generate_batch_embeddings(
         self, parsed_queries: list[ParsedQuery], normalize: bool = True
@@ -195,8 +233,8 @@ class QueryEmbeddingService:
         """
         Generate embeddings for multiple queries in batch.
 
-        More efficient than calling generate_query_embedding multiple times
-        when processing many queries at once.
+        All query texts are built first and encoded in a single batched model
+        call, which is much cheaper than one forward pass per query.
 
         Args:
             parsed_queries: List of parsed queries
@@ -212,14 +250,14 @@ class QueryEmbeddingService:
             # Build query texts
             query_texts = [self._build_query_text(pq) for pq in parsed_queries]
 
-            # Generate embeddings in batch
-            embeddings = self.embedding_service.generate_embeddings(
-                texts=query_texts, normalize=normalize
+            # Generate all embeddings in one encode call
+            embeddings = self.embedding_service.generate_embeddings_batch(
+                texts=query_texts, normalize=normalize, show_progress=False
             )
 
             logger.debug(f"Generated {len(embeddings)} query embeddings in batch")
 
-            return embeddings
+            return list(embeddings)
 
         except Exception as e:
             logger.error(f"Batch query embedding generation failed: {e}", exc_info=True)
@@ -267,33 +305,40 @@ class QueryEmbeddingService:
         if not reference_titles:
             return None
 
-        # Find matching embeddings
-        matched_embeddings = []
+        # Case-insensitive lookup: lowercased title -> original key
+        lowered = _lower_title_index(movie_embeddings)
+
+        matched_titles = []
         for title in reference_titles:
-            # Case-insensitive lookup
             title_lower = title.lower()
-            for movie_title, embedding in movie_embeddings.items():
-                if title_lower in movie_title.lower():
-                    matched_embeddings.append(embedding)
-                    break
-
-        if not matched_embeddings:
+            movie_title = lowered.get(title_lower)
+            if movie_title is None:
+                # Fall back to a partial match, e.g. "matrix" -> "The Matrix"
+                movie_title = next(
+                    (orig for low, orig in lowered.items() if title_lower in low), None
+                )
+            if movie_title is not None:
+                matched_titles.append(movie_title)
+
+        if not matched_titles:
             logger.warning(
                 f"No embedding matches found for reference titles: {reference_titles}"
             )
             return None
 
-        # Average the reference embeddings
-        composite_embedding = np.mean(matched_embeddings, axis=0)
+        # Average the reference embeddings in one reduction over a (k, dim) matrix
+        matrix = np.stack([movie_embeddings[title] for title in matched_titles])
+        composite_embedding = matrix.mean(axis=0)
 
         # Normalize if requested
         if normalize:
             norm = np.linalg.norm(composite_embedding)
             if norm > 0:
-                composite_embedding = composite_embedding / norm
+                # np.mean returned a fresh array, so normalize it in place
+                composite_embedding /= norm
 
         logger.info(
-            f"Generated reference-based embedding from {len(matched_embeddings)} movies"
+            f"Generated reference-based embedding from {len(matched_titles)} movies"
         )
 
         return composite_embedding
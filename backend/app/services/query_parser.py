@@ -12,12 +12,28 @@ Supports:
 - Caching for performance
 """
 
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from enum import Enum
+import functools
+import itertools
+from pathlib import Path
 import re
+import threading
+import time
+from typing import Any, NamedTuple, TypeVar
 
 from loguru import logger
+from pydantic import ValidationError
 
+from app.core.cache_config import CacheKeyPrefix, CacheTTL
+from app.core.cache_manager import CacheManager
 from app.prompts import load_prompt
 from app.schemas.query import (
+    EMOTION_BY_VALUE,
+    MEDIA_TYPE_BY_VALUE,
+    TONE_BY_VALUE,
     EmotionType,
     MediaType,
     ParsedQuery,
@@ -26,17 +42,491 @@ from app.schemas.query import (
     QueryParserConfig,
     ToneType,
 )
+from app.services.exceptions import LLMError, LLMInvalidResponseError
 from app.services.llm_client import LLMClient, LLMClientError
+from app.utils.json_utils import safe_json_parse
+
 
 try:
     _QUERY_PARSER_SYSTEM_PROMPT = load_prompt("query_parser", "1")
 except FileNotFoundError:
-    _QUERY_PARSER_SYSTEM_PROMPT = None
+    _QUERY_PARSER_SYSTEM_PROMPT = (
+        "You are an expert at understanding movie and TV show search queries. "
+        "Respond with valid JSON only."
+    )
 
 try:
     _QUERY_PARSER_USER_TEMPLATE = load_prompt("query_parser_user", "2")
 except FileNotFoundError:
-    _QUERY_PARSER_USER_TEMPLATE = None
+    _QUERY_PARSER_USER_TEMPLATE = (
+        "Parse this movie/TV show search query and respond with JSON only.\n\n"
+        'Query: "<USER_QUERY>"'
+    )
+
+# The template split around its placeholder once, so building a user prompt
+# is a join rather than a scan-and-replace over the whole template per call
+_QUERY_PARSER_USER_PARTS = tuple(_QUERY_PARSER_USER_TEMPLATE.split("<USER_QUERY>"))
+
+# Rule-based parser patterns, compiled once at import rather than per query.
+# Fixed-literal markers (comparisons, negations) and years are found with str
+# methods and token lookups instead; regex is kept for the variable patterns.
+_RE_TITLE_SPLIT = re.compile(r",\s*|\s+and\s+", re.IGNORECASE)
+# Earliest release year QueryConstraints accepts
+_MIN_YEAR = 1900
+# Words that make the following year a lower bound ("from 2020")
+_YEAR_FROM_WORDS = frozenset({"from", "since", "after"})
+# Words (any script), keeping hyphenated compounds such as "sci-fi" together
+_RE_TOKEN = re.compile(r"[^\W_]+(?:-[^\W_]+)*")
+
+# Near-deterministic sampling for structured constraint extraction
+_LLM_TEMPERATURE = 0.1
+_LLM_MAX_TOKENS = 1024
+
+# Maximum number of LLM parse results kept per parser
+_PARSE_CACHE_SIZE = 1024
+# Distinct query strings whose rule-based detections are memoized
+_RULE_CACHE_SIZE = 256
+
+
+_E = TypeVar("_E", bound=Enum)
+_T = TypeVar("_T")
+
+
+def _enum_words(lookup: Mapping[str, _E]) -> dict[str, _E]:
+    """
+    Trigger entries for the enum values that are themselves query words.
+
+    Built from the enum's value lookup (see app.schemas.query), so a member
+    added to ToneType/EmotionType is picked up without editing a word list.
+    Values such as "dark_tone" that cannot appear as a token are skipped.
+    """
+    return {value: member for value, member in lookup.items() if _RE_TOKEN.fullmatch(value)}
+
+
+# Closed trigger vocabularies for the rule-based parser. Keys are single
+# lowercase terms or two-word phrases (see _NormalizedQuery.terms); each enum's
+# own values are included, plus the synonyms listed here.
+_TONE_WORDS: dict[str, ToneType] = {
+    **_enum_words(TONE_BY_VALUE),
+    "lighthearted": ToneType.LIGHT,
+    "light-hearted": ToneType.LIGHT,
+    "funny": ToneType.COMEDIC,
+    "comedy": ToneType.COMEDIC,
+    "thriller": ToneType.SUSPENSEFUL,
+}
+_EMOTION_WORDS: dict[str, EmotionType] = {
+    **_enum_words(EMOTION_BY_VALUE),
+    "scary": EmotionType.FEAR,
+    "horror": EmotionType.FEAR,
+    "sad": EmotionType.SADNESS,
+    "heartbreaking": EmotionType.SADNESS,
+    "romantic": EmotionType.ROMANCE,
+    "thrilling": EmotionType.THRILL,
+}
+_GENRE_WORDS: dict[str, str] = {
+    "action": "Action",
+    "comedy": "Comedy",
+    "drama": "Drama",
+    "horror": "Horror",
+    "sci-fi": "Science Fiction",
+    "science fiction": "Science Fiction",
+    "thriller": "Thriller",
+    "romance": "Romance",
+    "fantasy": "Fantasy",
+    "mystery": "Mystery",
+    "crime": "Crime",
+    "animation": "Animation",
+    "documentary": "Documentary",
+}
+_MEDIA_WORDS: dict[str, MediaType] = {
+    "movie": MediaType.MOVIE,
+    "film": MediaType.MOVIE,
+    "show": MediaType.TV_SHOW,
+    "tv": MediaType.TV_SHOW,
+    "series": MediaType.TV_SHOW,
+}
+# Key sets of the vocabularies above, intersected with a query's terms in one
+# C-level set operation before any per-term lookups
+_TONE_KEYS = frozenset(_TONE_WORDS)
+_EMOTION_KEYS = frozenset(_EMOTION_WORDS)
+_GENRE_KEYS = frozenset(_GENRE_WORDS)
+_MEDIA_KEYS = frozenset(_MEDIA_WORDS)
+
+# Single-word genre and media terms; with years the rules pick up, the only
+# words a query may consist of and still be answered by the rule-based parser
+# alone. Anything else -- subjective words like "dark", comparisons, negations,
+# connectives such as "or" -- needs the LLM.
+_TRIVIAL_WORDS = frozenset(key for key in _GENRE_KEYS | _MEDIA_KEYS if " " not in key)
+# Two-word genre terms ("science fiction"), consumed as a pair
+_TRIVIAL_PHRASES = frozenset(key for key in _GENRE_KEYS if " " in key)
+
+
+def _enum_members(values: list[object], lookup: Mapping[str, _E]) -> list[_E]:
+    """
+    Map raw LLM strings to enum members, skipping (and logging) invalid ones.
+
+    Uses the precomputed value lookups from app.schemas.query, so invalid
+    values cost a dict probe, not a ValueError.
+    """
+    result: list[_E] = []
+    for v in values:
+        member = lookup.get(v) if isinstance(v, str) else None
+        if member is None:
+            logger.warning(f"Invalid enum value {v!r}, expected one of {sorted(lookup)}")
+        else:
+            result.append(member)
+    return result
+
+
+def _media_type(value: object) -> MediaType:
+    """Map a raw LLM media type to MediaType, defaulting to BOTH when missing or invalid."""
+    media_type = MEDIA_TYPE_BY_VALUE.get(value) if isinstance(value, str) else None
+    if media_type is None:
+        if value is not None:
+            logger.warning(f"Invalid MediaType value: {value}")
+        return MediaType.BOTH
+    return media_type
+
+
+# Dropped from rule-based keywords
+_STOP_WORDS = frozenset(
+    {"like", "with", "without", "about", "the", "a", "an", "and", "or", "but", "from", "to", "in"}
+)
+_TITLE_STOP_WORDS = frozenset({"the", "a", "an"})
+
+# Reference titles follow a comparison marker and run until a terminator word
+_COMPARISON_MARKERS = ("like ", "similar to ", "such as ")
+_TITLE_TERMINATORS = (" but ", " with ", " without ", " from ", " in ", " on ", " that ")
+
+# Undesired elements: the words after a negation marker, up to a stop word,
+# another marker, a comma or the end. "no" also stops before "elements"/"scenes".
+_NEGATION_STOPS = frozenset({"and", "or", "but", "with"})
+_NEGATION_MARKERS: dict[str, frozenset[str]] = {
+    "less": _NEGATION_STOPS,
+    "fewer": _NEGATION_STOPS,
+    "without": _NEGATION_STOPS,
+    "avoid": _NEGATION_STOPS,
+    "minus": _NEGATION_STOPS,
+    "no": _NEGATION_STOPS | {"elements", "scenes"},
+}
+
+
+class _NormalizedQuery(NamedTuple):
+    """A query lowercased and tokenized once, shared by the rule-based detectors."""
+
+    raw: str
+    lower: str
+    # Words in query order
+    tokens: list[str]
+    # Tokens followed by adjacent two-word phrases, for multi-word triggers
+    terms: list[str]
+    token_set: frozenset[str]
+    # Terms plus their forms without a trailing "s", for vocabulary intersection
+    lookup_set: frozenset[str]
+
+    @classmethod
+    def of(cls, query: str) -> "_NormalizedQuery":
+        """Normalize a raw query."""
+        lower = query.lower()
+        tokens = _RE_TOKEN.findall(lower)
+        terms = tokens + [f"{a} {b}" for a, b in itertools.pairwise(tokens)]
+        token_set = frozenset(terms)
+        singulars = {term[:-1] for term in terms if term.endswith("s")}
+        return cls(query, lower, tokens, terms, token_set, token_set.union(singulars))
+
+
+def _match_terms(nq: _NormalizedQuery, table: Mapping[str, _T], keys: frozenset[str]) -> list[_T]:
+    """
+    Map query terms to their table values, in query order and without duplicates.
+
+    A trailing "s" is dropped when the term itself is not a key, so plurals such
+    as "movies" or "thrillers" still match. ``keys`` is ``frozenset(table)``;
+    intersecting it with the query first makes the usual no-match case a single
+    set operation, and only the hits are looked up per term.
+    """
+    hits = keys & nq.lookup_set
+    if not hits:
+        return []
+    found: dict[_T, None] = {}
+    for term in nq.terms:
+        if term in hits:
+            found[table[term]] = None
+        elif term.endswith("s") and term[:-1] in hits:
+            found[table[term[:-1]]] = None
+    return list(found)
+
+
+class _TitleNode:
+    """A title trie node: children by next word, and the title ending here, if any."""
+
+    __slots__ = ("children", "title")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TitleNode] = {}
+        self.title: str | None = None
+
+
+class _TitleIndex:
+    """
+    Word-level trie of known titles for reference-title matching.
+
+    Scanning a query is one pass over its tokens (times the longest title's
+    length), independent of how many titles are indexed.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, titles: Iterable[str] = ()) -> None:
+        """
+        Build the index.
+
+        Args:
+            titles: Known titles; matching is case-insensitive
+        """
+        self._root = _TitleNode()
+        self._size = 0
+        for title in titles:
+            self.add(title)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "_TitleIndex":
+        """Build an index from a UTF-8 file with one title per line."""
+        with Path(path).open(encoding="utf-8") as f:
+            return cls(line.strip() for line in f)
+
+    def add(self, title: str) -> None:
+        """Index a title (blank titles are ignored)."""
+        tokens = _RE_TOKEN.findall(title.lower())
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.children.setdefault(token, _TitleNode())
+        if node.title is None:
+            self._size += 1
+        node.title = title
+
+    def find(self, tokens: Sequence[str]) -> list[str]:
+        """Return the known titles in a token sequence, longest match first at each position."""
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            match, match_end = None, i
+            for j in range(i, len(tokens)):
+                child = node.children.get(tokens[j])
+                if child is None:
+                    break
+                node = child
+                if node.title is not None:
+                    match, match_end = node.title, j + 1
+            if match is None:
+                i += 1
+            else:
+                found.append(match)
+                i = match_end
+        return found
+
+    def __len__(self) -> int:
+        """Number of indexed titles."""
+        return self._size
+
+
+def _detect_reference_titles(
+    nq: _NormalizedQuery, title_index: _TitleIndex | None = None
+) -> list[str]:
+    """
+    Extract titles named after "like", "similar to" or "such as".
+
+    With a title index, known titles after the marker are taken from the index
+    (so "Fast and Furious" is not split on "and"); other comma/"and"-separated
+    phrases sharing no word with a known title are still kept.
+    """
+    lower = nq.lower
+    # Slice the original text to keep title casing, unless lowercasing changed
+    # the length (a few non-ASCII letters), which would misalign the indices
+    source = nq.raw if len(nq.raw) == len(lower) else lower
+
+    reference_titles = []
+    for marker in _COMPARISON_MARKERS:
+        start = lower.find(marker)
+        while start != -1:
+            if start and not lower[start - 1].isspace():
+                # Part of a longer word, e.g. "unlike "
+                start = lower.find(marker, start + 1)
+                continue
+
+            tail_start = start + len(marker)
+            tail_end = len(lower)
+            for terminator in _TITLE_TERMINATORS:
+                idx = lower.find(terminator, tail_start, tail_end)
+                if idx != -1:
+                    tail_end = idx
+
+            known: list[str] = []
+            known_tokens: set[str] = set()
+            if title_index:
+                known = title_index.find(_RE_TOKEN.findall(lower[tail_start:tail_end]))
+                for title in known:
+                    known_tokens.update(_RE_TOKEN.findall(title.lower()))
+            reference_titles.extend(known)
+
+            # Split by comma or " and " to handle multiple titles
+            for title in _RE_TITLE_SPLIT.split(source[tail_start:tail_end]):
+                cleaned = title.strip().rstrip("?!.")
+                # Filter out very short titles and common stop words
+                if len(cleaned) <= 1 or cleaned.lower() in _TITLE_STOP_WORDS:
+                    continue
+                if known_tokens.isdisjoint(_RE_TOKEN.findall(cleaned.lower())):
+                    reference_titles.append(cleaned)
+            start = lower.find(marker, tail_end)
+    return reference_titles
+
+
+def _is_trivial(nq: _NormalizedQuery) -> bool:
+    """
+    Whether the query is only genre/media words and years (e.g. "action movies from 2020").
+
+    Such queries get nothing from the LLM that the rule-based parser misses.
+    Every token must be consumed by a detector: a year only counts after
+    "from"/"since"/"after" or as part of a range, so "comedy movies 2019" or
+    "2015 movies or 2018 shows" still go to the LLM rather than losing the
+    years. At least one genre or media term is required.
+    """
+    if nq.lookup_set.isdisjoint(_GENRE_KEYS | _MEDIA_KEYS):
+        return False
+    year_min, year_max = _detect_years(nq)
+    detected = {year for year in (year_min, year_max) if year is not None}
+
+    tokens = nq.tokens
+    for i, token in enumerate(tokens):
+        if token in _TRIVIAL_WORDS or (token.endswith("s") and token[:-1] in _TRIVIAL_WORDS):
+            continue
+        prev = tokens[i - 1] if i else ""
+        following = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if f"{prev} {token}" in _TRIVIAL_PHRASES or f"{token} {following}" in _TRIVIAL_PHRASES:
+            continue
+        if token in _YEAR_FROM_WORDS and _is_year(following.split("-")[0]):
+            # Consumed with the year it introduces, checked as the next token
+            continue
+        parts = token.split("-")
+        if len(parts) > 2 or not all(_is_year(part) for part in parts):
+            return False
+        if not {int(part) for part in parts} <= detected:
+            return False
+        # A lone year is only read after a "from" word, or as one end of a
+        # range written with spaces ("2015 - 2020" tokenizes as two years)
+        if len(parts) == 1 and prev not in _YEAR_FROM_WORDS and year_max is None:
+            return False
+    return True
+
+
+def _detect_media_type(nq: _NormalizedQuery) -> MediaType:
+    """Infer movie vs TV show from media words; BOTH when absent or mixed."""
+    media_types = _match_terms(nq, _MEDIA_WORDS, _MEDIA_KEYS)
+    return media_types[0] if len(media_types) == 1 else MediaType.BOTH
+
+
+def _is_year(text: str) -> bool:
+    """Whether text is a four-digit (ASCII) year."""
+    return len(text) == 4 and text.isascii() and text.isdigit()
+
+
+def _detect_years(nq: _NormalizedQuery) -> tuple[int | None, int | None]:
+    """Extract (year_min, year_max) from "from YYYY" or "YYYY-YYYY"."""
+    year_min = None
+    year_max = None
+    # One pass over whitespace-separated words, with "-" split out so that
+    # "2015-2020" and "2015 - 2020" both read as year, "-", year
+    words = [w.strip(".,;:!?()") for w in nq.lower.replace("-", " - ").split()]
+    for i, word in enumerate(words):
+        if not _is_year(word):
+            continue
+        if i + 2 < len(words) and words[i + 1] == "-" and _is_year(words[i + 2]):
+            # A range overrides any earlier "from YYYY"
+            year_min, year_max = sorted((int(word), int(words[i + 2])))
+            break
+        if year_min is None and i and words[i - 1] in _YEAR_FROM_WORDS:
+            year_min = int(word)
+
+    # Keep QueryConstraints' invariants (year >= 1900), since rule-based
+    # results are built without validation
+    if year_min is not None and year_min < _MIN_YEAR:
+        year_min = None
+    if year_max is not None and year_max < _MIN_YEAR:
+        year_max = None
+    return year_min, year_max
+
+
+def _detect_negations(nq: _NormalizedQuery) -> list[str]:
+    """Extract undesired elements ("less X", "without X", "no X", "avoid X", ...)."""
+    if nq.token_set.isdisjoint(_NEGATION_MARKERS):
+        return []
+
+    undesired_themes = []
+    for clause in nq.lower.split(","):
+        phrase: list[str] | None = None
+        stops: frozenset[str] = frozenset()
+        for token in _RE_TOKEN.findall(clause):
+            if token in _NEGATION_MARKERS:
+                if phrase:
+                    undesired_themes.append(" ".join(phrase))
+                phrase, stops = [], _NEGATION_MARKERS[token]
+            elif phrase is None:
+                continue
+            elif token in stops:
+                if phrase:
+                    undesired_themes.append(" ".join(phrase))
+                phrase = None
+            elif phrase or token != "the":
+                phrase.append(token)
+        if phrase:
+            undesired_themes.append(" ".join(phrase))
+    return undesired_themes
+
+
+class _RuleDetections(NamedTuple):
+    """Everything the rule-based parser detects in one query, as immutable values."""
+
+    reference_titles: tuple[str, ...]
+    tones: tuple[str, ...]
+    emotions: tuple[str, ...]
+    genres: tuple[str, ...]
+    media_type: str
+    year_min: int | None
+    year_max: int | None
+    undesired_themes: tuple[str, ...]
+    keywords: tuple[str, ...]
+
+
+def _detect_rules(nq: _NormalizedQuery, title_index: _TitleIndex | None) -> _RuleDetections:
+    """Run every rule-based detector over a normalized query."""
+    year_min, year_max = _detect_years(nq)
+    return _RuleDetections(
+        reference_titles=tuple(_detect_reference_titles(nq, title_index)),
+        tones=tuple(tone.value for tone in _match_terms(nq, _TONE_WORDS, _TONE_KEYS)),
+        emotions=tuple(
+            emotion.value for emotion in _match_terms(nq, _EMOTION_WORDS, _EMOTION_KEYS)
+        ),
+        genres=tuple(_match_terms(nq, _GENRE_WORDS, _GENRE_KEYS)),
+        media_type=_detect_media_type(nq).value,
+        year_min=year_min,
+        year_max=year_max,
+        undesired_themes=tuple(_detect_negations(nq)),
+        # Basic keywords (stop words removed)
+        keywords=tuple(w for w in nq.tokens if w not in _STOP_WORDS and len(w) > 2)[:10],
+    )
+
+
+@functools.lru_cache(maxsize=_RULE_CACHE_SIZE)
+def _detect_rules_cached(query: str) -> _RuleDetections:
+    """
+    Memoized ``_detect_rules`` for parsers without a title index.
+
+    The result depends only on the query string, and being all tuples it can
+    be shared between calls without copying.
+    """
+    return _detect_rules(_NormalizedQuery.of(query), None)
 
 
 class QueryParser:
@@ -47,7 +537,10 @@ class QueryParser:
     """
 
     def __init__(
-        self, config: QueryParserConfig | None = None, llm_client: LLMClient | None = None
+        self,
+        config: QueryParserConfig | None = None,
+        llm_client: LLMClient | None = None,
+        shared_cache: CacheManager | None = None,
     ) -> None:
         """
         Initialize query parser.
@@ -56,11 +549,31 @@ class QueryParser:
             config: Parser configuration (optional)
             llm_client: LLM client instance (optional, for dependency injection)
                        If not provided, a new client will be created from config
+            shared_cache: Cache shared across workers and restarts (optional).
+                          Consulted when the in-process cache misses
         """
         self.config = config or QueryParserConfig()
         self.llm_client = llm_client or LLMClient(
             provider=self.config.llm_provider, timeout=self.config.timeout
         )
+        self._title_index: _TitleIndex | None = None
+        if self.config.titles_index_path:
+            self._title_index = _TitleIndex.from_file(self.config.titles_index_path)
+            logger.info(f"Loaded {len(self._title_index)} known titles for reference matching")
+        # Normalized query -> (monotonic time stored, parsed result), LRU ordered
+        self._parse_cache: OrderedDict[str, tuple[float, ParsedQuery]] = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+        self.shared_cache = shared_cache
+        # Results depend on the provider, model and prompts, so a change to any
+        # of them starts a fresh shared-cache namespace
+        self._shared_cache_version = CacheManager.hash_value(
+            [
+                self.config.llm_provider,
+                self.llm_client.model_name,
+                _QUERY_PARSER_SYSTEM_PROMPT,
+                _QUERY_PARSER_USER_TEMPLATE,
+            ]
+        )
         logger.info(f"Initialized QueryParser with provider: {self.config.llm_provider}")
 
     def parse(self, query: str) -> ParsedQuery:
@@ -76,27 +589,288 @@ class QueryParser:
         Raises:
             ValueError: If query is empty or invalid
         """
+        query, cache_key, hit = self._lookup(query)
+        if hit is not None:
+            return hit
+
+        # Try LLM-based parsing first
+        try:
+            parsed = self._parse_with_llm(query)
+        except (LLMClientError, LLMInvalidResponseError) as e:
+            return self._fallback(query, e)
+
+        self._remember(cache_key, parsed)
+        return parsed
+
+    async def aparse(self, query: str) -> ParsedQuery:
+        """
+        Async variant of parse.
+
+        Awaits the LLM call instead of blocking the event loop on it, and runs
+        cache lookups and stores in a worker thread when a shared cache (whose
+        client does blocking I/O) is configured. Caching and the rule-based
+        fallback behave exactly as in parse.
+
+        Args:
+            query: Raw user query
+
+        Returns:
+            ParsedQuery with intent and constraints
+
+        Raises:
+            ValueError: If query is empty or invalid
+        """
+        query, cache_key, hit = await self._run_cache_io(self._lookup, query)
+        if hit is not None:
+            return hit
+
+        try:
+            parsed = await self._aparse_with_llm(query)
+        except (LLMClientError, LLMInvalidResponseError) as e:
+            return self._fallback(query, e)
+
+        await self._run_cache_io(self._remember, cache_key, parsed)
+        return parsed
+
+    async def aparse_many(self, queries: Sequence[str]) -> list[ParsedQuery | BaseException]:
+        """
+        Parse several queries concurrently.
+
+        The LLM calls are I/O bound, so wall time is roughly that of the slowest
+        query rather than the sum.
+
+        Args:
+            queries: Raw user queries
+
+        Returns:
+            One entry per query, in order: the ParsedQuery, or the exception
+            raised for that query (e.g. ValueError for an empty query)
+        """
+        return await asyncio.gather(
+            *(self.aparse(query) for query in queries), return_exceptions=True
+        )
+
+    def parse_batch_offline(
+        self,
+        queries: Sequence[str],
+        output_path: Path,
+        poll_interval: float = 30.0,
+        timeout: float | None = None,
+    ) -> dict[str, ParsedQuery]:
+        """
+        Parse many queries through the Groq batch API instead of real-time calls.
+
+        For non-latency-sensitive work (cache priming, evaluation runs,
+        re-parsing historical queries): batch jobs are cheaper and do not
+        consume the online rate limit. Blocks until the batch finishes; LLM
+        results also warm the parse cache.
+
+        Args:
+            queries: Raw user queries (empty ones are skipped, duplicates sent once)
+            output_path: Where to write the JSONL batch input file
+            poll_interval: Seconds between batch status checks
+            timeout: Give up waiting after this many seconds (None waits indefinitely)
+
+        Returns:
+            ParsedQuery by cleaned query. Queries the batch could not parse fall
+            back to rule-based parsing when enabled and are omitted otherwise.
+
+        Raises:
+            LLMClientError: If the batch cannot be submitted or does not complete
+        """
+        cleaned = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not cleaned:
+            return {}
+
+        requests = []
+        for i, query in enumerate(cleaned):
+            system_prompt, user_prompt = self._llm_prompts(query)
+            requests.append(
+                self.llm_client.batch_json_request(
+                    custom_id=str(i),
+                    prompt=user_prompt,
+                    system_prompt=system_prompt,
+                    temperature=_LLM_TEMPERATURE,
+                    max_tokens=_LLM_MAX_TOKENS,
+                )
+            )
+        batch_id = self.llm_client.submit_batch(requests, output_path)
+        batch = self.llm_client.poll_batch(batch_id, poll_interval=poll_interval, timeout=timeout)
+        completions = self.llm_client.batch_results(batch)
+
+        results: dict[str, ParsedQuery] = {}
+        for i, query in enumerate(cleaned):
+            try:
+                completion = completions.get(str(i))
+                if completion is None:
+                    msg = "No batch result"
+                    raise LLMClientError(msg)
+                response_json = safe_json_parse(completion, error_context="batch query parse")
+                parsed = self._build_parsed_query(query, response_json)
+            except (LLMClientError, LLMInvalidResponseError) as e:
+                if self.config.enable_fallback:
+                    results[query] = self._fallback(query, e)
+                else:
+                    logger.warning(f"Batch parse failed for {query[:100]!r}: {e}")
+                continue
+
+            self._store_cached(" ".join(query.lower().split()), parsed)
+            results[query] = parsed
+
+        logger.info(f"Batch parsed {len(results)}/{len(cleaned)} queries (batch {batch_id})")
+        return results
+
+    @staticmethod
+    def _clean_query(query: str) -> str:
+        """Strip a raw query, rejecting empty or whitespace-only input."""
         if not query or not query.strip():
             msg = "Query cannot be empty"
             raise ValueError(msg)
+        return query.strip()
 
-        query = query.strip()
-        logger.info(f"Parsing query: {query[:100]}...")
+    def _lookup(self, query: str) -> tuple[str, str, ParsedQuery | None]:
+        """
+        Clean a raw query and try the fast path and the parse caches.
+
+        Returns:
+            (cleaned query, cache key, result), where result is None when the
+            query still needs the LLM
+
+        Raises:
+            ValueError: If query is empty or invalid
+        """
+        query = self._clean_query(query)
+        cache_key = " ".join(query.lower().split())
+        hit = self._fast_parse(query)
+        if hit is None:
+            hit = self._get_cached(cache_key, query)
+        if hit is None:
+            logger.info(f"Parsing query: {query[:100]}...")
+        return query, cache_key, hit
+
+    def _remember(self, cache_key: str, parsed: ParsedQuery) -> None:
+        """Record a successful LLM parse in the parse caches."""
+        logger.info(f"Successfully parsed query with LLM: {self.config.llm_provider}")
+        self._store_cached(cache_key, parsed)
+
+    async def _run_cache_io(self, func: Callable[..., _T], *args: Any) -> _T:
+        """
+        Run a cache step from async code.
+
+        The shared cache's client does blocking network I/O, so with one
+        configured the step runs in a worker thread; the in-process cache alone
+        is cheap enough to consult on the event loop.
+        """
+        if self.shared_cache is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def _fast_parse(self, query: str) -> ParsedQuery | None:
+        """
+        Parse trivial queries (only genre/media/year words) without the LLM.
+
+        Returns None when the fast path is disabled or the query needs the LLM.
+        """
+        if not self.config.fast_path_trivial:
+            return None
+        nq = _NormalizedQuery.of(query)
+        if not _is_trivial(nq):
+            return None
+
+        logger.debug(f"Trivial query, skipping LLM: {query[:100]}")
+        # Nothing subjective was left for the LLM to find
+        return self._parse_with_rules(
+            query, nq, confidence_score=0.8, parsing_method="rule-based-fast"
+        )
+
+    def _fallback(self, query: str, error: LLMError) -> ParsedQuery:
+        """Fall back to rule-based parsing after an LLM failure, if enabled."""
+        logger.warning(f"LLM parsing failed: {error}")
+        if not self.config.enable_fallback:
+            raise error
 
-        # Try LLM-based parsing first
-        try:
-            parsed = self._parse_with_llm(query)
-            logger.info(f"Successfully parsed query with LLM: {self.config.llm_provider}")
-            return parsed
-        except LLMClientError as e:
-            logger.warning(f"LLM parsing failed: {e}")
-            if not self.config.enable_fallback:
-                raise
-
-        # Fallback to regex-based parsing
         logger.info("Falling back to regex-based parsing")
         return self._parse_with_rules(query)
 
+    def _get_cached(self, key: str, query: str) -> ParsedQuery | None:
+        """
+        Get a copy of a cached parse result, or None if absent, expired or disabled.
+
+        Copies are returned so callers cannot mutate the cached instance; the
+        copy carries this call's ``query`` as its raw query.
+        """
+        if not self.config.cache_results:
+            return None
+        with self._parse_cache_lock:
+            entry = self._parse_cache.get(key)
+            if entry is not None:
+                stored_at, parsed = entry
+                if time.monotonic() - stored_at > self.config.cache_ttl:
+                    del self._parse_cache[key]
+                    entry = None
+                else:
+                    self._parse_cache.move_to_end(key)
+
+        if entry is None:
+            shared = self._get_shared_cached(key)
+            if shared is None:
+                return None
+            self._store_local(key, shared)
+            parsed = shared
+        else:
+            logger.debug(f"Parse cache hit: {query[:100]}")
+        cached = parsed.model_copy(deep=True)
+        return cached.model_copy(
+            update={"intent": cached.intent.model_copy(update={"raw_query": query})}
+        )
+
+    def _store_cached(self, key: str, parsed: ParsedQuery) -> None:
+        """
+        Cache a copy of an LLM parse result, evicting the least recently used.
+
+        Rule-based fallbacks are never stored, so a transient LLM failure does
+        not pin the low-confidence result for the whole TTL.
+        """
+        if not self.config.cache_results:
+            return
+        self._store_local(key, parsed)
+        if self.shared_cache is not None:
+            self.shared_cache.set(
+                self._shared_cache_key(key),
+                parsed.model_dump(mode="json"),
+                ttl=CacheTTL.QUERY_PARSING,
+            )
+
+    def _store_local(self, key: str, parsed: ParsedQuery) -> None:
+        """Put a copy of a parse result in the in-process LRU cache."""
+        entry = (time.monotonic(), parsed.model_copy(deep=True))
+        with self._parse_cache_lock:
+            self._parse_cache[key] = entry
+            self._parse_cache.move_to_end(key)
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+
+    def _shared_cache_key(self, key: str) -> str:
+        """Shared-cache key for a normalized query."""
+        return CacheManager.generate_key(
+            CacheKeyPrefix.QUERY_PARSE, self._shared_cache_version, CacheManager.hash_value(key)
+        )
+
+    def _get_shared_cached(self, key: str) -> ParsedQuery | None:
+        """Get a parse result from the shared cache, or None if absent or unusable."""
+        if self.shared_cache is None:
+            return None
+        data = self.shared_cache.get(self._shared_cache_key(key))
+        if data is None:
+            return None
+        try:
+            parsed = ParsedQuery.model_validate(data)
+        except ValidationError as e:
+            logger.warning(f"Ignoring invalid shared parse cache entry: {e}")
+            return None
+        logger.debug(f"Shared parse cache hit: {key[:100]}")
+        return parsed
+
     def _parse_with_llm(self, query: str) -> ParsedQuery:
         """
         Parse query using LLM (Groq/Ollama).
@@ -107,53 +881,60 @@ class QueryParser:
         Returns:
             ParsedQuery with extracted information
         """
-        system_prompt = _QUERY_PARSER_SYSTEM_PROMPT or (
-            "You are an expert at understanding movie and TV show search queries. "
-            "Respond with valid JSON only."
+        system_prompt, user_prompt = self._llm_prompts(query)
+        response_json = self.llm_client.generate_json(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=_LLM_TEMPERATURE,
+            max_tokens=_LLM_MAX_TOKENS,
         )
+        return self._build_parsed_query(query, response_json)
 
-        if _QUERY_PARSER_USER_TEMPLATE:
-            user_prompt = _QUERY_PARSER_USER_TEMPLATE.replace("<USER_QUERY>", query)
-        else:
-            user_prompt = f'Parse this movie/TV show search query and respond with JSON only.\n\nQuery: "{query}"'
-
-        # Generate JSON response
-        response_json = self.llm_client.generate_json(
+    async def _aparse_with_llm(self, query: str) -> ParsedQuery:
+        """Async variant of _parse_with_llm."""
+        system_prompt, user_prompt = self._llm_prompts(query)
+        response_json = await self.llm_client.agenerate_json(
             prompt=user_prompt,
             system_prompt=system_prompt,
-            temperature=0.1,  # Near-deterministic for structured constraint extraction
-            max_tokens=1024,
+            temperature=_LLM_TEMPERATURE,
+            max_tokens=_LLM_MAX_TOKENS,
         )
+        return self._build_parsed_query(query, response_json)
 
-        # Helper function to safely parse enum values
-        def parse_enum_values(values: list[str], enum_class):
-            """Parse list of strings to enum values, skipping invalid ones."""
-            result = []
-            for v in values:
-                try:
-                    result.append(enum_class(v))
-                except ValueError:
-                    logger.warning(f"Invalid {enum_class.__name__} value: {v}")
-            return result
+    @staticmethod
+    def _llm_prompts(query: str) -> tuple[str, str]:
+        """Build the (system, user) prompt pair for a query."""
+        return _QUERY_PARSER_SYSTEM_PROMPT, query.join(_QUERY_PARSER_USER_PARTS)
 
+    def _build_parsed_query(self, query: str, response_json: dict[str, Any]) -> ParsedQuery:
+        """
+        Convert the LLM's JSON response into a ParsedQuery.
+
+        Args:
+            query: User query
+            response_json: Parsed JSON returned by the LLM
+
+        Returns:
+            ParsedQuery with extracted information
+        """
         # Build QueryIntent
         intent = QueryIntent(
             raw_query=query,
             themes=response_json.get("themes", []),
-            tones=parse_enum_values(response_json.get("tones", []), ToneType),
-            emotions=parse_enum_values(response_json.get("emotions", []), EmotionType),
+            tones=_enum_members(response_json.get("tones", []), TONE_BY_VALUE),
+            emotions=_enum_members(response_json.get("emotions", []), EMOTION_BY_VALUE),
             reference_titles=response_json.get("reference_titles", []),
             keywords=response_json.get("keywords", []),
             plot_elements=response_json.get("plot_elements", []),
             undesired_themes=response_json.get("undesired_themes", []),
-            undesired_tones=parse_enum_values(response_json.get("undesired_tones", []), ToneType),
+            undesired_tones=_enum_members(response_json.get("undesired_tones", []), TONE_BY_VALUE),
             is_comparison_query=response_json.get("is_comparison_query", False),
             is_mood_query=response_json.get("is_mood_query", False),
         )
 
         # Build QueryConstraints
         constraints = QueryConstraints(
-            media_type=MediaType(response_json.get("media_type", "both")),
+            media_type=_media_type(response_json.get("media_type")),
             genres=response_json.get("genres", []),
             exclude_genres=response_json.get("exclude_genres", []),
             languages=response_json.get("languages", []),
@@ -188,176 +969,64 @@ class QueryParser:
             parsing_method="llm",
         )
 
-    def _parse_with_rules(self, query: str) -> ParsedQuery:
+    def _parse_with_rules(
+        self,
+        query: str,
+        nq: _NormalizedQuery | None = None,
+        confidence_score: float = 0.5,
+        parsing_method: str = "rule-based",
+    ) -> ParsedQuery:
         """
         Parse query using regex-based pattern matching (fallback).
 
         Args:
             query: User query
+            nq: The query already normalized, if the caller has it (only used
+                with a title index; otherwise detections are memoized per query)
+            confidence_score: Confidence to report (lower than the LLM's by default)
+            parsing_method: Parsing method to report
 
         Returns:
             ParsedQuery with basic extraction
         """
-        query_lower = query.lower()
-
-        # Extract reference titles (look for "like X" patterns)
-        reference_titles = []
-        # First, find the phrase after "like/similar to/such as"
-        # Include "and" in the character class so it captures multiple titles
-        like_pattern = (
-            r"(?:like|similar to|such as)\s+"
-            r"([A-Z][A-Za-z0-9\s:,and]+?)"
-            r"(?:\s+(?:but|with|without|from|in|on|that)\s|\s*$)"
-        )
-        matches = re.findall(like_pattern, query, re.IGNORECASE)
-
-        # Process each match to split on "and" or "," to handle multiple titles
-        for match in matches:
-            # Split by comma or " and " (with surrounding spaces)
-            titles = re.split(r",\s*|\s+and\s+", match, flags=re.IGNORECASE)
-            for title in titles:
-                cleaned = title.strip()
-                # Filter out very short titles and common stop words
-                if cleaned and len(cleaned) > 1 and cleaned.lower() not in {"the", "a", "an"}:
-                    reference_titles.append(cleaned)
+        if self._title_index is None:
+            found = _detect_rules_cached(query)
+        else:
+            found = _detect_rules(nq or _NormalizedQuery.of(query), self._title_index)
+        keywords = list(found.keywords)
 
-        # Detect tones
-        tones = []
-        tone_keywords = {
-            "dark": ToneType.DARK,
-            "light": ToneType.LIGHT,
-            "lighthearted": ToneType.LIGHT,
-            "serious": ToneType.SERIOUS,
-            "funny": ToneType.COMEDIC,
-            "comedic": ToneType.COMEDIC,
-            "comedy": ToneType.COMEDIC,
-            "intense": ToneType.INTENSE,
-            "suspenseful": ToneType.SUSPENSEFUL,
-            "thriller": ToneType.SUSPENSEFUL,
-        }
-        for keyword, tone in tone_keywords.items():
-            if keyword in query_lower:
-                tones.append(tone)
-
-        # Detect emotions
-        emotions = []
-        emotion_keywords = {
-            "scary": EmotionType.FEAR,
-            "horror": EmotionType.FEAR,
-            "sad": EmotionType.SADNESS,
-            "heartbreaking": EmotionType.SADNESS,
-            "romantic": EmotionType.ROMANCE,
-            "romance": EmotionType.ROMANCE,
-            "thrilling": EmotionType.THRILL,
-        }
-        for keyword, emotion in emotion_keywords.items():
-            if keyword in query_lower:
-                emotions.append(emotion)
-
-        # Detect media type
-        media_type = MediaType.BOTH
-        if "movie" in query_lower and "show" not in query_lower:
-            media_type = MediaType.MOVIE
-        elif ("show" in query_lower or "series" in query_lower) and "movie" not in query_lower:
-            media_type = MediaType.TV_SHOW
-
-        # Detect genres (basic keyword matching)
-        genres = []
-        genre_keywords = {
-            "action": "Action",
-            "comedy": "Comedy",
-            "drama": "Drama",
-            "horror": "Horror",
-            "sci-fi": "Science Fiction",
-            "science fiction": "Science Fiction",
-            "thriller": "Thriller",
-            "romance": "Romance",
-            "fantasy": "Fantasy",
-            "mystery": "Mystery",
-            "crime": "Crime",
-            "animation": "Animation",
-            "documentary": "Documentary",
-        }
-        for keyword, genre in genre_keywords.items():
-            if keyword in query_lower:
-                genres.append(genre)
-
-        # Detect year constraints
-        year_min = None
-        year_max = None
-        year_pattern = r"(?:from|since|after)\s+(\d{4})"
-        match = re.search(year_pattern, query_lower)
-        if match:
-            year_min = int(match.group(1))
-
-        year_range_pattern = r"(\d{4})\s*-\s*(\d{4})"
-        match = re.search(year_range_pattern, query)
-        if match:
-            year_min = int(match.group(1))
-            year_max = int(match.group(2))
-
-        # Detect undesired elements (look for "with less X", "without X", "no X", etc.)
-        undesired_themes = []
-        # Pattern captures multi-word phrases after negation markers
-        undesired_patterns = [
-            r"(?:with\s+)?(?:less|fewer)\s+([a-z\s]+?)(?:\s+(?:and|or|but|with|,)|$)",
-            r"(?:with(?:out)?|avoid|minus)\s+(?:the\s+)?([a-z\s]+?)(?:\s+(?:and|or|but|with|,)|$)",
-            r"\bno\s+([a-z\s]+?)(?:\s+(?:and|or|but|with|elements|scenes|,)|$)",
-        ]
-        for pattern in undesired_patterns:
-            matches = re.findall(pattern, query_lower)
-            undesired_themes.extend([m.strip() for m in matches if m.strip()])
-
-        # Extract basic keywords (remove stop words)
-        stop_words = {
-            "like",
-            "with",
-            "without",
-            "about",
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "from",
-            "to",
-            "in",
-        }
-        words = re.findall(r"\b\w+\b", query_lower)
-        keywords = [w for w in words if w not in stop_words and len(w) > 2][:10]
-
-        # Build intent
-        intent = QueryIntent(
+        # Every value here is produced by the detectors above with the right
+        # types, so the models are built with model_construct (no validation).
+        # Enum fields hold plain values, as use_enum_values would store them.
+        # Lists are fresh copies of the (possibly cached) detections.
+        intent = QueryIntent.model_construct(
             raw_query=query,
             themes=keywords[:5],  # Use top keywords as themes
-            tones=tones,
-            emotions=emotions,
-            reference_titles=reference_titles,
+            tones=list(found.tones),
+            emotions=list(found.emotions),
+            reference_titles=list(found.reference_titles),
             keywords=keywords,
-            undesired_themes=undesired_themes,
-            is_comparison_query=len(reference_titles) > 0,
-            is_mood_query=len(emotions) > 0 or len(tones) > 0,
+            undesired_themes=list(found.undesired_themes),
+            is_comparison_query=len(found.reference_titles) > 0,
+            is_mood_query=len(found.emotions) > 0 or len(found.tones) > 0,
         )
 
-        # Build constraints
-        constraints = QueryConstraints(
-            media_type=media_type,
-            genres=genres,
-            year_min=year_min,
-            year_max=year_max,
+        constraints = QueryConstraints.model_construct(
+            media_type=found.media_type,
+            genres=list(found.genres),
+            year_min=found.year_min,
+            year_max=found.year_max,
         )
 
         # Build search text
         search_text = " ".join(keywords[:10])
 
-        # Build ParsedQuery
-        return ParsedQuery(
+        return ParsedQuery.model_construct(
             intent=intent,
             constraints=constraints,
             search_text=search_text,
-            confidence_score=0.5,  # Lower confidence for rule-based
-            parsing_method="rule-based",
+            confidence_score=confidence_score,
+            parsing_method=parsing_method,
         )
 
     def __enter__(self) -> "QueryParser":
@@ -401,6 +401,10 @@ class LLMReRanker:
                 system_prompt=PromptTemplate.SYSTEM_PROMPT,
                 temperature=temperature,
                 max_tokens=2048,
+                # The prompt is fully determined by the query and candidates, so
+                # identical re-rank requests (e.g. from fresh rerankers built by
+                # rerank_candidates) can reuse the process-wide completion cache
+                use_cache=True,
             )
 
             # Parse and apply rankings
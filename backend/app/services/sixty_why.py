@@ -19,6 +19,9 @@ try:
 except FileNotFoundError:
     _SYSTEM_PROMPT = None
 
+# First JSON array anywhere in a free-text LLM response
+_RE_JSON_ARRAY = re.compile(r"\[.*?\]", re.DOTALL)
+
 
 async def generate_why_reasons(
     film: object,
@@ -92,7 +95,7 @@ def _parse_reasons(raw: str) -> list[str]:
         pass
 
     # Fallback: try regex to find a JSON array anywhere in the response
-    match = re.search(r'\[.*?\]', raw, re.DOTALL)
+    match = _RE_JSON_ARRAY.search(raw)
     if match:
         try:
             data = json.loads(match.group())
@@ -2,6 +2,7 @@
 from app.utils.http_client import HTTPClient
 from app.utils.json_utils import (
     extract_json_from_markdown,
+    json_dumps_bytes,
     safe_json_parse,
     validate_json_fields,
 )
@@ -23,6 +24,7 @@ __all__ = [
     "retry_with_backoff",
     "HTTPClient",
     "extract_json_from_markdown",
+    "json_dumps_bytes",
     "safe_json_parse",
     "validate_json_fields",
     "clamp",
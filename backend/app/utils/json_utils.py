@@ -5,14 +5,38 @@ Provides helpers for:
 - Extracting JSON from markdown code blocks
 - Safe JSON parsing with error handling
 - LLM response JSON extraction
+- Compact JSON serialization to bytes for request bodies
 """
 
+from collections.abc import Callable, Collection
 import json
 from typing import Any
 
 from app.services.exceptions import LLMInvalidResponseError
 
 
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+_json_loads: Callable[[str], Any]
+_json_dumps_bytes: Callable[[Any], bytes]
+
+try:
+    import orjson  # optional — faster parser, same result types as json.loads
+
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps_bytes = _stdlib_dumps_bytes
+
+
+_FENCE = "```"
+_JSON_FENCE = "```json"
+_MAX_LANGUAGE_TAG = 20  # Longest ```<lang> line skipped before the block body
+
+
 def extract_json_from_markdown(text: str) -> str:
     """
     Extract JSON string from markdown code blocks.
@@ -36,41 +60,51 @@ def extract_json_from_markdown(text: str) -> str:
     """
     text = text.strip()
 
+    # Fences are literal delimiters, so plain str.find scans are enough.
     # Try extracting from ```json blocks (first occurrence only)
-    if "```json" in text:
-        try:
-            # Find the first ```json block
-            start_marker = "```json"
-            end_marker = "```"
-            start_idx = text.find(start_marker) + len(start_marker)
-            end_idx = text.find(end_marker, start_idx)
-
-            if end_idx != -1:
-                return text[start_idx:end_idx].strip()
-        except (ValueError, IndexError):
-            pass  # Fall through to next method
+    start = text.find(_JSON_FENCE)
+    if start != -1:
+        body = start + len(_JSON_FENCE)
+        end = text.find(_FENCE, body)
+        if end != -1:
+            return text[body:end].strip()
 
     # Try extracting from ``` blocks (first occurrence only)
-    if "```" in text:
-        try:
-            # Find the first ``` block
-            marker = "```"
-            start_idx = text.find(marker) + len(marker)
-            # Skip the language identifier if present (e.g., ```python)
-            newline_idx = text.find("\n", start_idx)
-            if newline_idx != -1 and newline_idx - start_idx < 20:
-                start_idx = newline_idx + 1
-
-            end_idx = text.find(marker, start_idx)
-            if end_idx != -1:
-                return text[start_idx:end_idx].strip()
-        except (ValueError, IndexError):
-            pass  # Fall through to plain text
+    start = text.find(_FENCE)
+    if start != -1:
+        body = start + len(_FENCE)
+        # Skip the language identifier if present (e.g., ```python)
+        newline = text.find("\n", body, body + _MAX_LANGUAGE_TAG)
+        if newline != -1:
+            body = newline + 1
+        end = text.find(_FENCE, body)
+        if end != -1:
+            return text[body:end].strip()
 
     # Return as-is (assume plain JSON)
     return text
 
 
+def json_dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes.
+
+    Uses orjson when installed, which writes bytes directly instead of building
+    a str and re-encoding it. Suitable for httpx ``content=`` request bodies.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON
+
+    Examples:
+        >>> json_dumps_bytes({"key": "value"})
+        b'{"key":"value"}'
+    """
+    return _json_dumps_bytes(obj)
+
+
 def safe_json_parse(
     text: str, extract_markdown: bool = True, error_context: str = ""
 ) -> dict[str, Any]:
@@ -98,8 +132,8 @@ def safe_json_parse(
         # Extract from markdown if requested
         json_str = extract_json_from_markdown(text) if extract_markdown else text.strip()
 
-        # Parse JSON
-        return json.loads(json_str)
+        # Parse JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+        return _json_loads(json_str)
 
     except json.JSONDecodeError as e:
         error_msg = "Invalid JSON response"
@@ -115,13 +149,13 @@ def safe_json_parse(
         raise LLMInvalidResponseError(error_msg) from e
 
 
-def validate_json_fields(data: dict[str, Any], required_fields: list[str]) -> None:
+def validate_json_fields(data: dict[str, Any], required_fields: Collection[str]) -> None:
     """
     Validate that required fields exist in JSON data.
 
     Args:
         data: JSON data dictionary
-        required_fields: List of required field names
+        required_fields: Required field names (list, tuple or set)
 
     Raises:
         LLMInvalidResponseError: If required fields are missing
@@ -133,8 +167,11 @@ def validate_json_fields(data: dict[str, Any], required_fields: list[str]) -> No
             ...
         LLMInvalidResponseError: Missing required fields: age
     """
-    missing_fields = [field for field in required_fields if field not in data]
+    # Common case: everything present. map() over dict.__contains__ stays in C
+    # and stops at the first missing field.
+    if all(map(data.__contains__, required_fields)):
+        return
 
-    if missing_fields:
-        msg = f"Missing required fields: {', '.join(missing_fields)}"
-        raise LLMInvalidResponseError(msg)
+    missing_fields = [field for field in required_fields if field not in data]
+    msg = f"Missing required fields: {', '.join(missing_fields)}"
+    raise LLMInvalidResponseError(msg)
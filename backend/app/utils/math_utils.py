@@ -30,15 +30,21 @@ def clamp(value: float, min_value: float = 0.0, max_value: float = 1.0) -> float
         >>> clamp(0.5, 0.0, 1.0)
         0.5
     """
-    return max(min_value, min(max_value, value))
+    # Plain comparisons avoid the builtin max()/min() call overhead; this runs
+    # once per signal per candidate. NaN falls through to max_value, as before.
+    if value < min_value:
+        return min_value
+    if value <= max_value:
+        return value
+    return max_value
 
 
 def sigmoid(x: float) -> float:
     """
     Sigmoid function: 1 / (1 + e^-x).
 
-    Maps any real number to range (0, 1).
-    Handles overflow gracefully.
+    Maps any real number to range [0, 1]. Computed as 0.5 * (1 + tanh(x / 2)),
+    which is the same function but saturates instead of overflowing.
 
     Args:
         x: Input value
@@ -54,12 +60,7 @@ def sigmoid(x: float) -> float:
         >>> sigmoid(-100)  # Large negative
         0.0
     """
-    try:
-        return 1.0 / (1.0 + math.exp(-x))
-    except OverflowError:
-        # For very large negative x, exp(-x) overflows to inf
-        # In this case, sigmoid approaches 0
-        return 0.0 if x < 0 else 1.0
+    return 0.5 * (1.0 + math.tanh(0.5 * x))
 
 
 def normalize_to_range(
@@ -122,5 +123,7 @@ def log_normalize(value: float, base: float = math.e, max_log: float = 7.0) -> f
     if value <= 0:
         return 0.0
 
-    log_value = math.log(value + 1, base)
+    log_value = math.log1p(value)
+    if base != math.e:
+        log_value /= math.log(base)
     return clamp(log_value / max_log, 0.0, 1.0)
@@ -2,6 +2,7 @@
 Rate Limiter Utility
 Reusable rate limiting for any API or service
 """
+import threading
 import time
 
 from loguru import logger
@@ -108,3 +109,101 @@ class RateLimiter:
             f"time_window={self.time_window}s, "
             f"remaining={self.get_remaining()})"
         )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for client-side request throttling
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` blocks until a token is available (or gives up after an
+    optional timeout), so callers stay under the provider's limit instead of
+    hitting it and backing off. ``pause`` lets a
+    server-provided delay (e.g. Retry-After) hold every caller back.
+
+    Example:
+        bucket = TokenBucket(rate=0.5, capacity=30)
+        bucket.acquire()  # Blocks if the bucket is empty
+        bucket.acquire(timeout=1.0)  # False if no token within a second
+        bucket.pause(5.0)  # Server asked us to wait
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second. A rate <= 0 disables throttling.
+            capacity: Maximum burst size; the bucket starts full
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update (caller holds the lock)"""
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Take one token, waiting for a refill or an active pause to end
+
+        Args:
+            timeout: Longest to wait in seconds; None waits indefinitely
+
+        Returns:
+            True if a token was taken, False if none would be available within
+            ``timeout`` (returns at once rather than sleeping out the timeout)
+        """
+
+        if self.rate <= 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return True
+                    wait = (1.0 - self._tokens) / self.rate
+
+                if deadline is not None and now + wait > deadline:
+                    return False
+
+                self._condition.wait(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Block all acquirers for ``seconds`` and drain the bucket
+
+        Overlapping pauses keep the later deadline.
+
+        Args:
+            seconds: Delay requested by the server
+        """
+
+        if seconds <= 0:
+            return
+
+        with self._condition:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+            logger.debug(f"Token bucket paused for {seconds:.2f} seconds")
+
+    def __repr__(self) -> str:
+        """String representation"""
+
+        return f"TokenBucket(rate={self.rate}/s, capacity={self.capacity})"
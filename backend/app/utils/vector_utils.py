@@ -14,6 +14,10 @@ import faiss
 import numpy as np
 
 
+# int8 symmetric quantization range: values map onto [-127, 127]
+_INT8_MAX = 127.0
+
+
 class VectorNormalizer:
     """
     Utilities for vector normalization and preprocessing.
@@ -187,3 +191,84 @@ class VectorNormalizer:
             faiss.normalize_L2(batch)
 
         return embeddings_f32
+
+    @staticmethod
+    def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Quantize vectors to int8 with one symmetric scale per vector.
+
+        Each vector is divided by ``max(|v|) / 127`` and rounded, so it can be
+        reconstructed as ``q * scale``. Storage drops to a quarter of float32.
+
+        Args:
+            vectors: Array of shape (n, d) or (d,)
+
+        Returns:
+            Tuple of (int8 codes with the input shape, float32 scales of shape
+            (n,) or () for a 1D input). All-zero vectors get a scale of 0.0.
+
+        Example:
+            ```python
+            vectors = np.random.randn(100, 768)
+            codes, scales = VectorNormalizer.quantize_int8(vectors)
+            restored = VectorNormalizer.dequantize_int8(codes, scales)
+            ```
+        """
+        vectors_f32 = VectorNormalizer.ensure_contiguous_f32(vectors)
+        scales = np.abs(vectors_f32).max(axis=-1) / np.float32(_INT8_MAX)
+
+        # Zero vectors would divide by zero; any non-zero divisor yields zero codes
+        safe_scales = np.where(scales > 0, scales, np.float32(1.0))
+        codes = np.rint(vectors_f32 / safe_scales[..., np.newaxis]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    @staticmethod
+    def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct float32 vectors from int8 codes and per-vector scales.
+
+        Args:
+            codes: int8 array of shape (n, d) or (d,)
+            scales: Scales returned by quantize_int8
+
+        Returns:
+            float32 array with the shape of ``codes``
+        """
+        scales_f32 = np.asarray(scales, dtype=np.float32)
+        return codes.astype(np.float32) * scales_f32[..., np.newaxis]
+
+    @staticmethod
+    def int8_cosine_similarity(
+        query_codes: np.ndarray,
+        codes: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Cosine similarity between an int8 query and a matrix of int8 vectors.
+
+        Dot products and norms are accumulated in int32, so the per-vector
+        scales cancel out of the cosine and never need to be applied.
+
+        Args:
+            query_codes: int8 query vector of shape (d,)
+            codes: int8 matrix of shape (n, d)
+
+        Returns:
+            float32 similarities of shape (n,); 0.0 where either vector is zero
+
+        Example:
+            ```python
+            q_codes, _ = VectorNormalizer.quantize_int8(query)
+            m_codes, _ = VectorNormalizer.quantize_int8(embeddings)
+            sims = VectorNormalizer.int8_cosine_similarity(q_codes, m_codes)
+            ```
+        """
+        query_i32 = query_codes.astype(np.int32)
+        codes_i32 = codes.astype(np.int32)
+
+        dots = codes_i32 @ query_i32
+        norms = np.sqrt(np.einsum("ij,ij->i", codes_i32, codes_i32), dtype=np.float32)
+        norms *= np.sqrt(np.float32(query_i32 @ query_i32))
+
+        sims = np.zeros(len(codes_i32), dtype=np.float32)
+        np.divide(dots, norms, out=sims, where=norms > 0)
+        return sims
@@ -47,6 +47,8 @@ from pathlib import Path
 import sys
 import time
 
+from sqlalchemy import text
+
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -68,7 +70,11 @@ def create_tables():
     In production, use Alembic migrations instead.
     """
     logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # The embedding column and the trigram title indexes need these extensions
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.create_all(bind=conn)
     logger.info("✓ Tables created successfully")
 
 
@@ -0,0 +1,121 @@
+"""
+Shared pytest fixtures.
+
+Session-scoped fixtures are created once per pytest-xdist worker, not once
+per run. Tests that depend on an expensive session fixture can be pinned to
+one worker with ``@pytest.mark.xdist_group(...)`` and ``--dist loadgroup``.
+
+Tests marked ``slow`` (they load the real embedding model) are skipped
+unless pytest is run with ``--runslow``.
+
+Database tests share one in-memory SQLite schema per test session and
+isolate each test with a rolled-back outer transaction. Each xdist worker is a
+separate process with its own in-memory database, so database tests can be
+spread across workers with ``pytest -n auto`` without any shared state.
+"""
+
+from pgvector.sqlalchemy import Vector
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+
+
+def pytest_addoption(parser):
+    """Register the --runslow flag."""
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run tests marked slow (they load the real embedding model)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow was given."""
+    if config.getoption("--runslow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="slow: pass --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+# The models use PostgreSQL column types; store them as JSON/BLOB in SQLite
+# so the schema can be created for tests.
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _compile_json_for_sqlite(_type, _compiler, **_kw):
+    return "JSON"
+
+
+@compiles(Vector, "sqlite")
+def _compile_vector_for_sqlite(_type, _compiler, **_kw):
+    return "BLOB"
+
+
+# One session registry for the test session; each test rebinds it to its own connection.
+# Commits become SAVEPOINTs and keep loaded attributes, so tests can assert on
+# ORM state after committing without a reload round-trip.
+_Session = scoped_session(
+    sessionmaker(
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    Create one in-memory SQLite database for the whole test session.
+
+    The schema is created once; tests are isolated by ``db_session`` rolling
+    back their transaction instead of dropping and recreating tables.
+    """
+    # StaticPool keeps the single in-memory connection alive across sessions
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(engine):
+    """
+    Create a session whose changes are rolled back after each test.
+
+    The session runs inside an outer transaction and turns its own commits
+    and rollbacks into SAVEPOINTs, so tests can commit (or hit integrity
+    errors) freely without leaking rows into the next test.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    _Session.configure(bind=connection)
+
+    yield _Session()
+
+    # Cleanup
+    _Session.remove()
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,134 @@
+"""
+Lightweight test doubles and helpers shared across test modules.
+
+Plain slotted dataclasses stand in for HTTP responses and clients where a
+MagicMock's auto-generated attributes are not needed.
+"""
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    """Minimal stand-in for httpx.Response."""
+
+    status_code: int = 200
+    _json: Any = None
+    text: str = ""
+    headers: httpx.Headers = field(default_factory=httpx.Headers)
+    lines: list[str] = field(default_factory=list)
+    lines_read: int = 0
+
+    def json(self) -> Any:
+        """Return the configured JSON body."""
+        return self._json
+
+    def read(self) -> bytes:
+        """Return the body text as bytes (streamed bodies are preloaded)."""
+        return self.text.encode()
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the configured stream lines, counting how many were consumed."""
+        for line in self.lines:
+            self.lines_read += 1
+            yield line
+
+    def raise_for_status(self) -> None:
+        """Raise HTTPStatusError for 4xx/5xx statuses, like httpx."""
+        if self.status_code >= 400:
+            request = httpx.Request("POST", "http://test")
+            response = httpx.Response(self.status_code, text=self.text, request=request)
+            msg = f"HTTP {self.status_code}"
+            raise httpx.HTTPStatusError(msg, request=request, response=response)
+
+
+@dataclass(slots=True)
+class FakeHttpxClient:
+    """
+    Minimal stand-in for httpx.Client.
+
+    ``post``, ``get`` and ``stream`` record their arguments in ``calls`` and
+    return the first of ``queued`` (consuming it) or else ``next_response``,
+    or raise ``raise_exc`` when set.
+    """
+
+    next_response: FakeResponse = field(default_factory=FakeResponse)
+    queued: list[FakeResponse] = field(default_factory=list)
+    raise_exc: Exception | None = None
+    calls: list[dict[str, Any]] = field(default_factory=list)
+    close_count: int = 0
+
+    def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Record the request and return (or raise) the configured outcome."""
+        self.calls.append({"url": url, **kwargs})
+        return self._respond()
+
+    def get(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Record the request and return (or raise) the configured outcome."""
+        self.calls.append({"method": "GET", "url": url, **kwargs})
+        return self._respond()
+
+    def _respond(self) -> FakeResponse:
+        if self.raise_exc is not None:
+            raise self.raise_exc
+        return self.queued.pop(0) if self.queued else self.next_response
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs: Any) -> Iterator[FakeResponse]:
+        """Record the request and yield (or raise) the configured outcome."""
+        self.calls.append({"method": method, "url": url, **kwargs})
+        yield self._respond()
+
+    def posted_json(self, index: int = -1) -> Any:
+        """Decode the JSON body of a recorded post (``json=`` or ``content=``)."""
+        call = self.calls[index]
+        if "json" in call:
+            return call["json"]
+        return json.loads(call["content"])
+
+    def close(self) -> None:
+        """Record that the client was closed."""
+        self.close_count += 1
+
+
+def normalize_inplace(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize a vector, or each row of a matrix, in place.
+
+    Row norms come from a single einsum pass over the buffer (no squared
+    copy, unlike ``np.linalg.norm(axis=...)``); the vectors are then scaled
+    by the reciprocal norm in place, so FP32 input stays FP32. Returns ``vectors``.
+    """
+    norms = np.sqrt(np.einsum("...i,...i->...", vectors, vectors))[..., np.newaxis]
+    np.multiply(vectors, np.reciprocal(norms, dtype=vectors.dtype), out=vectors)
+    return vectors
+
+
+@contextmanager
+def count_queries(session: Session) -> Iterator[list[str]]:
+    """
+    Record every SQL statement the session's connection executes in the block.
+
+    Yields the list of statements, so tests can assert on loading behaviour,
+    e.g. that walking eagerly loaded relationships emits no extra SELECTs.
+    """
+    statements: list[str] = []
+    connection = session.connection()
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
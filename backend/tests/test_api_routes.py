@@ -80,6 +80,25 @@ class TestHealthEndpoints:
         assert "database" in data["checks"]
         assert "configuration" in data["checks"]
 
+    def test_detailed_health_reports_estimated_movie_count(self):
+        client = _build_health_client()
+        with patch(
+            "app.api.routes.health.MovieRepository.get_total_movies_approx", return_value=1234
+        ):
+            resp = client.get("/health/detailed")
+        assert resp.json()["checks"]["database"]["movies"] == 1234
+
+    def test_detailed_health_count_failure_keeps_database_healthy(self):
+        client = _build_health_client()
+        with patch(
+            "app.api.routes.health.MovieRepository.get_total_movies_approx",
+            side_effect=RuntimeError("estimate failed"),
+        ):
+            resp = client.get("/health/detailed")
+        database = resp.json()["checks"]["database"]
+        assert database["status"] == "healthy"
+        assert database["movies"] is None
+
 
 # =============================================================================
 # Admin-protected endpoints (cache/stats and jobs)
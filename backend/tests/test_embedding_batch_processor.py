@@ -5,11 +5,21 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
-from app.models.media import Genre, Movie
+from app.models.media import Genre, Media, MediaEmbedding, Movie
 from app.repositories.movie_repository import MovieRepository
 from app.services.embedding_batch_processor import EmbeddingBatchProcessor
 
 
+# FP32 like the model's real output, so dtype regressions surface in tests
+_rng = np.random.default_rng(0)
+
+
+def _movie_with_embedding(movie_id: int, embedding: object) -> Movie:
+    """Build a Movie whose Media anchor carries the given embedding vector."""
+    media = Media(content_type="Movie", embedding=MediaEmbedding(embedding=embedding))
+    return Movie(id=movie_id, tmdb_id=1000 + movie_id, title=f"Movie {movie_id}", media=media)
+
+
 @pytest.fixture()
 def mock_db_session():
     """Create mock database session."""
@@ -93,7 +103,7 @@ class TestProcessBatch:
                     ]
 
                     # Mock embeddings
-                    mock_generate.return_value = np.random.rand(2, 768)
+                    mock_generate.return_value = _rng.random((2, 768), dtype=np.float32)
 
                     stats = processor._process_batch(sample_movies[:2])
 
@@ -116,7 +126,7 @@ class TestProcessBatch:
             with patch.object(
                 processor.embedding_service, "generate_embeddings_batch"
             ) as mock_generate:
-                mock_generate.return_value = np.random.rand(1, 768)
+                mock_generate.return_value = _rng.random((1, 768), dtype=np.float32)
 
                 with patch.object(processor, "_store_embedding"):
                     stats = processor._process_batch(sample_movies[:3])
@@ -150,7 +160,7 @@ class TestProcessBatch:
             with patch.object(
                 processor.embedding_service, "generate_embeddings_batch"
             ) as mock_generate:
-                mock_generate.return_value = np.random.rand(2, 768)
+                mock_generate.return_value = _rng.random((2, 768), dtype=np.float32)
 
                 with patch.object(processor, "_store_embedding") as mock_store:
                     # First succeeds, second fails
@@ -165,22 +175,37 @@ class TestProcessBatch:
 class TestStoreEmbedding:
     """Tests for _store_embedding method."""
 
-    def test_store_embedding(self, processor):
-        """Test storing embedding for a movie."""
-        with patch.object(processor.movie_repo, "update") as mock_update:
-            embedding = np.random.rand(768)
+    def test_store_embedding(self, processor, mock_db_session):
+        """Test storing a new embedding adds a float32 row for the media anchor."""
+        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        # float64 and strided, so the conversion to the column's layout is exercised
+        embedding = _rng.random(2 * 768)[::2]
+
+        processor._store_embedding(media_id=1, embedding=embedding)
+
+        mock_db_session.add.assert_called_once()
+        stored = mock_db_session.add.call_args[0][0]
+        assert isinstance(stored, MediaEmbedding)
+        assert stored.media_id == 1
+        assert stored.needs_rebuild is False
+        assert isinstance(stored.embedding, np.ndarray)
+        assert stored.embedding.dtype == np.float32
+        assert stored.embedding.flags.c_contiguous
+        np.testing.assert_allclose(stored.embedding, embedding, rtol=1e-6)
 
-            processor._store_embedding(movie_id=1, embedding=embedding)
+    def test_store_embedding_updates_existing_row(self, processor, mock_db_session):
+        """Test storing over an existing row replaces its vector in place."""
+        existing = MediaEmbedding(media_id=1, embedding=None, needs_rebuild=True)
+        mock_db_session.query.return_value.filter.return_value.first.return_value = existing
+        embedding = _rng.random(768, dtype=np.float32)
 
-            # Check update was called with correct data
-            mock_update.assert_called_once()
-            call_args = mock_update.call_args[0]
+        processor._store_embedding(media_id=1, embedding=embedding)
 
-            assert call_args[0] == 1  # movie_id
-            assert "embedding" in call_args[1]
-            assert "has_embedding" in call_args[1]
-            assert call_args[1]["has_embedding"] is True
-            assert len(call_args[1]["embedding"]) == 768
+        mock_db_session.add.assert_not_called()
+        assert existing.needs_rebuild is False
+        assert existing.embedding.dtype == np.float32
+        assert existing.embedding.flags.c_contiguous
+        np.testing.assert_array_equal(existing.embedding, embedding)
 
 
 class TestGetProgress:
@@ -228,12 +253,10 @@ class TestValidateEmbeddings:
 
     def test_validate_embeddings_all_valid(self, processor):
         """Test validation when all embeddings are valid."""
-        # Create movies with valid embeddings
-        movies = []
-        for i in range(5):
-            movie = Movie(id=i + 1, tmdb_id=1000 + i, title=f"Movie {i}")
-            movie.embedding_vector = np.random.rand(768).tolist()
-            movies.append(movie)
+        # pgvector loads Vector columns as float32 ndarrays
+        movies = [
+            _movie_with_embedding(i + 1, _rng.random(768, dtype=np.float32)) for i in range(5)
+        ]
 
         with patch.object(processor.movie_repo, "get_movies_with_embeddings") as mock_get:
             mock_get.return_value = movies
@@ -247,8 +270,7 @@ class TestValidateEmbeddings:
 
     def test_validate_embeddings_wrong_dimensions(self, processor):
         """Test validation detects wrong dimensions."""
-        movie = Movie(id=1, tmdb_id=1000, title="Movie 1")
-        movie.embedding_vector = np.random.rand(512).tolist()  # Wrong dimension
+        movie = _movie_with_embedding(1, _rng.random(512, dtype=np.float32))
 
         with patch.object(processor.movie_repo, "get_movies_with_embeddings") as mock_get:
             mock_get.return_value = [movie]
@@ -260,10 +282,9 @@ class TestValidateEmbeddings:
             assert results["invalid"] == 1
             assert "768" in results["errors"][0]
 
-    def test_validate_embeddings_not_list(self, processor):
-        """Test validation detects non-list embeddings."""
-        movie = Movie(id=1, tmdb_id=1000, title="Movie 1")
-        movie.embedding_vector = "not a list"
+    def test_validate_embeddings_null(self, processor):
+        """Test validation detects a NULL embedding vector."""
+        movie = _movie_with_embedding(1, None)
 
         with patch.object(processor.movie_repo, "get_movies_with_embeddings") as mock_get:
             mock_get.return_value = [movie]
@@ -273,13 +294,11 @@ class TestValidateEmbeddings:
             assert results["checked"] == 1
             assert results["valid"] == 0
             assert results["invalid"] == 1
-            assert "not a list" in results["errors"][0]
+            assert "NULL" in results["errors"][0]
 
-    def test_validate_embeddings_non_numeric(self, processor):
-        """Test validation detects non-numeric values."""
-        movie = Movie(id=1, tmdb_id=1000, title="Movie 1")
-        embedding = [0.5] * 767 + ["not a number"]
-        movie.embedding_vector = embedding
+    def test_validate_embeddings_unsized(self, processor):
+        """Test validation reports an embedding with no length as an error."""
+        movie = _movie_with_embedding(1, 0.5)
 
         with patch.object(processor.movie_repo, "get_movies_with_embeddings") as mock_get:
             mock_get.return_value = [movie]
@@ -289,4 +308,4 @@ class TestValidateEmbeddings:
             assert results["checked"] == 1
             assert results["valid"] == 0
             assert results["invalid"] == 1
-            assert "non-numeric" in results["errors"][0]
+            assert "validation error" in results["errors"][0]
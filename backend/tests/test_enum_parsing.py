@@ -12,264 +12,112 @@ from app.schemas.query import EmotionType, ToneType, QueryParserConfig
 from app.services.query_parser import QueryParser
 
 
-class TestEnumParsing:
-    """Test that enum parsing correctly handles valid and invalid values"""
-
-    @pytest.fixture
-    def query_parser(self):
-        """Create query parser with mocked LLM"""
-        config = QueryParserConfig(llm_provider="groq", enable_fallback=True)
-        with patch("app.services.llm_client.settings") as mock_settings:
-            mock_settings.LLM_PROVIDER = "groq"
-            mock_settings.GROQ_API_KEY = "test_key"
-            mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
-            return QueryParser(config=config)
-
-    def test_valid_tone_values(self, query_parser):
-        """Test that valid tone values are parsed correctly"""
-        mock_response = {
-            "themes": [],
-            "tones": ["dark", "serious", "intense"],  # All valid
-            "emotions": [],
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": True,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
-
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("test query")
-
-            assert len(parsed.intent.tones) == 3
-            assert ToneType.DARK in parsed.intent.tones
-            assert ToneType.SERIOUS in parsed.intent.tones
-            assert ToneType.INTENSE in parsed.intent.tones
+_BASE_RESPONSE = {
+    "themes": [],
+    "tones": [],
+    "emotions": [],
+    "reference_titles": [],
+    "keywords": [],
+    "plot_elements": [],
+    "undesired_themes": [],
+    "undesired_tones": [],
+    "is_comparison_query": False,
+    "is_mood_query": False,
+    "media_type": "both",
+    "genres": [],
+    "exclude_genres": [],
+    "languages": [],
+    "year_min": None,
+    "year_max": None,
+    "rating_min": None,
+    "runtime_min": None,
+    "runtime_max": None,
+    "streaming_providers": [],
+    "popular_only": False,
+    "hidden_gems": False,
+    "search_text": "test",
+}
+
+
+@pytest.fixture(scope="module")
+def query_parser():
+    """Create query parser with mocked LLM (uncached: every case reparses "test query")"""
+    config = QueryParserConfig(llm_provider="groq", enable_fallback=True, cache_results=False)
+    with patch("app.services.llm_client.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "groq"
+        mock_settings.GROQ_API_KEY = "test_key"
+        mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
+        return QueryParser(config=config)
 
-    def test_invalid_tone_values_skipped(self, query_parser):
-        """Test that invalid tone values are skipped with warning"""
-        mock_response = {
-            "themes": [],
-            "tones": ["dark", "invalid_tone", "serious", "another_bad_one"],  # Mix of valid/invalid
-            "emotions": [],
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": True,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("test query")
-
-            # Should only have the 2 valid tones
-            assert len(parsed.intent.tones) == 2
-            assert ToneType.DARK in parsed.intent.tones
-            assert ToneType.SERIOUS in parsed.intent.tones
-
-    def test_valid_emotion_values(self, query_parser):
-        """Test that valid emotion values are parsed correctly"""
-        mock_response = {
-            "themes": [],
-            "tones": [],
-            "emotions": ["joy", "fear", "awe"],  # All valid
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": True,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
-
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("test query")
-
-            assert len(parsed.intent.emotions) == 3
-            assert EmotionType.JOY in parsed.intent.emotions
-            assert EmotionType.FEAR in parsed.intent.emotions
-            assert EmotionType.AWE in parsed.intent.emotions
-
-    def test_invalid_emotion_values_skipped(self, query_parser):
-        """Test that invalid emotion values are skipped"""
-        mock_response = {
-            "themes": [],
-            "tones": [],
-            "emotions": ["joy", "bad_emotion", "fear"],  # Mix of valid/invalid
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": True,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
-
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("test query")
-
-            # Should only have the 2 valid emotions
-            assert len(parsed.intent.emotions) == 2
-            assert EmotionType.JOY in parsed.intent.emotions
-            assert EmotionType.FEAR in parsed.intent.emotions
-
-    def test_all_invalid_enum_values(self, query_parser):
-        """Test handling when all enum values are invalid"""
-        mock_response = {
-            "themes": [],
-            "tones": ["invalid1", "invalid2"],  # All invalid
-            "emotions": ["bad1", "bad2"],  # All invalid
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": False,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
-
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("test query")
-
-            # Should have empty lists when all values are invalid
-            assert len(parsed.intent.tones) == 0
-            assert len(parsed.intent.emotions) == 0
+class TestEnumParsing:
+    """Test that enum parsing correctly handles valid and invalid values"""
 
-    def test_empty_enum_lists(self, query_parser):
-        """Test handling empty enum lists"""
-        mock_response = {
-            "themes": [],
-            "tones": [],  # Empty
-            "emotions": [],  # Empty
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": [],
-            "is_comparison_query": False,
-            "is_mood_query": False,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
+    @pytest.mark.parametrize(
+        ("field", "values", "expected"),
+        [
+            pytest.param(
+                "tones",
+                ["dark", "serious", "intense"],
+                {ToneType.DARK, ToneType.SERIOUS, ToneType.INTENSE},
+                id="valid_tones",
+            ),
+            pytest.param(
+                "tones",
+                ["dark", "invalid_tone", "serious", "another_bad_one"],
+                {ToneType.DARK, ToneType.SERIOUS},
+                id="invalid_tones_skipped",
+            ),
+            pytest.param(
+                "emotions",
+                ["joy", "fear", "awe"],
+                {EmotionType.JOY, EmotionType.FEAR, EmotionType.AWE},
+                id="valid_emotions",
+            ),
+            pytest.param(
+                "emotions",
+                ["joy", "bad_emotion", "fear"],
+                {EmotionType.JOY, EmotionType.FEAR},
+                id="invalid_emotions_skipped",
+            ),
+            pytest.param("tones", ["invalid1", "invalid2"], set(), id="all_invalid_tones"),
+            pytest.param("emotions", ["bad1", "bad2"], set(), id="all_invalid_emotions"),
+            pytest.param("tones", [], set(), id="empty_tones"),
+            pytest.param("emotions", [], set(), id="empty_emotions"),
+            pytest.param(
+                "undesired_tones",
+                ["light", "invalid_tone", "comedic"],
+                {ToneType.LIGHT, ToneType.COMEDIC},
+                id="undesired_tones",
+            ),
+        ],
+    )
+    def test_enum_values_filtered(self, query_parser, field, values, expected):
+        """Test that valid enum values are kept and invalid ones are skipped"""
+        mock_response = dict(_BASE_RESPONSE)
+        mock_response[field] = values
 
         with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
             parsed = query_parser.parse("test query")
 
-            assert len(parsed.intent.tones) == 0
-            assert len(parsed.intent.emotions) == 0
-
-    def test_undesired_tones_parsing(self, query_parser):
-        """Test that undesired_tones are also parsed correctly"""
-        mock_response = {
-            "themes": [],
-            "tones": [],
-            "emotions": [],
-            "reference_titles": [],
-            "keywords": [],
-            "plot_elements": [],
-            "undesired_themes": [],
-            "undesired_tones": ["light", "invalid_tone", "comedic"],  # Mix
-            "is_comparison_query": False,
-            "is_mood_query": False,
-            "media_type": "both",
-            "genres": [],
-            "exclude_genres": [],
-            "languages": [],
-            "year_min": None,
-            "year_max": None,
-            "rating_min": None,
-            "runtime_min": None,
-            "runtime_max": None,
-            "streaming_providers": [],
-            "popular_only": False,
-            "hidden_gems": False,
-            "search_text": "test",
-        }
+        parsed_values = getattr(parsed.intent, field)
+        assert len(parsed_values) == len(expected)
+        assert set(parsed_values) == expected
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param("movie", "movie", id="valid"),
+            pytest.param("film", "both", id="invalid_defaults_to_both"),
+            pytest.param(None, "both", id="missing_defaults_to_both"),
+        ],
+    )
+    def test_media_type_filtered(self, query_parser, value, expected):
+        """Test that an invalid media_type falls back to BOTH instead of raising"""
+        mock_response = dict(_BASE_RESPONSE, media_type=value)
 
         with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
             parsed = query_parser.parse("test query")
 
-            # Should only have the 2 valid tones
-            assert len(parsed.intent.undesired_tones) == 2
-            assert ToneType.LIGHT in parsed.intent.undesired_tones
-            assert ToneType.COMEDIC in parsed.intent.undesired_tones
+        assert parsed.parsing_method == "llm"
+        assert parsed.constraints.media_type == expected
@@ -11,7 +11,50 @@ import pytest
 
 from app.models.media import Cast, Genre, Keyword, Movie
 from app.schemas.query import QueryConstraints
-from app.services.filter_engine import FilterEngine, FilterStatistics
+from app.services.filter_engine import FilterEngine, FilterKind, FilterStatistics
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+_MOVIE_DEFAULTS = {
+    "id": None,
+    "tmdb_id": None,
+    "title": None,
+    "original_title": None,
+    "overview": None,
+    "release_date": None,
+    "runtime": None,
+    "adult": False,
+    "popularity": 0.0,
+    "vote_average": None,
+    "vote_count": 0,
+    "original_language": None,
+    "genres": (),
+    "keywords": (),
+    "cast_members": (),
+    "streaming_providers": {},
+}
+
+
+def _make_movie(**kwargs) -> Movie:
+    """
+    Build a plain attribute-bearing Movie without the declarative constructor.
+
+    FilterEngine only reads attributes, so the SQLAlchemy ``__init__`` (instance
+    state, relationship coercion) is skipped. Genres, keywords and cast live on
+    ``Media`` in the schema and are set directly on the instance here.
+
+    The result has no SQLAlchemy instance state, so it is read-only: normal
+    attribute assignment (on it or on a copy) raises ``AttributeError``.
+    Build a fresh movie with the values a test needs instead of mutating one.
+    """
+    movie = Movie.__new__(Movie)
+    movie.__dict__.update(_MOVIE_DEFAULTS)
+    movie.__dict__.update(kwargs)
+    return movie
 
 
 # =============================================================================
@@ -19,9 +62,14 @@ from app.services.filter_engine import FilterEngine, FilterStatistics
 # =============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_movies():
-    """Create sample movies for testing."""
+    """
+    Create sample movies for testing.
+
+    Module-scoped: FilterEngine never mutates its inputs, so the same objects
+    are shared across tests.
+    """
     # Create genres
     action = Genre(id=1, tmdb_id=28, name="Action")
     drama = Genre(id=2, tmdb_id=18, name="Drama")
@@ -29,8 +77,8 @@ def sample_movies():
     comedy = Genre(id=4, tmdb_id=35, name="Comedy")
 
     # Create keywords
-    space = Keyword(id=1, tmdb_id=100, name="space")
-    time_travel = Keyword(id=2, tmdb_id=200, name="time travel")
+    space = Keyword(id=1, name="space")
+    time_travel = Keyword(id=2, name="time travel")
 
     # Create cast
     actor1 = Cast(id=1, tmdb_id=1, name="Actor One")
@@ -38,7 +86,7 @@ def sample_movies():
 
     movies = [
         # Movie 1: Popular English action/scifi, PG-13, recent
-        Movie(
+        _make_movie(
             id=1,
             tmdb_id=550,
             title="Interstellar",
@@ -57,7 +105,7 @@ def sample_movies():
             streaming_providers={"Netflix": ["US"], "Prime": ["US", "GB"]},
         ),
         # Movie 2: Moderate popularity, older, different language
-        Movie(
+        _make_movie(
             id=2,
             tmdb_id=551,
             title="Parasite",
@@ -76,7 +124,7 @@ def sample_movies():
             streaming_providers={"Hulu": ["US"]},
         ),
         # Movie 3: Low popularity, very old, short runtime
-        Movie(
+        _make_movie(
             id=3,
             tmdb_id=552,
             title="Classic Film",
@@ -95,7 +143,7 @@ def sample_movies():
             streaming_providers={},
         ),
         # Movie 4: Adult content, recent comedy
-        Movie(
+        _make_movie(
             id=4,
             tmdb_id=553,
             title="Adult Comedy",
@@ -114,7 +162,7 @@ def sample_movies():
             streaming_providers={"Netflix": ["US"]},
         ),
         # Movie 5: No release date, no runtime
-        Movie(
+        _make_movie(
             id=5,
             tmdb_id=554,
             title="Upcoming Film",
@@ -138,8 +186,9 @@ def sample_movies():
 
 
 @pytest.fixture
-def filter_engine():
-    """Create filter engine instance."""
+def filter_engine(monkeypatch):
+    """Create filter engine instance with fresh selectivity history."""
+    monkeypatch.setattr(FilterEngine, "_selectivity_ewma", {})
     return FilterEngine()
 
 
@@ -298,6 +347,18 @@ class TestFilterEngine:
         filtered = filter_engine.apply_filters(sample_movies, constraints)
         assert len(filtered) == 3
 
+    def test_filter_genres_sees_in_place_genre_changes(self, filter_engine):
+        """Test genre filtering sees changes made to the genres list between runs."""
+        movie = _make_movie(title="Mutable", genres=[Genre(name="Drama")])
+        constraints = QueryConstraints(genres=["Horror"])
+        assert filter_engine.apply_filters([movie], constraints) == []
+
+        movie.genres.append(Genre(name="Horror"))
+        assert filter_engine.apply_filters([movie], constraints) == [movie]
+
+        movie.genres.pop()
+        assert filter_engine.apply_filters([movie], constraints) == []
+
     def test_filter_streaming_providers_single(self, filter_engine, sample_movies):
         """Test filtering by single streaming provider."""
         constraints = QueryConstraints(streaming_providers=["Netflix"])
@@ -362,6 +423,21 @@ class TestFilterEngine:
         filtered = filter_engine.apply_filters(sample_movies, constraints)
         assert len(filtered) == 0
 
+    def test_selectivity_history_updated(self, filter_engine, sample_movies):
+        """Test that each run folds its selectivity into the moving average."""
+        constraints = QueryConstraints(languages=["ja"], adult_content=True)
+        filter_engine.apply_filters(sample_movies, constraints)
+        # Language removed everything: 0.9 * 0.5 + 0.1 * 1.0
+        assert FilterEngine._selectivity_ewma == {FilterKind.LANGUAGE: pytest.approx(0.55)}
+
+    def test_most_selective_filter_planned_first(self, filter_engine):
+        """Test that filters are ordered by observed selectivity, then declaration."""
+        FilterEngine._selectivity_ewma[FilterKind.RATING] = 0.9
+        FilterEngine._selectivity_ewma[FilterKind.LANGUAGE] = 0.1
+        constraints = QueryConstraints(languages=["en"], rating_min=7.0, year_min=2000)
+        plan = [kind for kind, _ in filter_engine._plan_filters(constraints)]
+        assert plan == [FilterKind.RATING, FilterKind.ADULT, FilterKind.YEAR, FilterKind.LANGUAGE]
+
 
 # =============================================================================
 # FilterStatistics Tests
@@ -380,6 +456,24 @@ class TestFilterStatistics:
         assert stats.filter_counts["language"] == (100, 80)
         assert stats.filter_counts["year"] == (80, 50)
 
+    def test_record_with_filter_kind(self):
+        """Test that FilterKind and its lowercase name share the same counts."""
+        stats = FilterStatistics()
+        stats.record(FilterKind.LANGUAGE, 100, 80)
+
+        assert stats.filter_counts["language"] == (100, 80)
+        assert stats.get_selectivity("language") == 20.0
+        assert stats.get_selectivity(FilterKind.LANGUAGE) == 20.0
+
+    def test_record_many_custom_filters(self):
+        """Test recording more custom filters than there are FilterKind rows."""
+        stats = FilterStatistics()
+        for i in range(2 * len(FilterKind)):
+            stats.record(f"custom_{i}", 10, i)
+
+        assert len(stats.filter_counts) == 2 * len(FilterKind)
+        assert stats.filter_counts["custom_15"] == (10, 15)
+
     def test_get_selectivity(self):
         """Test calculating filter selectivity."""
         stats = FilterStatistics()
@@ -438,7 +532,7 @@ class TestFilterEngineEdgeCases:
 
     def test_movie_missing_fields(self, filter_engine):
         """Test filtering movies with missing fields."""
-        movie = Movie(
+        movie = _make_movie(
             id=1,
             tmdb_id=1,
             title="Incomplete Movie",
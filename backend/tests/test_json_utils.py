@@ -7,9 +7,12 @@ Tests cover:
 - Edge cases and error handling
 """
 
+import json
+
 import pytest
 
 from app.services.exceptions import LLMInvalidResponseError
+from app.utils import json_utils
 from app.utils.json_utils import (
     extract_json_from_markdown,
     safe_json_parse,
@@ -115,6 +118,13 @@ class TestSafeJsonParse:
         result = safe_json_parse("[1, 2, 3, 4]")
         assert result == [1, 2, 3, 4]
 
+    def test_parse_with_stdlib_fallback(self, monkeypatch):
+        """Test parsing and errors when orjson is unavailable"""
+        monkeypatch.setattr(json_utils, "_json_loads", json.loads)
+        assert safe_json_parse('```json\n{"key": [1, 2]}\n```') == {"key": [1, 2]}
+        with pytest.raises(LLMInvalidResponseError, match="Invalid JSON response"):
+            safe_json_parse("{not json}")
+
 
 class TestValidateJsonFields:
     """Test JSON field validation"""
@@ -8,19 +8,38 @@ Tests cover:
 - JSON generation
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import json
-from unittest.mock import MagicMock, Mock, patch
+import time
+from unittest.mock import Mock, patch
 
 import httpx
 import pytest
 
+from app.core.config import settings
 from app.services.exceptions import LLMClientError, LLMInvalidResponseError, LLMRateLimitError
-from app.services.llm_client import LLMClient
+from app.services.llm_client import (
+    CompletionCache,
+    LLMClient,
+    _completion_cache,
+    _rate_limit_buckets,
+    close_http_pool,
+)
+from app.utils.rate_limiter import TokenBucket
+from tests.helpers import FakeHttpxClient, FakeResponse
 
 
 # --- Fixtures ---
 
 
+@pytest.fixture(autouse=True)
+def _fresh_rate_limits():
+    """Give each test fresh provider rate-limit buckets instead of the shared ones"""
+    _rate_limit_buckets.clear()
+    yield
+    _rate_limit_buckets.clear()
+
+
 @pytest.fixture()
 def groq_client():
     """Create Groq LLM client"""
@@ -52,6 +71,33 @@ def mock_ollama_response():
     return {"response": "This is a test response from Ollama"}
 
 
+@pytest.fixture()
+def mock_httpx(monkeypatch):
+    """
+    Replace the pooled httpx.Client with a FakeHttpxClient.
+
+    Returns a ``set_response(status=200, json_body=None, text="", raise_exc=None, headers=None)``
+    callable that configures what ``post`` returns (or raises) and returns the
+    fake client for call assertions. The patched client class is available as
+    ``set_response.client_class``.
+    """
+    fake_client = FakeHttpxClient()
+    client_class = Mock(return_value=fake_client)
+    monkeypatch.setattr("app.services.llm_client.httpx.Client", client_class)
+    # Start without a shared pool so the next request builds one from the fake
+    monkeypatch.setattr("app.services.llm_client._shared_http_client", None)
+
+    def set_response(status=200, json_body=None, text="", raise_exc=None, headers=None):
+        fake_client.next_response = FakeResponse(
+            status_code=status, _json=json_body, text=text, headers=httpx.Headers(headers or {})
+        )
+        fake_client.raise_exc = raise_exc
+        return fake_client
+
+    set_response.client_class = client_class
+    return set_response
+
+
 # --- Initialization Tests ---
 
 
@@ -62,8 +108,8 @@ class TestLLMClientInit:
         """Test initializing Groq client with API key"""
         client = LLMClient(provider="groq", api_key="test_key")
         assert client.provider == "groq"
-        assert client.api_key == "test_key"
-        assert client.model == "llama-3.1-70b-versatile"
+        assert client._groq_auth_headers == {"Authorization": "Bearer test_key"}
+        assert client.model_name == settings.GROQ_MODEL
 
     def test_init_groq_without_api_key_raises(self):
         """Test initializing Groq without API key raises error"""
@@ -72,15 +118,15 @@ class TestLLMClientInit:
             mock_settings.GROQ_API_KEY = ""
             mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
 
-            with pytest.raises(LLMClientError, match="Groq API key is required"):
+            with pytest.raises(LLMClientError, match="No LLM providers configured"):
                 LLMClient(provider="groq", api_key=None)
 
     def test_init_ollama(self):
         """Test initializing Ollama client"""
         client = LLMClient(provider="ollama")
         assert client.provider == "ollama"
-        assert client.api_key is None
-        assert client.base_url == "http://localhost:11434"
+        assert client._provider_chain == ["ollama"]
+        assert client.model_name == settings.OLLAMA_MODEL
 
     def test_init_unsupported_provider(self):
         """Test initializing with unsupported provider raises error"""
@@ -96,9 +142,9 @@ class TestLLMClientInit:
             model="custom-model",
             timeout=60,
         )
-        assert client.api_key == "custom_key"
-        assert client.base_url == "https://custom.api.com"
-        assert client.model == "custom-model"
+        assert client._groq_auth_headers == {"Authorization": "Bearer custom_key"}
+        assert client._groq_base_url == "https://custom.api.com"
+        assert client.model_name == "custom-model"
         assert client.timeout == 60
 
 
@@ -108,77 +154,169 @@ class TestLLMClientInit:
 class TestGroqAPI:
     """Test Groq API interactions"""
 
-    def test_groq_completion_success(self, groq_client, mock_groq_response):
+    def test_groq_completion_success(self, groq_client, mock_httpx, mock_groq_response):
         """Test successful Groq completion"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_groq_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            result = groq_client.generate_completion("Test prompt")
-            assert result == "This is a test response"
-
-    def test_groq_completion_with_system_prompt(self, groq_client, mock_groq_response):
+        mock_httpx(json_body=mock_groq_response)
+        result = groq_client.generate_completion("Test prompt")
+        assert result == "This is a test response"
+
+    def test_groq_completion_with_system_prompt(self, groq_client, mock_httpx, mock_groq_response):
         """Test Groq completion with system prompt"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_groq_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            result = groq_client.generate_completion(
-                "Test prompt", system_prompt="You are a helpful assistant"
-            )
-            assert result == "This is a test response"
-
-            # Verify system prompt was included in request
-            call_args = mock_client.post.call_args
-            payload = call_args.kwargs["json"]
-            assert len(payload["messages"]) == 2
-            assert payload["messages"][0]["role"] == "system"
-
-    def test_groq_completion_rate_limit(self, groq_client):
-        """Test Groq rate limit error"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 429
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client = mock_httpx(json_body=mock_groq_response)
+
+        result = groq_client.generate_completion(
+            "Test prompt", system_prompt="You are a helpful assistant"
+        )
+        assert result == "This is a test response"
+
+        # Verify system prompt was included in request
+        payload = mock_client.posted_json()
+        assert len(payload["messages"]) == 2
+        assert payload["messages"][0]["role"] == "system"
 
-            with pytest.raises(LLMRateLimitError, match="Rate limit exceeded"):
-                groq_client.generate_completion("Test prompt")
+    def test_groq_request_body_is_serialized_bytes(
+        self, groq_client, mock_httpx, mock_groq_response
+    ):
+        """Test the payload is posted as pre-serialized JSON bytes"""
+        mock_client = mock_httpx(json_body=mock_groq_response)
 
-    def test_groq_completion_http_error(self, groq_client):
+        groq_client.generate_completion("Test prompt")
+
+        call = mock_client.calls[-1]
+        assert isinstance(call["content"], bytes)
+        assert call["headers"]["Content-Type"] == "application/json"
+        assert mock_client.posted_json()["messages"][-1]["content"] == "Test prompt"
+
+    def test_groq_completion_rate_limit(self, groq_client, mock_httpx):
+        """Test Groq rate limit error"""
+        mock_httpx(status=429)
+        with pytest.raises(LLMRateLimitError, match="Rate limit exceeded"):
+            groq_client._groq_completion("Test prompt", None, 0.7, 100, None)
+
+    def test_groq_completion_http_error(self, groq_client, mock_httpx):
         """Test Groq HTTP error handling"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_response.text = "Internal Server Error"
-            mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-                "Server error", request=Mock(), response=mock_response
-            )
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            with pytest.raises(LLMClientError, match="Groq API error"):
-                groq_client.generate_completion("Test prompt")
-
-    def test_groq_completion_timeout(self, groq_client):
+        mock_httpx(status=500, text="Internal Server Error")
+        with pytest.raises(LLMClientError, match="Groq API error: 500"):
+            groq_client._groq_completion("Test prompt", None, 0.7, 100, None)
+
+    def test_groq_completion_timeout(self, groq_client, mock_httpx):
         """Test Groq timeout handling"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.post.side_effect = httpx.TimeoutException("Request timeout")
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_httpx(raise_exc=httpx.TimeoutException("Request timeout"))
+        with pytest.raises(LLMClientError, match="timed out"):
+            groq_client._groq_completion("Test prompt", None, 0.7, 100, None)
+
+    def test_provider_errors_surface_as_service_unavailable(self, groq_client, mock_httpx):
+        """Test generate_completion wraps the last provider error once the chain fails"""
+        mock_httpx(status=429)
+        with pytest.raises(LLMClientError, match="LLM service unavailable") as exc_info:
+            groq_client.generate_completion("Test prompt")
+        assert isinstance(exc_info.value.__cause__, LLMRateLimitError)
+
+
+# --- Groq Throttle Tests ---
+
+
+class TestGroqThrottle:
+    """Test client-side throttling of Groq requests"""
+
+    def test_retry_after_pauses_bucket(self, groq_client, mock_httpx):
+        """Test a 429 with Retry-After pauses the bucket before raising"""
+        mock_httpx(status=429, headers={"Retry-After": "5"})
+        groq_client._groq_bucket.pause = Mock()
 
-            with pytest.raises(LLMClientError, match="timed out"):
-                groq_client.generate_completion("Test prompt")
+        with pytest.raises(LLMClientError):
+            groq_client.generate_completion("Test prompt")
+
+        groq_client._groq_bucket.pause.assert_called_with(5.0)
+
+    def test_exhausted_quota_pauses_bucket(self, groq_client, mock_httpx, mock_groq_response):
+        """Test a successful response with no remaining requests pauses until reset"""
+        mock_httpx(
+            json_body=mock_groq_response,
+            headers={
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "1m2.5s",
+            },
+        )
+        groq_client._groq_bucket.pause = Mock()
+
+        with patch("app.services.llm_client.settings.GROQ_MAX_PAUSE", 120.0):
+            assert groq_client.generate_completion("Test prompt") == "This is a test response"
+        groq_client._groq_bucket.pause.assert_called_once_with(62.5)
+
+    def test_clients_with_same_key_share_bucket(self):
+        """Test the Groq limit is shared by every client using the same API key"""
+        with (
+            patch("app.services.llm_client.settings.GROQ_RPS", 4.0),
+            patch("app.services.llm_client.settings.GROQ_BURST", 1),
+        ):
+            first = LLMClient(provider="groq", api_key="shared_key")
+            second = LLMClient(provider="groq", api_key="shared_key")
+            other = LLMClient(provider="groq", api_key="other_key")
+
+        assert first._groq_bucket is second._groq_bucket
+        assert other._groq_bucket is not first._groq_bucket
+
+        # The only burst token is spent by the first client, so the second waits
+        assert first._groq_bucket.acquire()
+        start = time.monotonic()
+        assert second._groq_bucket.acquire()
+        assert time.monotonic() - start >= 0.2
+
+    def test_bucket_waits_for_refill(self):
+        """Test acquire blocks once the burst capacity is spent"""
+        bucket = TokenBucket(rate=50.0, capacity=1)
+
+        assert bucket.acquire()
+        start = time.monotonic()
+        assert bucket.acquire()
+        assert time.monotonic() - start >= 0.015
+
+    def test_bucket_pause_blocks_acquire(self):
+        """Test acquire waits out an active pause"""
+        bucket = TokenBucket(rate=1000.0, capacity=10)
+        bucket.pause(0.05)
+
+        start = time.monotonic()
+        assert bucket.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_bucket_acquire_gives_up_past_timeout(self):
+        """Test acquire returns False at once when the pause outlasts the timeout"""
+        bucket = TokenBucket(rate=1000.0, capacity=10)
+        bucket.pause(60.0)
+
+        start = time.monotonic()
+        assert not bucket.acquire(timeout=1.0)
+        assert time.monotonic() - start < 0.1
+
+    def test_server_pause_is_capped(self, groq_client, mock_httpx):
+        """Test a huge Retry-After is clamped to GROQ_MAX_PAUSE"""
+        mock_httpx(status=429, headers={"Retry-After": "3600"})
+        groq_client._groq_bucket.pause = Mock()
+
+        with pytest.raises(LLMClientError):
+            groq_client.generate_completion("Test prompt")
+
+        groq_client._groq_bucket.pause.assert_called_with(settings.GROQ_MAX_PAUSE)
+
+    def test_paused_bucket_falls_through_to_next_provider(
+        self, groq_client, mock_httpx, mock_ollama_response
+    ):
+        """Test a paused Groq bucket fails fast so the next provider answers"""
+        fake = mock_httpx(json_body=mock_ollama_response)
+        groq_client._provider_chain = ["groq", "ollama"]
+        groq_client._groq_bucket.rate = 0.5  # throttling is off by default
+        groq_client._groq_bucket.pause(600.0)
+
+        start = time.monotonic()
+        result = groq_client.generate_completion("Test prompt")
+
+        assert result == "This is a test response from Ollama"
+        assert time.monotonic() - start < 1.0
+        # Only the Ollama request went out; Groq never reached the network
+        assert len(fake.calls) == 1
+        assert "chat/completions" not in fake.calls[0]["url"]
 
 
 # --- Ollama API Tests ---
@@ -187,65 +325,51 @@ class TestGroqAPI:
 class TestOllamaAPI:
     """Test Ollama API interactions"""
 
-    def test_ollama_completion_success(self, ollama_client, mock_ollama_response):
+    def test_ollama_completion_success(self, ollama_client, mock_httpx, mock_ollama_response):
         """Test successful Ollama completion"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_ollama_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            result = ollama_client.generate_completion("Test prompt")
-            assert result == "This is a test response from Ollama"
-
-    def test_ollama_completion_with_system_prompt(self, ollama_client, mock_ollama_response):
+        mock_httpx(json_body=mock_ollama_response)
+        result = ollama_client.generate_completion("Test prompt")
+        assert result == "This is a test response from Ollama"
+
+    def test_ollama_completion_with_system_prompt(
+        self, ollama_client, mock_httpx, mock_ollama_response
+    ):
         """Test Ollama completion combines system and user prompts"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_ollama_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            result = ollama_client.generate_completion(
-                "Test prompt", system_prompt="You are helpful"
-            )
-            assert result == "This is a test response from Ollama"
-
-            # Verify prompts were combined
-            call_args = mock_client.post.call_args
-            payload = call_args.kwargs["json"]
-            assert "You are helpful" in payload["prompt"]
-            assert "Test prompt" in payload["prompt"]
-
-    def test_ollama_connection_error(self, ollama_client):
-        """Test Ollama connection error"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.post.side_effect = httpx.ConnectError("Connection refused")
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client = mock_httpx(json_body=mock_ollama_response)
+
+        result = ollama_client.generate_completion("Test prompt", system_prompt="You are helpful")
+        assert result == "This is a test response from Ollama"
 
-            with pytest.raises(LLMClientError, match="Cannot connect to Ollama"):
-                ollama_client.generate_completion("Test prompt")
+        # Verify prompts were combined
+        payload = mock_client.posted_json()
+        assert "You are helpful" in payload["prompt"]
+        assert "Test prompt" in payload["prompt"]
 
-    def test_ollama_http_error(self, ollama_client):
+    def test_ollama_connection_error(self, ollama_client, mock_httpx):
+        """Test Ollama connection error"""
+        mock_httpx(raise_exc=httpx.ConnectError("Connection refused"))
+        with pytest.raises(LLMClientError, match="Cannot connect to Ollama"):
+            ollama_client._ollama_completion("Test prompt", None, 0.7, 100)
+
+    def test_ollama_http_error(self, ollama_client, mock_httpx):
         """Test Ollama HTTP error handling"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.text = "Model not found"
-            mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-                "Not found", request=Mock(), response=mock_response
-            )
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_httpx(status=404, text="Model not found")
+        with pytest.raises(LLMClientError, match="Ollama API error: 404"):
+            ollama_client._ollama_completion("Test prompt", None, 0.7, 100)
+
+    def test_ollama_json_stream_stops_after_object(self, ollama_client, mock_httpx):
+        """Test JSON mode streams and stops reading once the object closes"""
+        mock_client = mock_httpx()
+        pieces = ['{"themes": ', '["a}b"]', "}", "\n\nHope this helps!", " More text."]
+        mock_client.next_response.lines = [
+            json.dumps({"response": piece, "done": False}) for piece in pieces
+        ]
 
-            with pytest.raises(LLMClientError, match="Ollama API error"):
-                ollama_client.generate_completion("Test prompt")
+        result = ollama_client.generate_json("Generate JSON")
+
+        assert result == {"themes": ["a}b"]}
+        assert mock_client.next_response.lines_read == 3
+        assert mock_client.posted_json()["stream"] is True
 
 
 # --- JSON Generation Tests ---
@@ -254,70 +378,45 @@ class TestOllamaAPI:
 class TestJSONGeneration:
     """Test structured JSON generation"""
 
-    def test_generate_json_success(self, groq_client, mock_groq_json_response):
+    def test_generate_json_success(self, groq_client, mock_httpx, mock_groq_json_response):
         """Test successful JSON generation"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_groq_json_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            result = groq_client.generate_json("Generate JSON")
-            assert isinstance(result, dict)
-            assert "themes" in result
-            assert result["themes"] == ["action", "thriller"]
-
-    def test_generate_json_with_markdown_blocks(self, groq_client):
+        mock_httpx(json_body=mock_groq_json_response)
+        result = groq_client.generate_json("Generate JSON")
+        assert isinstance(result, dict)
+        assert "themes" in result
+        assert result["themes"] == ["action", "thriller"]
+
+    def test_generate_json_with_markdown_blocks(self, groq_client, mock_httpx):
         """Test JSON extraction from markdown code blocks"""
         json_content = {"test": "value"}
         markdown_response = f"```json\n{json.dumps(json_content)}\n```"
-        mock_response_data = {"choices": [{"message": {"content": markdown_response}}]}
-
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_response_data
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_httpx(json_body={"choices": [{"message": {"content": markdown_response}}]})
 
-            result = groq_client.generate_json("Generate JSON")
-            assert result == json_content
+        result = groq_client.generate_json("Generate JSON")
+        assert result == json_content
 
-    def test_generate_json_invalid_json(self, groq_client):
+    def test_generate_json_invalid_json(self, groq_client, mock_httpx):
         """Test JSON parsing error handling"""
-        mock_response_data = {"choices": [{"message": {"content": "This is not valid JSON"}}]}
+        mock_httpx(json_body={"choices": [{"message": {"content": "This is not valid JSON"}}]})
+        with pytest.raises(LLMInvalidResponseError, match="Invalid JSON response"):
+            groq_client.generate_json("Generate JSON")
 
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_response_data
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
+    def test_generate_json_rejects_non_object(self, groq_client, mock_httpx):
+        """Test valid JSON that is not an object is rejected"""
+        mock_httpx(json_body={"choices": [{"message": {"content": '["dark", "serious"]'}}]})
+        with pytest.raises(LLMInvalidResponseError, match="got list"):
+            groq_client.generate_json("Generate JSON")
 
-            with pytest.raises(LLMInvalidResponseError, match="Invalid JSON response"):
-                groq_client.generate_json("Generate JSON")
-
-    def test_generate_json_adds_instruction(self, groq_client, mock_groq_json_response):
+    def test_generate_json_adds_instruction(self, groq_client, mock_httpx, mock_groq_json_response):
         """Test that JSON instruction is added to prompt"""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = MagicMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_groq_json_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client = mock_httpx(json_body=mock_groq_json_response)
 
-            groq_client.generate_json("Simple prompt")
+        groq_client.generate_json("Simple prompt")
 
-            # Verify "json" instruction was added
-            call_args = mock_client.post.call_args
-            payload = call_args.kwargs["json"]
-            user_message = payload["messages"][-1]["content"]
-            assert "json" in user_message.lower()
+        # Verify "json" instruction was added
+        payload = mock_client.posted_json()
+        user_message = payload["messages"][-1]["content"]
+        assert "json" in user_message.lower()
 
 
 # --- Context Manager Tests ---
@@ -330,10 +429,156 @@ class TestContextManager:
         """Test Groq client as context manager"""
         with LLMClient(provider="groq", api_key="test_key") as client:
             assert client.provider == "groq"
-            assert client.api_key == "test_key"
+            assert client._groq_auth_headers == {"Authorization": "Bearer test_key"}
 
     def test_context_manager_ollama(self):
         """Test Ollama client as context manager"""
         with LLMClient(provider="ollama") as client:
             assert client.provider == "ollama"
-            assert client.api_key is None
+            assert client._provider_chain == ["ollama"]
+
+    def test_http_pool_shared_across_clients(self, mock_httpx, mock_ollama_response):
+        """Test one pooled HTTP client serves every LLMClient and outlives them"""
+        mock_client = mock_httpx(json_body=mock_ollama_response)
+
+        with LLMClient(provider="ollama") as client:
+            client.generate_completion("First prompt")
+        with LLMClient(provider="ollama", timeout=5) as client:
+            client.generate_completion("Second prompt")
+
+        mock_httpx.client_class.assert_called_once()
+        assert [call["timeout"] for call in mock_client.calls] == [30, 5]
+        assert mock_client.close_count == 0
+
+        close_http_pool()
+        assert mock_client.close_count == 1
+
+    def test_http_client_created_once_under_concurrent_first_use(self, mock_httpx):
+        """Test threads racing on first use share a single pooled client"""
+        fake_client = mock_httpx()
+
+        def slow_client(**_kwargs):
+            time.sleep(0.01)  # Widen the window between the check and the assignment
+            return fake_client
+
+        mock_httpx.client_class.side_effect = slow_client
+        client = LLMClient(provider="ollama")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: client._http, range(8)))
+
+        mock_httpx.client_class.assert_called_once()
+        assert all(c is fake_client for c in clients)
+
+
+# --- Batch Generation Tests ---
+
+
+class TestJSONBatch:
+    """Test concurrent JSON generation"""
+
+    def test_generate_json_batch_preserves_order_and_errors(self, groq_client):
+        """Test results line up with prompts and failures are returned, not raised"""
+
+        def fake_generate_json(prompt, *_args):
+            if prompt == "bad":
+                msg = "Invalid JSON response"
+                raise LLMInvalidResponseError(msg)
+            return {"prompt": prompt}
+
+        with patch.object(groq_client, "generate_json", side_effect=fake_generate_json):
+            results = groq_client.generate_json_batch(["a", "bad", "c"], concurrency=2)
+
+        assert results[0] == {"prompt": "a"}
+        assert isinstance(results[1], LLMInvalidResponseError)
+        assert results[2] == {"prompt": "c"}
+
+
+class TestGroqBatchAPI:
+    """Test offline submission through the Groq batch API"""
+
+    def test_submit_poll_and_fetch_results(self, groq_client, mock_httpx, tmp_path):
+        """Test the upload -> create -> poll -> download round trip"""
+        output_line = {
+            "custom_id": "0",
+            "response": {"body": {"choices": [{"message": {"content": '{"tones": []}'}}]}},
+        }
+        error_line = {"custom_id": "1", "response": None, "error": {"message": "bad"}}
+        client = mock_httpx()
+        client.queued = [
+            FakeResponse(_json={"id": "file_in"}),
+            FakeResponse(_json={"id": "batch_1", "status": "validating"}),
+            FakeResponse(_json={"id": "batch_1", "status": "in_progress"}),
+            FakeResponse(
+                _json={"id": "batch_1", "status": "completed", "output_file_id": "file_out"}
+            ),
+            FakeResponse(text=f"{json.dumps(output_line)}\n{json.dumps(error_line)}\n"),
+        ]
+
+        requests = [
+            groq_client.batch_json_request("0", "action movies"),
+            groq_client.batch_json_request("1", "comedy"),
+        ]
+        batch_id = groq_client.submit_batch(requests, tmp_path / "batch.jsonl")
+        batch = groq_client.poll_batch(batch_id, poll_interval=0)
+        results = groq_client.batch_results(batch)
+
+        assert batch_id == "batch_1"
+        assert results == {"0": '{"tones": []}'}
+        lines = (tmp_path / "batch.jsonl").read_text().splitlines()
+        assert json.loads(lines[0])["body"]["response_format"] == {"type": "json_object"}
+        assert client.calls[0]["data"] == {"purpose": "batch"}
+        assert client.posted_json(1)["input_file_id"] == "file_in"
+        assert client.calls[-1]["url"].endswith("/files/file_out/content")
+
+    def test_poll_failed_batch_raises(self, groq_client, mock_httpx):
+        """Test a failed batch surfaces as LLMClientError"""
+        mock_httpx(json_body={"id": "batch_1", "status": "expired"})
+
+        with pytest.raises(LLMClientError, match="expired"):
+            groq_client.poll_batch("batch_1", poll_interval=0)
+
+
+# --- Completion Cache Tests ---
+
+
+class TestCompletionCache:
+    """Test caching of identical completions"""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        """Start and end each test with an empty shared cache"""
+        _completion_cache.clear()
+        yield
+        _completion_cache.clear()
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first"""
+        cache = CompletionCache(maxsize=2)
+        cache.store(b"a", "A")
+        cache.store(b"b", "B")
+        assert cache.get(b"a") == "A"  # "b" is now least recently used
+        cache.store(b"c", "C")
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == "A"
+        assert len(cache) == 2
+
+    def test_cached_completion_skips_request(self, ollama_client, mock_httpx, mock_ollama_response):
+        """Test identical cached calls hit the API once, uncached calls always hit it"""
+        mock_client = mock_httpx(json_body=mock_ollama_response)
+
+        first = ollama_client.generate_completion("Same prompt", use_cache=True)
+        second = ollama_client.generate_completion("Same prompt", use_cache=True)
+        assert first == second == "This is a test response from Ollama"
+        assert len(mock_client.calls) == 1
+
+        ollama_client.generate_completion("Same prompt")
+        ollama_client.generate_completion("Same prompt", temperature=0.1, use_cache=True)
+        assert len(mock_client.calls) == 3
+
+    def test_unparseable_json_not_cached(self, ollama_client, mock_httpx):
+        """Test a cached completion that fails JSON parsing is discarded"""
+        mock_httpx(json_body={"response": "not json"})
+        with pytest.raises(LLMInvalidResponseError):
+            ollama_client.generate_json("Give me JSON", use_cache=True)
+        assert len(_completion_cache) == 0
@@ -12,31 +12,25 @@ from app.utils.math_utils import clamp, log_normalize, normalize_to_range, sigmo
 class TestClamp:
     """Tests for clamp function."""
 
-    def test_clamp_within_range(self):
-        """Test value within range is unchanged."""
-        assert clamp(0.5, 0.0, 1.0) == 0.5
-        assert clamp(5.0, 0.0, 10.0) == 5.0
-
-    def test_clamp_above_max(self):
-        """Test value above max is clamped to max."""
-        assert clamp(1.5, 0.0, 1.0) == 1.0
-        assert clamp(15.0, 0.0, 10.0) == 10.0
-
-    def test_clamp_below_min(self):
-        """Test value below min is clamped to min."""
-        assert clamp(-0.5, 0.0, 1.0) == 0.0
-        assert clamp(-5.0, 0.0, 10.0) == 0.0
-
-    def test_clamp_at_boundaries(self):
-        """Test values exactly at boundaries."""
-        assert clamp(0.0, 0.0, 1.0) == 0.0
-        assert clamp(1.0, 0.0, 1.0) == 1.0
-
-    def test_clamp_custom_range(self):
-        """Test clamping with custom range."""
-        assert clamp(5.0, 10.0, 20.0) == 10.0
-        assert clamp(15.0, 10.0, 20.0) == 15.0
-        assert clamp(25.0, 10.0, 20.0) == 20.0
+    @pytest.mark.parametrize(
+        ("value", "min_value", "max_value", "expected"),
+        [
+            pytest.param(0.5, 0.0, 1.0, 0.5, id="within_unit"),
+            pytest.param(5.0, 0.0, 10.0, 5.0, id="within_custom"),
+            pytest.param(1.5, 0.0, 1.0, 1.0, id="above_max_unit"),
+            pytest.param(15.0, 0.0, 10.0, 10.0, id="above_max_custom"),
+            pytest.param(-0.5, 0.0, 1.0, 0.0, id="below_min_unit"),
+            pytest.param(-5.0, 0.0, 10.0, 0.0, id="below_min_custom"),
+            pytest.param(0.0, 0.0, 1.0, 0.0, id="at_min"),
+            pytest.param(1.0, 0.0, 1.0, 1.0, id="at_max"),
+            pytest.param(5.0, 10.0, 20.0, 10.0, id="offset_range_below"),
+            pytest.param(15.0, 10.0, 20.0, 15.0, id="offset_range_within"),
+            pytest.param(25.0, 10.0, 20.0, 20.0, id="offset_range_above"),
+        ],
+    )
+    def test_clamp(self, value, min_value, max_value, expected):
+        """Test values are clamped to [min_value, max_value]."""
+        assert clamp(value, min_value, max_value) == expected
 
 
 class TestSigmoid:
@@ -46,15 +40,18 @@ class TestSigmoid:
         """Test sigmoid(0) = 0.5."""
         assert sigmoid(0.0) == 0.5
 
-    def test_sigmoid_positive(self):
-        """Test sigmoid of positive values."""
-        assert sigmoid(1.0) > 0.5
-        assert sigmoid(10.0) > 0.9
-
-    def test_sigmoid_negative(self):
-        """Test sigmoid of negative values."""
-        assert sigmoid(-1.0) < 0.5
-        assert sigmoid(-10.0) < 0.1
+    @pytest.mark.parametrize(
+        ("x", "lower", "upper"),
+        [
+            pytest.param(1.0, 0.5, 1.0, id="positive"),
+            pytest.param(10.0, 0.9, 1.0, id="large_positive"),
+            pytest.param(-1.0, 0.0, 0.5, id="negative"),
+            pytest.param(-10.0, 0.0, 0.1, id="large_negative"),
+        ],
+    )
+    def test_sigmoid_bounds(self, x, lower, upper):
+        """Test sigmoid of moderate values falls strictly inside the expected band."""
+        assert lower < sigmoid(x) < upper
 
     def test_sigmoid_large_positive(self):
         """Test sigmoid handles large positive values."""
@@ -66,80 +63,63 @@ class TestSigmoid:
         result = sigmoid(-100.0)
         assert result < 1e-40  # Should be very close to 0
 
-    def test_sigmoid_range(self):
-        """Test sigmoid output is in (0, 1)."""
-        for x in [-100, -10, -1, 0, 1, 10, 100]:
-            result = sigmoid(x)
-            assert 0.0 <= result <= 1.0
+    @pytest.mark.parametrize("x", [-100, -10, -1, 0, 1, 10, 100])
+    def test_sigmoid_range(self, x):
+        """Test sigmoid output is in [0, 1]."""
+        assert 0.0 <= sigmoid(x) <= 1.0
 
 
 class TestNormalizeToRange:
     """Tests for normalize_to_range function."""
 
-    def test_normalize_basic(self):
-        """Test basic normalization."""
-        # 5 is 50% of [0, 10], so should map to 50% of [0, 1] = 0.5
-        assert normalize_to_range(5, 0, 10, 0, 1) == 0.5
-
-    def test_normalize_to_different_range(self):
-        """Test normalization to different output range."""
-        # 50 is 50% of [0, 100], so should map to 50% of [0, 10] = 5.0
-        assert normalize_to_range(50, 0, 100, 0, 10) == 5.0
-
-    def test_normalize_at_boundaries(self):
-        """Test normalization at input boundaries."""
-        assert normalize_to_range(0, 0, 10, 0, 1) == 0.0
-        assert normalize_to_range(10, 0, 10, 0, 1) == 1.0
-
-    def test_normalize_negative_range(self):
-        """Test normalization with negative ranges."""
-        # 0 is 50% of [-10, 10], so should map to 50% of [0, 1] = 0.5
-        assert normalize_to_range(0, -10, 10, 0, 1) == 0.5
-
-    def test_normalize_zero_range(self):
-        """Test normalization when old_min == old_max."""
-        # Should return new_min when range is zero
-        result = normalize_to_range(5, 10, 10, 0, 1)
-        assert result == 0.0
-
-    def test_normalize_clamps_output(self):
-        """Test that output is clamped to target range."""
-        # Input outside range should be clamped
-        result = normalize_to_range(15, 0, 10, 0, 1)
-        assert result == 1.0
-
-        result = normalize_to_range(-5, 0, 10, 0, 1)
-        assert result == 0.0
+    @pytest.mark.parametrize(
+        ("value", "old_min", "old_max", "new_min", "new_max", "expected"),
+        [
+            # 5 is 50% of [0, 10], so should map to 50% of [0, 1] = 0.5
+            pytest.param(5, 0, 10, 0, 1, 0.5, id="basic"),
+            # 50 is 50% of [0, 100], so should map to 50% of [0, 10] = 5.0
+            pytest.param(50, 0, 100, 0, 10, 5.0, id="different_range"),
+            pytest.param(0, 0, 10, 0, 1, 0.0, id="at_min"),
+            pytest.param(10, 0, 10, 0, 1, 1.0, id="at_max"),
+            # 0 is 50% of [-10, 10], so should map to 50% of [0, 1] = 0.5
+            pytest.param(0, -10, 10, 0, 1, 0.5, id="negative_range"),
+            # Zero-width input range returns new_min
+            pytest.param(5, 10, 10, 0, 1, 0.0, id="zero_range"),
+            # Inputs outside the range are clamped
+            pytest.param(15, 0, 10, 0, 1, 1.0, id="clamps_above"),
+            pytest.param(-5, 0, 10, 0, 1, 0.0, id="clamps_below"),
+        ],
+    )
+    def test_normalize(self, value, old_min, old_max, new_min, new_max, expected):
+        """Test linear rescaling from [old_min, old_max] to [new_min, new_max]."""
+        assert normalize_to_range(value, old_min, old_max, new_min, new_max) == expected
 
 
 class TestLogNormalize:
     """Tests for log_normalize function."""
 
-    def test_log_normalize_zero(self):
-        """Test log normalization of zero."""
-        assert log_normalize(0.0) == 0.0
-
-    def test_log_normalize_negative(self):
-        """Test log normalization of negative values."""
-        assert log_normalize(-10.0) == 0.0
-
-    def test_log_normalize_one(self):
-        """Test log normalization of 1.0."""
-        # log(1 + 1) / 7.0 = log(2) / 7.0 ≈ 0.099
-        result = log_normalize(1.0)
-        assert 0.0 < result < 0.2
-
-    def test_log_normalize_large_value(self):
-        """Test log normalization of large values."""
-        # log(1001) / 7.0 ≈ 6.9 / 7.0 ≈ 0.98
-        result = log_normalize(1000.0)
-        assert 0.9 < result <= 1.0
-
-    def test_log_normalize_output_range(self):
+    @pytest.mark.parametrize("value", [0.0, -10.0], ids=["zero", "negative"])
+    def test_log_normalize_non_positive(self, value):
+        """Test log normalization of zero and negative values."""
+        assert log_normalize(value) == 0.0
+
+    @pytest.mark.parametrize(
+        ("value", "lower", "upper"),
+        [
+            # log(1 + 1) / 7.0 = log(2) / 7.0 ≈ 0.099
+            pytest.param(1.0, 0.0, 0.2, id="one"),
+            # log(1001) / 7.0 ≈ 6.9 / 7.0 ≈ 0.98
+            pytest.param(1000.0, 0.9, 1.0, id="large_value"),
+        ],
+    )
+    def test_log_normalize_value(self, value, lower, upper):
+        """Test log normalization of positive values."""
+        assert lower < log_normalize(value) < upper
+
+    @pytest.mark.parametrize("value", [0, 1, 10, 100, 1000, 10000])
+    def test_log_normalize_output_range(self, value):
         """Test output is in [0, 1]."""
-        for value in [0, 1, 10, 100, 1000, 10000]:
-            result = log_normalize(value)
-            assert 0.0 <= result <= 1.0
+        assert 0.0 <= log_normalize(value) <= 1.0
 
     def test_log_normalize_custom_base(self):
         """Test log normalization with custom base."""
@@ -11,38 +11,18 @@ This module tests the Movie, Genre, Keyword, and Cast models including:
 from datetime import datetime
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload, selectinload
 
-from app.core.database import Base
-from app.models.media import Cast, Genre, Keyword, Movie
+from app.models.media import Cast, Genre, Keyword, Media, MediaAsset, MediaEmbedding, Movie
+from tests.helpers import count_queries
 
 
 # =============================================================================
 # Test Fixtures
 # =============================================================================
 
-
-@pytest.fixture(scope="function")
-def db_session():
-    """
-    Create an in-memory SQLite database for testing.
-
-    This fixture creates a fresh database for each test and tears it down after.
-    """
-    # Create in-memory database
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-
-    # Create session
-    TestingSessionLocal = sessionmaker(bind=engine)
-    session = TestingSessionLocal()
-
-    yield session
-
-    # Cleanup
-    session.close()
-    Base.metadata.drop_all(engine)
+# ``engine`` and ``db_session`` come from tests/conftest.py
 
 
 @pytest.fixture()
@@ -58,7 +38,6 @@ def sample_genre():
 def sample_keyword():
     """Create a sample keyword for testing."""
     return Keyword(
-        tmdb_id=1234,
         name="time travel",
     )
 
@@ -83,6 +62,27 @@ def sample_movie(db_session, sample_genre, sample_keyword, sample_cast):
     db_session.add(sample_cast)
     db_session.commit()
 
+    # Genres, keywords, cast, assets and the embedding live on the Media anchor
+    media = Media(
+        content_type="Movie",
+        genres=[sample_genre],
+        keywords=[sample_keyword],
+        cast_members=[sample_cast],
+        assets=[
+            MediaAsset(
+                asset_type="poster",
+                source="tmdb",
+                url="https://image.tmdb.org/t/p/w500/pB8BM7pdSp6B6Ih7QZ4DrQ3PmJK.jpg",
+                is_primary=True,
+            ),
+            MediaAsset(
+                asset_type="backdrop",
+                source="tmdb",
+                url="https://image.tmdb.org/t/p/original/fCayJrkfRaCRCTh8GqN30f8oyQF.jpg",
+            ),
+        ],
+        embedding=MediaEmbedding(embedding=[0.1] * 768),
+    )
     movie = Movie(
         tmdb_id=550,
         title="Fight Club",
@@ -96,26 +96,33 @@ def sample_movie(db_session, sample_genre, sample_keyword, sample_cast):
         vote_average=8.4,
         vote_count=25000,
         original_language="en",
-        poster_path="/pB8BM7pdSp6B6Ih7QZ4DrQ3PmJK.jpg",
-        backdrop_path="/fCayJrkfRaCRCTh8GqN30f8oyQF.jpg",
         status="Released",
         budget=63000000,
         revenue=100853753,
         imdb_id="tt0137523",
-        embedding_vector=[0.1, 0.2, 0.3],  # Mock embedding
-        embedding_model="all-mpnet-base-v2",
-        embedding_dimension=3,
         streaming_providers={"Netflix": ["US"], "Prime": ["GB"]},
+        media=media,
     )
 
-    movie.genres = [sample_genre]
-    movie.keywords = [sample_keyword]
-    movie.cast_members = [sample_cast]
-
     db_session.add(movie)
     db_session.commit()
 
-    return movie
+    # Reload with every relationship the tests walk loaded up front. raiseload("*")
+    # turns any other lazy load into an error, so an accidental N+1 fails loudly;
+    # add a selectinload here rather than dropping the raiseload.
+    return db_session.execute(
+        select(Movie)
+        .options(
+            selectinload(Movie.media).selectinload(Media.genres),
+            selectinload(Movie.media).selectinload(Media.keywords),
+            selectinload(Movie.media).selectinload(Media.cast_members),
+            selectinload(Movie.media).selectinload(Media.assets),
+            selectinload(Movie.media).selectinload(Media.embedding),
+            raiseload("*"),
+        )
+        .filter_by(id=movie.id)
+        .execution_options(populate_existing=True)
+    ).scalar_one()
 
 
 # =============================================================================
@@ -143,39 +150,40 @@ class TestMovie:
         assert movie.created_at is not None
         assert movie.updated_at is not None
 
-    def test_movie_with_relationships(self, sample_movie):
+    def test_movie_with_relationships(self, db_session, sample_movie):
         """Test movie with genres, keywords, and cast."""
-        assert len(sample_movie.genres) == 1
-        assert sample_movie.genres[0].name == "Action"
+        # sample_movie eager-loads its relationships; walking them must not query
+        with count_queries(db_session) as queries:
+            assert len(sample_movie.media.genres) == 1
+            assert sample_movie.media.genres[0].name == "Action"
 
-        assert len(sample_movie.keywords) == 1
-        assert sample_movie.keywords[0].name == "time travel"
+            assert len(sample_movie.media.keywords) == 1
+            assert sample_movie.media.keywords[0].name == "time travel"
 
-        assert len(sample_movie.cast_members) == 1
-        assert sample_movie.cast_members[0].name == "Tom Hanks"
+            assert len(sample_movie.media.cast_members) == 1
+            assert sample_movie.media.cast_members[0].name == "Tom Hanks"
+
+        assert queries == []
 
     def test_movie_computed_properties(self, sample_movie):
         """Test computed properties on Movie model."""
         # Test year property
         assert sample_movie.year == 1999
 
-        # Test poster_url property
+        # Test poster_url property (primary poster asset)
         assert (
             sample_movie.poster_url
             == "https://image.tmdb.org/t/p/w500/pB8BM7pdSp6B6Ih7QZ4DrQ3PmJK.jpg"
         )
 
-        # Test backdrop_url property
+        # Test backdrop_url property (first backdrop asset)
         assert (
             sample_movie.backdrop_url
             == "https://image.tmdb.org/t/p/original/fCayJrkfRaCRCTh8GqN30f8oyQF.jpg"
         )
 
-        # Test runtime_formatted property
-        assert sample_movie.runtime_formatted == "2h 19m"
-
-        # Test has_embedding property
-        assert sample_movie.has_embedding is True
+        # The embedding row hangs off the Media anchor
+        assert sample_movie.media.embedding is not None
 
     def test_movie_without_embedding(self, db_session):
         """Test has_embedding property when no embedding exists."""
@@ -326,14 +334,20 @@ class TestRelationships:
         """Test many-to-many relationship between movies and genres."""
         # Add another genre
         genre2 = Genre(tmdb_id=99, name="Thriller")
-        sample_movie.genres.append(genre2)
+        sample_movie.media.genres.append(genre2)
         db_session.commit()
 
-        assert len(sample_movie.genres) == 2
-        assert genre2 in sample_movie.genres
+        assert len(sample_movie.media.genres) == 2
+        assert genre2 in sample_movie.media.genres
 
-        # Test reverse relationship
-        assert sample_movie in sample_genre.movies
+        # Test reverse relationship (reloaded: sample_movie's raiseload covers its genres)
+        genre = db_session.execute(
+            select(Genre)
+            .options(selectinload(Genre.media_items))
+            .filter_by(id=sample_genre.id)
+            .execution_options(populate_existing=True)
+        ).scalar_one()
+        assert sample_movie.media in genre.media_items
 
     def test_cascade_delete_movie(self, db_session, sample_movie):
         """Test that deleting a movie removes association entries."""
@@ -344,9 +358,9 @@ class TestRelationships:
         db_session.commit()
 
         # Check that movie is gone
-        movie = db_session.query(Movie).filter_by(id=movie_id).first()
+        movie = db_session.execute(select(Movie).filter_by(id=movie_id)).scalar_one_or_none()
         assert movie is None
 
         # Genres, keywords, and cast should still exist (many-to-many)
-        genres = db_session.query(Genre).all()
+        genres = db_session.execute(select(Genre)).scalars().all()
         assert len(genres) > 0
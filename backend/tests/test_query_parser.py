@@ -8,10 +8,13 @@ Tests cover:
 - Edge cases and error handling
 """
 
-from unittest.mock import patch
+import json
+import threading
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.core.config import settings
 from app.schemas.query import (
     EmotionType,
     MediaType,
@@ -21,27 +24,66 @@ from app.schemas.query import (
     QueryParserConfig,
     ToneType,
 )
-from app.services.llm_client import LLMClientError
-from app.services.query_parser import QueryParser
+from app.services.exceptions import LLMInvalidResponseError
+from app.services.llm_client import LLMClient, LLMClientError
+from app.services.query_parser import QueryParser, _detect_rules_cached
 
 
 # --- Fixtures ---
 
 
-@pytest.fixture()
-def query_parser():
-    """Create query parser with rule-based fallback enabled"""
-    config = QueryParserConfig(llm_provider="groq", enable_fallback=True)
-    with patch("app.services.llm_client.settings") as mock_settings:
-        mock_settings.LLM_PROVIDER = "groq"
-        mock_settings.GROQ_API_KEY = "test_key"
-        mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
-        mock_settings.GROQ_MAX_TOKENS = 1024
-        mock_settings.GROQ_TEMPERATURE = 0.7
-        return QueryParser(config=config)
+@pytest.fixture(scope="module", autouse=True)
+def groq_settings():
+    """Configure Groq (and only Groq) credentials for every LLM client built in this module"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "LLM_PROVIDER", "groq")
+        mp.setattr(settings, "GEMINI_API_KEY", "")
+        mp.setattr(settings, "GROQ_API_KEY", "test_key")
+        mp.setattr(settings, "GROQ_MODEL", "llama-3.1-70b-versatile")
+        yield settings
+
+
+@pytest.fixture(scope="module")
+def llm_client(groq_settings):
+    """Groq client shared by the module's parsers; tests only patch it temporarily"""
+    return LLMClient(provider="groq", model=groq_settings.GROQ_MODEL)
 
 
 @pytest.fixture()
+def query_parser(llm_client):
+    """Create query parser with rule-based fallback enabled (LLM never skipped)"""
+    # Fresh per test: tests change the config and fill the parse cache
+    config = QueryParserConfig(llm_provider="groq", enable_fallback=True, fast_path_trivial=False)
+    return QueryParser(config=config, llm_client=llm_client)
+
+
+def _stub(response):
+    """Plain generate_json replacement returning a canned response"""
+    return lambda *_args, **_kwargs: response
+
+
+def _raising(error):
+    """Plain generate_json replacement raising an error"""
+
+    def generate_json(*_args, **_kwargs):
+        raise error
+
+    return generate_json
+
+
+_llm_off = _raising(LLMClientError("LLM disabled in tests"))
+
+
+@pytest.fixture(autouse=True)
+def llm_off(llm_client, monkeypatch):
+    """Fail every LLM call by default, so parse() uses the rule-based fallback
+
+    LLM-path tests patch generate_json with the response they need.
+    """
+    monkeypatch.setattr(llm_client, "generate_json", _llm_off)
+
+
+@pytest.fixture(scope="module")
 def mock_llm_response_interstellar():
     """Mock LLM response for 'dark sci-fi movies like Interstellar'"""
     return {
@@ -71,7 +113,7 @@ def mock_llm_response_interstellar():
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def mock_llm_response_friends():
     """Mock LLM response for 'lighthearted sitcoms like Friends'"""
     return {
@@ -164,142 +206,186 @@ class TestRuleBasedParser:
 
     def test_parse_simple_query(self, query_parser):
         """Test parsing simple query with rule-based parser"""
-        # Mock LLM to fail so it falls back to rules
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            parsed = query_parser.parse("dark thriller movies")
+        parsed = query_parser.parse("dark thriller movies")
 
-            assert parsed.parsing_method == "rule-based"
-            assert parsed.confidence_score == 0.5
-            assert "dark" in parsed.intent.keywords or ToneType.DARK in parsed.intent.tones
-
-    def test_parse_reference_title(self, query_parser):
-        """Test extracting reference titles with 'like' pattern"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Single reference title
-            parsed = query_parser.parse("Movies like Interstellar with space themes")
-            assert parsed.parsing_method == "rule-based"
-            assert "Interstellar" in parsed.intent.reference_titles
-            assert parsed.intent.is_comparison_query is True
+        assert parsed.parsing_method == "rule-based"
+        assert parsed.confidence_score == 0.5
+        assert "dark" in parsed.intent.keywords or ToneType.DARK in parsed.intent.tones
 
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("Movies like Interstellar with space themes", ["Interstellar"]),
             # Multiple titles with "and"
-            parsed = query_parser.parse("movies like Star Wars and Interstellar")
-            assert "Star Wars" in parsed.intent.reference_titles
-            assert "Interstellar" in parsed.intent.reference_titles
-            assert len(parsed.intent.reference_titles) >= 2
-
+            ("movies like Star Wars and Interstellar", ["Star Wars", "Interstellar"]),
             # Multiple titles with comma
-            parsed = query_parser.parse("shows similar to Friends, The Office")
-            assert any("Friends" in title for title in parsed.intent.reference_titles)
-            assert any("Office" in title for title in parsed.intent.reference_titles)
-
+            ("shows similar to Friends, The Office", ["Friends", "The Office"]),
             # Multiple titles with "and" and comma
-            parsed = query_parser.parse("movies like Inception, Interstellar and The Matrix")
-            assert any("Inception" in title for title in parsed.intent.reference_titles)
-            assert any("Interstellar" in title for title in parsed.intent.reference_titles)
-            assert any("Matrix" in title for title in parsed.intent.reference_titles)
+            (
+                "movies like Inception, Interstellar and The Matrix",
+                ["Inception", "Interstellar", "The Matrix"],
+            ),
+        ],
+    )
+    def test_parse_reference_title(self, query_parser, query, expected):
+        """Test extracting reference titles with 'like' pattern"""
+        parsed = query_parser.parse(query)
+        assert parsed.parsing_method == "rule-based"
+        assert parsed.intent.reference_titles == expected
+        assert parsed.intent.is_comparison_query is True
 
-    def test_parse_tones(self, query_parser):
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("dark movies", ToneType.DARK),
+            ("lighthearted comedies", ToneType.LIGHT),
+            ("intense thriller", ToneType.INTENSE),
+        ],
+    )
+    def test_parse_tones(self, query_parser, query, expected):
         """Test detecting tones from query"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Dark tone
-            parsed = query_parser.parse("dark movies")
-            assert ToneType.DARK in parsed.intent.tones
-
-            # Light tone
-            parsed = query_parser.parse("lighthearted comedies")
-            assert ToneType.LIGHT in parsed.intent.tones
+        assert expected in query_parser.parse(query).intent.tones
 
-            # Intense tone
-            parsed = query_parser.parse("intense thriller")
-            assert ToneType.INTENSE in parsed.intent.tones
-
-    def test_parse_emotions(self, query_parser):
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("scary horror movies", EmotionType.FEAR),
+            ("romantic movies", EmotionType.ROMANCE),
+        ],
+    )
+    def test_parse_emotions(self, query_parser, query, expected):
         """Test detecting emotions from query"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Horror/Fear
-            parsed = query_parser.parse("scary horror movies")
-            assert EmotionType.FEAR in parsed.intent.emotions
+        assert expected in query_parser.parse(query).intent.emotions
 
-            # Romance
-            parsed = query_parser.parse("romantic movies")
-            assert EmotionType.ROMANCE in parsed.intent.emotions
+    def test_enum_values_are_triggers(self, query_parser):
+        """Test every word-like ToneType/EmotionType value is detected without a word list"""
+        parsed = query_parser.parse("relaxing inspirational films full of awe and hope")
+        assert parsed.intent.tones == [ToneType.RELAXING, ToneType.INSPIRATIONAL]
+        assert parsed.intent.emotions == [EmotionType.AWE, EmotionType.HOPE]
 
-    def test_parse_media_type(self, query_parser):
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("action movies", MediaType.MOVIE),
+            ("comedy tv shows", MediaType.TV_SHOW),
+            # No media word
+            ("action content", MediaType.BOTH),
+            # Mixed
+            ("movies or series about heists", MediaType.BOTH),
+        ],
+    )
+    def test_parse_media_type(self, query_parser, query, expected):
         """Test detecting media type (movie vs TV show)"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Movies only
-            parsed = query_parser.parse("action movies")
-            assert parsed.constraints.media_type == MediaType.MOVIE
-
-            # TV shows only
-            parsed = query_parser.parse("comedy tv shows")
-            assert parsed.constraints.media_type == MediaType.TV_SHOW
-
-            # Both
-            parsed = query_parser.parse("action content")
-            assert parsed.constraints.media_type == MediaType.BOTH
+        assert query_parser.parse(query).constraints.media_type == expected
 
     def test_parse_genres(self, query_parser):
         """Test detecting genres from query"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            parsed = query_parser.parse("action sci-fi thriller")
-            assert (
-                "Action" in parsed.constraints.genres
-                or "Science Fiction" in parsed.constraints.genres
-            )
+        parsed = query_parser.parse("action sci-fi thriller")
+        assert (
+            "Action" in parsed.constraints.genres
+            or "Science Fiction" in parsed.constraints.genres
+        )
+
+    def test_keywords_match_whole_words_and_plurals(self, query_parser):
+        """Test that trigger words match whole terms, plurals and two-word phrases"""
+        parsed = query_parser.parse("science fiction thrillers")
+        assert parsed.constraints.genres == ["Thriller", "Science Fiction"]
+        assert parsed.intent.tones == [ToneType.SUSPENSEFUL]
+
+        # "sad" must not fire inside "saddle"
+        parsed = query_parser.parse("saddle up westerns")
+        assert parsed.intent.emotions == []
 
     def test_parse_year_constraints(self, query_parser):
         """Test detecting year constraints"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Year min (from/since)
-            parsed = query_parser.parse("movies from 2020")
-            assert parsed.constraints.year_min == 2020
+        # Year min (from/since)
+        parsed = query_parser.parse("movies from 2020")
+        assert parsed.constraints.year_min == 2020
 
-            # Year range
-            parsed = query_parser.parse("movies from 2015-2020")
-            assert parsed.constraints.year_min == 2015
-            assert parsed.constraints.year_max == 2020
+        # Year range
+        parsed = query_parser.parse("movies from 2015-2020")
+        assert parsed.constraints.year_min == 2015
+        assert parsed.constraints.year_max == 2020
 
-    def test_parse_undesired_elements(self, query_parser):
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("films since 1999.", (1999, None)),
+            ("thrillers 2015 - 2020", (2015, 2020)),
+            ("from 2010 but ideally 2015-2018", (2015, 2018)),
+            ("movies from 20201", (None, None)),
+            ("top 2020 movies", (None, None)),
+        ],
+    )
+    def test_parse_year_edge_cases(self, query_parser, query, expected):
+        """Test year scanning handles punctuation, spaced ranges and non-years"""
+        constraints = query_parser.parse(query).constraints
+        assert (constraints.year_min, constraints.year_max) == expected
+
+    def test_rule_based_result_matches_validated_model(self, query_parser):
+        """Test the unvalidated rule-based result equals its validated round trip"""
+        parsed = query_parser.parse("dark scary movies from 2020-2015 like Interstellar")
+        # Reversed range is ordered, pre-1900 years dropped instead of failing validation
+        assert (parsed.constraints.year_min, parsed.constraints.year_max) == (2015, 2020)
+        assert query_parser.parse("movies from 1200").constraints.year_min is None
+
+        assert ParsedQuery.model_validate(parsed.model_dump()).model_dump() == parsed.model_dump()
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("action movies without romance", ["romance"]),
+            ("sci-fi like Interstellar with less romance", ["romance"]),
+            ("thriller with no violence", ["violence"]),
+            ("horror movies avoid jump scares", ["jump scares"]),
+            # "less X" standalone
+            ("comedy less slapstick", ["slapstick"]),
+            # Several negations separated by commas and "and"
+            (
+                "thriller without jump scares, no violence and avoid gore",
+                ["jump scares", "violence", "gore"],
+            ),
+            # Plain "with X" is a wish, not a negation
+            ("movies like Interstellar with space themes", []),
+        ],
+    )
+    def test_parse_undesired_elements(self, query_parser, query, expected):
         """Test detecting undesired elements with various negative patterns"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("LLM failed")
-        ):
-            # Test "without X"
-            parsed = query_parser.parse("action movies without romance")
-            assert "romance" in parsed.intent.undesired_themes
-
-            # Test "with less X"
-            parsed = query_parser.parse("sci-fi like Interstellar with less romance")
-            assert "romance" in parsed.intent.undesired_themes
-
-            # Test "no X"
-            parsed = query_parser.parse("thriller with no violence")
-            assert "violence" in parsed.intent.undesired_themes
-
-            # Test "avoid X"
-            parsed = query_parser.parse("horror movies avoid jump scares")
-            assert any(
-                "jump" in theme or "scares" in theme for theme in parsed.intent.undesired_themes
-            )
+        assert query_parser.parse(query).intent.undesired_themes == expected
+
+    def test_parse_reference_title_punctuation(self, query_parser):
+        """Test titles with apostrophes and trailing punctuation are extracted"""
+        parsed = query_parser.parse("something like Ocean's Eleven?")
+        assert parsed.intent.reference_titles == ["Ocean's Eleven"]
+
+        parsed = query_parser.parse("unlike anything else")
+        assert parsed.intent.reference_titles == []
+
+    def test_rule_detections_memoized_per_query(self, query_parser):
+        """Test repeated rule-based parses reuse detections but not lists"""
+        query = "dark thriller from 1990s like Se7en without gore"
+        first = query_parser._parse_with_rules(query)
+        hits = _detect_rules_cached.cache_info().hits
+        second = query_parser._parse_with_rules(query)
 
-            # Test "less X" standalone
-            parsed = query_parser.parse("comedy less slapstick")
-            assert "slapstick" in parsed.intent.undesired_themes
+        assert _detect_rules_cached.cache_info().hits == hits + 1
+        assert second.intent == first.intent
+        assert second.constraints == first.constraints
+        assert second.intent.keywords is not first.intent.keywords
+        assert second.constraints.genres is not first.constraints.genres
+
+    def test_parse_reference_title_with_title_index(self, llm_client, tmp_path):
+        """Test known titles are matched whole, unknown ones still split out"""
+        titles_file = tmp_path / "titles.txt"
+        titles_file.write_text("Fast and Furious\nThe Matrix\n\n", encoding="utf-8")
+        config = QueryParserConfig(llm_provider="groq", titles_index_path=str(titles_file))
+        # Shares the module LLM client, which llm_off makes fail
+        parser = QueryParser(config=config, llm_client=llm_client)
+
+        assert len(parser._title_index) == 2
+        parsed = parser.parse("movies like fast and furious, the matrix and Obscure Film")
+
+        assert parsed.intent.reference_titles == ["Fast and Furious", "The Matrix", "Obscure Film"]
 
 
 # --- LLM-Based Parser Tests (Mocked) ---
@@ -308,62 +394,78 @@ class TestRuleBasedParser:
 class TestLLMParser:
     """Test LLM-based parser with mocked responses"""
 
-    def test_parse_with_llm_interstellar(self, query_parser, mock_llm_response_interstellar):
+    def test_parse_with_llm_interstellar(
+        self, query_parser, mock_llm_response_interstellar, monkeypatch
+    ):
         """Test LLM parsing for Interstellar query"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
-        ):
-            parsed = query_parser.parse("dark sci-fi movies like Interstellar with less romance")
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+        parsed = query_parser.parse("dark sci-fi movies like Interstellar with less romance")
 
-            assert parsed.parsing_method == "llm"
-            assert parsed.confidence_score > 0.6  # computed from populated fields
-            assert "Interstellar" in parsed.intent.reference_titles
-            assert ToneType.DARK in parsed.intent.tones
-            assert "Science Fiction" in parsed.constraints.genres
-            assert "romance" in parsed.intent.undesired_themes
-            assert parsed.intent.is_comparison_query is True
+        assert parsed.parsing_method == "llm"
+        assert parsed.confidence_score > 0.6  # computed from populated fields
+        assert "Interstellar" in parsed.intent.reference_titles
+        assert ToneType.DARK in parsed.intent.tones
+        assert "Science Fiction" in parsed.constraints.genres
+        assert "romance" in parsed.intent.undesired_themes
+        assert parsed.intent.is_comparison_query is True
 
-    def test_parse_with_llm_friends(self, query_parser, mock_llm_response_friends):
+    def test_parse_with_llm_friends(self, query_parser, mock_llm_response_friends, monkeypatch):
         """Test LLM parsing for Friends query"""
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_friends)
+        )
+        parsed = query_parser.parse("lighthearted sitcoms like Friends")
+
+        assert parsed.parsing_method == "llm"
+        assert "Friends" in parsed.intent.reference_titles
+        assert ToneType.LIGHT in parsed.intent.tones
+        assert EmotionType.JOY in parsed.intent.emotions
+        assert parsed.constraints.media_type == MediaType.TV_SHOW
+        assert parsed.intent.is_mood_query is True
+
+    def test_llm_prompts_splice_query_into_template(
+        self, query_parser, mock_llm_response_interstellar
+    ):
+        """Test the query is spliced into the cached user template, system prompt reused"""
         with patch.object(
-            query_parser.llm_client, "generate_json", return_value=mock_llm_response_friends
-        ):
-            parsed = query_parser.parse("lighthearted sitcoms like Friends")
+            query_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            query_parser.parse("space movies")
+            query_parser.parse("heist movies")
 
-            assert parsed.parsing_method == "llm"
-            assert "Friends" in parsed.intent.reference_titles
-            assert ToneType.LIGHT in parsed.intent.tones
-            assert EmotionType.JOY in parsed.intent.emotions
-            assert parsed.constraints.media_type == MediaType.TV_SHOW
-            assert parsed.intent.is_mood_query is True
+        first, second = (call.kwargs for call in mock_generate.call_args_list)
+        assert "space movies" in first["prompt"]
+        assert "<USER_QUERY>" not in first["prompt"]
+        assert "heist movies" in second["prompt"]
+        assert first["system_prompt"] is second["system_prompt"]
 
     def test_parse_llm_with_fallback(self, query_parser):
         """Test LLM failure triggers fallback"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("API error")
-        ):
-            parsed = query_parser.parse("action movies")
+        parsed = query_parser.parse("action movies")
 
-            # Should fall back to rule-based
-            assert parsed.parsing_method == "rule-based"
-            assert parsed.confidence_score == 0.5
+        # Should fall back to rule-based
+        assert parsed.parsing_method == "rule-based"
+        assert parsed.confidence_score == 0.5
 
-    def test_parse_llm_no_fallback_raises(self):
+    def test_parse_llm_invalid_response_falls_back(self, query_parser, monkeypatch):
+        """Test an unparseable LLM response triggers the fallback too"""
+        error = LLMInvalidResponseError("Invalid JSON response")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _raising(error))
+        parsed = query_parser.parse("action movies")
+
+        assert parsed.parsing_method == "rule-based"
+
+    def test_parse_llm_no_fallback_raises(self, llm_client):
         """Test LLM failure without fallback raises exception"""
-        config = QueryParserConfig(enable_fallback=False)
-        with patch("app.services.llm_client.settings") as mock_settings:
-            mock_settings.LLM_PROVIDER = "groq"
-            mock_settings.GROQ_API_KEY = "test_key"
-            mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
-            parser = QueryParser(config=config)
+        config = QueryParserConfig(enable_fallback=False, fast_path_trivial=False)
+        parser = QueryParser(config=config, llm_client=llm_client)
 
-            with patch.object(
-                parser.llm_client, "generate_json", side_effect=LLMClientError("API error")
-            ):
-                with pytest.raises(LLMClientError):
-                    parser.parse("action movies")
+        with pytest.raises(LLMClientError):
+            parser.parse("action movies")
 
-    def test_parse_with_llm_multiple_negative_patterns(self, query_parser):
+    def test_parse_with_llm_multiple_negative_patterns(self, query_parser, monkeypatch):
         """Test LLM parsing extracts multiple types of negative patterns"""
         mock_response = {
             "themes": ["suspense", "mystery"],
@@ -391,16 +493,16 @@ class TestLLMParser:
             "search_text": "suspense mystery psychological thriller",
         }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("thriller without jump scares, no violence and avoid gore")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _stub(mock_response))
+        parsed = query_parser.parse("thriller without jump scares, no violence and avoid gore")
 
-            assert parsed.parsing_method == "llm"
-            assert "jump scares" in parsed.intent.undesired_themes
-            assert "violence" in parsed.intent.undesired_themes
-            assert "gore" in parsed.intent.undesired_themes
-            assert ToneType.COMEDIC in parsed.intent.undesired_tones
+        assert parsed.parsing_method == "llm"
+        assert "jump scares" in parsed.intent.undesired_themes
+        assert "violence" in parsed.intent.undesired_themes
+        assert "gore" in parsed.intent.undesired_themes
+        assert ToneType.COMEDIC in parsed.intent.undesired_tones
 
-    def test_parse_with_llm_invalid_tone_values(self, query_parser):
+    def test_parse_with_llm_invalid_tone_values(self, query_parser, monkeypatch):
         """Test LLM parsing gracefully handles invalid tone enum values"""
         mock_response = {
             "themes": ["action", "adventure"],
@@ -433,21 +535,21 @@ class TestLLMParser:
             "search_text": "action adventure dark serious",
         }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("dark serious action movies")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _stub(mock_response))
+        parsed = query_parser.parse("dark serious action movies")
 
-            # Should only contain valid tone values (as strings due to use_enum_values=True)
-            assert "dark" in parsed.intent.tones
-            assert "serious" in parsed.intent.tones
-            # Invalid tones should be skipped - only 2 valid tones
-            assert len(parsed.intent.tones) == 2
+        # Should only contain valid tone values (as strings due to use_enum_values=True)
+        assert "dark" in parsed.intent.tones
+        assert "serious" in parsed.intent.tones
+        # Invalid tones should be skipped - only 2 valid tones
+        assert len(parsed.intent.tones) == 2
 
-            # Same for undesired tones
-            assert "light" in parsed.intent.undesired_tones
-            # Invalid undesired tone should be skipped - only 1 valid tone
-            assert len(parsed.intent.undesired_tones) == 1
+        # Same for undesired tones
+        assert "light" in parsed.intent.undesired_tones
+        # Invalid undesired tone should be skipped - only 1 valid tone
+        assert len(parsed.intent.undesired_tones) == 1
 
-    def test_parse_with_llm_invalid_emotion_values(self, query_parser):
+    def test_parse_with_llm_invalid_emotion_values(self, query_parser, monkeypatch):
         """Test LLM parsing gracefully handles invalid emotion enum values"""
         mock_response = {
             "themes": ["horror", "suspense"],
@@ -475,17 +577,17 @@ class TestLLMParser:
             "search_text": "horror suspense fear thrill",
         }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("scary thriller that makes you afraid")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _stub(mock_response))
+        parsed = query_parser.parse("scary thriller that makes you afraid")
 
-            # Should only contain valid emotion values (as strings due to use_enum_values=True)
-            assert "fear" in parsed.intent.emotions
-            assert "thrill" in parsed.intent.emotions
-            assert "joy" in parsed.intent.emotions
-            # Invalid emotions should be skipped - should have exactly 3 valid emotions
-            assert len(parsed.intent.emotions) == 3
+        # Should only contain valid emotion values (as strings due to use_enum_values=True)
+        assert "fear" in parsed.intent.emotions
+        assert "thrill" in parsed.intent.emotions
+        assert "joy" in parsed.intent.emotions
+        # Invalid emotions should be skipped - should have exactly 3 valid emotions
+        assert len(parsed.intent.emotions) == 3
 
-    def test_parse_with_llm_all_invalid_enum_values(self, query_parser):
+    def test_parse_with_llm_all_invalid_enum_values(self, query_parser, monkeypatch):
         """Test LLM parsing when ALL enum values are invalid"""
         mock_response = {
             "themes": ["action"],
@@ -513,18 +615,18 @@ class TestLLMParser:
             "search_text": "action",
         }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("action movies")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _stub(mock_response))
+        parsed = query_parser.parse("action movies")
 
-            # All invalid enum values should result in empty lists
-            assert parsed.intent.tones == []
-            assert parsed.intent.emotions == []
-            assert parsed.intent.undesired_tones == []
-            # Other fields should still be populated
-            assert "action" in parsed.intent.themes
-            assert "Action" in parsed.constraints.genres
+        # All invalid enum values should result in empty lists
+        assert parsed.intent.tones == []
+        assert parsed.intent.emotions == []
+        assert parsed.intent.undesired_tones == []
+        # Other fields should still be populated
+        assert "action" in parsed.intent.themes
+        assert "Action" in parsed.constraints.genres
 
-    def test_parse_with_llm_empty_enum_lists(self, query_parser):
+    def test_parse_with_llm_empty_enum_lists(self, query_parser, monkeypatch):
         """Test LLM parsing when enum lists are empty"""
         mock_response = {
             "themes": ["mystery"],
@@ -552,15 +654,15 @@ class TestLLMParser:
             "search_text": "mystery",
         }
 
-        with patch.object(query_parser.llm_client, "generate_json", return_value=mock_response):
-            parsed = query_parser.parse("mystery movies")
+        monkeypatch.setattr(query_parser.llm_client, "generate_json", _stub(mock_response))
+        parsed = query_parser.parse("mystery movies")
 
-            # Empty lists should remain empty
-            assert parsed.intent.tones == []
-            assert parsed.intent.emotions == []
-            assert parsed.intent.undesired_tones == []
-            # Other fields should still work
-            assert "mystery" in parsed.intent.themes
+        # Empty lists should remain empty
+        assert parsed.intent.tones == []
+        assert parsed.intent.emotions == []
+        assert parsed.intent.undesired_tones == []
+        # Other fields should still work
+        assert "mystery" in parsed.intent.themes
 
 
 # --- Edge Cases and Error Handling ---
@@ -569,40 +671,274 @@ class TestLLMParser:
 class TestEdgeCases:
     """Test edge cases and error handling"""
 
-    def test_parse_empty_query(self, query_parser):
-        """Test parsing empty query raises error"""
-        with pytest.raises(ValueError, match="Query cannot be empty"):
-            query_parser.parse("")
-
-    def test_parse_whitespace_query(self, query_parser):
-        """Test parsing whitespace-only query raises error"""
+    @pytest.mark.parametrize("query", ["", "   "])
+    def test_parse_empty_query(self, query_parser, query):
+        """Test parsing an empty or whitespace-only query raises error"""
         with pytest.raises(ValueError, match="Query cannot be empty"):
-            query_parser.parse("   ")
+            query_parser.parse(query)
 
     def test_parse_very_long_query(self, query_parser):
         """Test parsing very long query"""
         long_query = "action " * 100
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("Too long")
-        ):
-            parsed = query_parser.parse(long_query)
-            assert parsed.parsing_method == "rule-based"
+        parsed = query_parser.parse(long_query)
+        assert parsed.parsing_method == "rule-based"
 
     def test_parse_special_characters(self, query_parser):
         """Test parsing query with special characters"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("Failed")
-        ):
-            parsed = query_parser.parse("action movies with $$$$ budget!!!")
-            assert parsed.intent.raw_query == "action movies with $$$$ budget!!!"
+        parsed = query_parser.parse("action movies with $$$$ budget!!!")
+        assert parsed.intent.raw_query == "action movies with $$$$ budget!!!"
 
     def test_parse_non_english_query(self, query_parser):
         """Test parsing non-English query"""
+        parsed = query_parser.parse("películas de acción")
+        assert parsed.parsing_method == "rule-based"
+        assert parsed.intent.keywords == ["películas", "acción"]
+
+    def test_keywords_keep_hyphenated_words(self, query_parser):
+        """Test rule-based keywords keep compounds like "sci-fi" whole"""
+        parsed = query_parser.parse("Sci-Fi movies from 2015-2020")
+        assert parsed.intent.keywords[0] == "sci-fi"
+        assert parsed.constraints.year_max == 2020
+
+
+class TestParseCache:
+    """Test caching of LLM parse results"""
+
+    def test_repeated_query_skips_llm(self, query_parser, mock_llm_response_interstellar):
+        """Test identical queries (modulo case/whitespace) hit the cache"""
+        with patch.object(
+            query_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            first = query_parser.parse("Movies like Interstellar")
+            second = query_parser.parse("  movies   like interstellar ")
+
+            assert mock_generate.call_count == 1
+            assert second.intent.raw_query == "movies   like interstellar"
+            assert second.intent.themes == first.intent.themes
+
+    def test_cached_result_is_copied(
+        self, query_parser, mock_llm_response_interstellar, monkeypatch
+    ):
+        """Test mutating a returned result does not affect the cache"""
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+        query_parser.parse("space movies").intent.themes.append("mutated")
+        assert "mutated" not in query_parser.parse("space movies").intent.themes
+
+    def test_fallback_results_not_cached(
+        self, query_parser, mock_llm_response_interstellar, monkeypatch
+    ):
+        """Test rule-based results are not cached, so the LLM is retried"""
+        assert query_parser.parse("space movies").parsing_method == "rule-based"
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+        assert query_parser.parse("space movies").parsing_method == "llm"
+
+    def test_cache_disabled_and_expiry(self, query_parser, mock_llm_response_interstellar):
+        """Test cache_results=False and cache_ttl both force a fresh LLM call"""
+        with patch.object(
+            query_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            query_parser.parse("space movies")
+            with patch("app.services.query_parser.time.monotonic", return_value=1e12):
+                query_parser.parse("space movies")
+            assert mock_generate.call_count == 2
+
+            query_parser.config.cache_results = False
+            query_parser.parse("space movies")
+            assert mock_generate.call_count == 3
+
+    def test_shared_cache_reused_across_parsers(
+        self, query_parser, mock_llm_response_interstellar, monkeypatch
+    ):
+        """Test a second parser (another worker/process) reuses results via the shared cache"""
+        store: dict[str, object] = {}
+        shared = MagicMock()
+        shared.get.side_effect = store.get
+        shared.set.side_effect = lambda key, value, ttl=None: store.__setitem__(key, value)
+        query_parser.shared_cache = shared
+
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+        first = query_parser.parse("Movies like Interstellar")
+        assert len(store) == 1
+        shared.get.reset_mock()
+
+        # Same provider, model and prompts, so the same shared-cache namespace
+        other = QueryParser(
+            config=query_parser.config, llm_client=query_parser.llm_client, shared_cache=shared
+        )
+        with patch.object(other.llm_client, "generate_json") as mock_generate:
+            second = other.parse("movies like interstellar")
+            # The second lookup is served from the other parser's local cache
+            other.parse("movies like interstellar")
+
+        mock_generate.assert_not_called()
+        assert shared.get.call_count == 1
+        assert second.model_dump(exclude={"intent"}) == first.model_dump(exclude={"intent"})
+        assert second.intent.raw_query == "movies like interstellar"
+
+    def test_invalid_shared_entry_ignored(self, query_parser, mock_llm_response_interstellar):
+        """Test an unusable shared-cache entry falls through to the LLM"""
+        query_parser.shared_cache = MagicMock()
+        query_parser.shared_cache.get.return_value = {"not": "a parsed query"}
         with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("Failed")
+            query_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            assert query_parser.parse("space movies").parsing_method == "llm"
+        mock_generate.assert_called_once()
+
+
+class TestFastPath:
+    """Test trivial queries skip the LLM"""
+
+    @pytest.fixture()
+    def fast_parser(self, query_parser):
+        query_parser.config.fast_path_trivial = True
+        return query_parser
+
+    @pytest.mark.parametrize(
+        "query", ["action movies", "Comedy TV shows", "sci-fi films from 2015-2020", "dramas"]
+    )
+    def test_trivial_query_skips_llm(self, fast_parser, query):
+        """Test genre/media/year-only queries are parsed by rules without an LLM call"""
+        with patch.object(fast_parser.llm_client, "generate_json") as mock_generate:
+            parsed = fast_parser.parse(query)
+
+        mock_generate.assert_not_called()
+        assert parsed.parsing_method == "rule-based-fast"
+        assert parsed.confidence_score == 0.8
+        assert parsed.constraints.genres
+
+    @pytest.mark.parametrize(
+        "query", ["dark action movies", "movies like Inception", "comedy without romance"]
+    )
+    def test_subjective_query_uses_llm(
+        self, fast_parser, query, mock_llm_response_interstellar
+    ):
+        """Test queries with subjective or comparative words still go to the LLM"""
+        with patch.object(
+            fast_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            parsed = fast_parser.parse(query)
+
+        mock_generate.assert_called_once()
+        assert parsed.parsing_method == "llm"
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "comedy movies 2019",
+            "horror films in 1999",
+            "2015 movies or 2018 shows",
+            "action and comedy",
+        ],
+    )
+    def test_unconsumed_words_use_llm(self, fast_parser, query, mock_llm_response_interstellar):
+        """Test years and connectives the rules would drop keep the query on the LLM path"""
+        with patch.object(
+            fast_parser.llm_client, "generate_json", return_value=mock_llm_response_interstellar
+        ) as mock_generate:
+            parsed = fast_parser.parse(query)
+
+        mock_generate.assert_called_once()
+        assert parsed.parsing_method == "llm"
+
+    def test_fast_path_keeps_years_and_media(self, fast_parser):
+        """Test a fast-parsed query keeps its year bound and film media type"""
+        with patch.object(fast_parser.llm_client, "generate_json") as mock_generate:
+            parsed = fast_parser.parse("horror films from 1999")
+
+        mock_generate.assert_not_called()
+        assert parsed.parsing_method == "rule-based-fast"
+        assert parsed.constraints.genres == ["Horror"]
+        assert parsed.constraints.media_type == MediaType.MOVIE
+        assert parsed.constraints.year_min == 1999
+
+
+class TestAsyncParse:
+    """Test the async parse entrypoints"""
+
+    @pytest.mark.asyncio
+    async def test_aparse_uses_llm(self, query_parser, mock_llm_response_interstellar, monkeypatch):
+        """Test aparse returns the same LLM result as parse"""
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+        parsed = await query_parser.aparse("dark sci-fi movies like Interstellar")
+
+        assert parsed.parsing_method == "llm"
+        assert "Interstellar" in parsed.intent.reference_titles
+
+    @pytest.mark.asyncio
+    async def test_aparse_shared_cache_io_off_event_loop(
+        self, query_parser, mock_llm_response_interstellar, monkeypatch
+    ):
+        """Test aparse does its blocking shared-cache reads and writes in a worker thread"""
+        loop_thread = threading.get_ident()
+        io_threads: list[int] = []
+
+        def record_thread(*_args: object, **_kwargs: object) -> None:
+            io_threads.append(threading.get_ident())
+
+        shared = MagicMock()
+        shared.get.side_effect = record_thread
+        shared.set.side_effect = record_thread
+        query_parser.shared_cache = shared
+        monkeypatch.setattr(
+            query_parser.llm_client, "generate_json", _stub(mock_llm_response_interstellar)
+        )
+
+        parsed = await query_parser.aparse("dark sci-fi movies like Interstellar")
+
+        assert parsed.parsing_method == "llm"
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+
+    @pytest.mark.asyncio
+    async def test_aparse_many_keeps_order_and_errors(self, query_parser):
+        """Test aparse_many falls back per query and returns exceptions in place"""
+        results = await query_parser.aparse_many(["action movies", "  ", "comedy tv shows"])
+
+        assert results[0].constraints.media_type == MediaType.MOVIE
+        assert isinstance(results[1], ValueError)
+        assert results[2].constraints.media_type == MediaType.TV_SHOW
+        assert all(r.parsing_method == "rule-based" for r in (results[0], results[2]))
+
+
+class TestBatchOffline:
+    """Test offline parsing through the LLM batch API"""
+
+    def test_parse_batch_offline(self, query_parser, mock_llm_response_interstellar, tmp_path):
+        """Test batch results are parsed, missing ones fall back, and LLM results are cached"""
+        client = query_parser.llm_client
+        with (
+            patch.object(client, "submit_batch", return_value="batch_1") as mock_submit,
+            patch.object(client, "poll_batch", return_value={"status": "completed"}),
+            patch.object(
+                client,
+                "batch_results",
+                return_value={"0": json.dumps(mock_llm_response_interstellar)},
+            ),
         ):
-            parsed = query_parser.parse("películas de acción")
-            assert parsed.parsing_method == "rule-based"
+            results = query_parser.parse_batch_offline(
+                ["dark space movies", " ", "action movies", "dark space movies"],
+                tmp_path / "batch.jsonl",
+                poll_interval=0,
+            )
+
+        requests, path = mock_submit.call_args.args
+        assert [r["custom_id"] for r in requests] == ["0", "1"]
+        assert path == tmp_path / "batch.jsonl"
+        assert results["dark space movies"].parsing_method == "llm"
+        assert results["action movies"].parsing_method == "rule-based"
+
+        with patch.object(client, "generate_json") as mock_generate:
+            assert query_parser.parse("dark space movies").parsing_method == "llm"
+            mock_generate.assert_not_called()
 
 
 # --- Integration Tests ---
@@ -623,27 +959,20 @@ class TestQueryParserIntegration:
         self, query_parser, query, expected_media_type, expected_genres
     ):
         """Test parsing multiple queries with rule-based parser"""
-        with patch.object(
-            query_parser.llm_client, "generate_json", side_effect=LLMClientError("Failed")
-        ):
-            parsed = query_parser.parse(query)
-            assert parsed.constraints.media_type == expected_media_type
-            # At least one expected genre should be present
-            assert (
-                any(genre in parsed.constraints.genres for genre in expected_genres)
-                or len(parsed.constraints.genres) == 0
-            )
+        parsed = query_parser.parse(query)
+        assert parsed.constraints.media_type == expected_media_type
+        # At least one expected genre should be present
+        assert (
+            any(genre in parsed.constraints.genres for genre in expected_genres)
+            or len(parsed.constraints.genres) == 0
+        )
 
     def test_context_manager(self):
         """Test QueryParser as context manager"""
-        with patch("app.services.llm_client.settings") as mock_settings:
-            mock_settings.LLM_PROVIDER = "groq"
-            mock_settings.GROQ_API_KEY = "test_key"
-            mock_settings.GROQ_MODEL = "llama-3.1-70b-versatile"
-            with QueryParser() as parser:
-                assert parser is not None
-                with patch.object(
-                    parser.llm_client, "generate_json", side_effect=LLMClientError("Failed")
-                ):
-                    parsed = parser.parse("action movies")
-                    assert parsed is not None
+        with QueryParser() as parser:
+            assert parser is not None
+            with patch.object(
+                parser.llm_client, "generate_json", side_effect=LLMClientError("Failed")
+            ):
+                parsed = parser.parse("action movies")
+                assert parsed is not None
@@ -17,74 +17,50 @@ from app.schemas.query import (
     QueryIntent,
     ToneType,
 )
+from app.schemas.search import SearchFilters
+
+
+# Constraint payloads built once and validated with model_validate
+_VALID_CONSTRAINTS = (
+    {"year_min": 2000, "year_max": 2023},
+    {"year_min": 2020, "year_max": 2020},  # year_max can equal year_min
+    {"year_min": 2000},
+    {"year_max": 2023},
+    {"rating_min": 7.5},
+    {"runtime_min": 90, "runtime_max": 180},
+)
+_OUT_OF_RANGE_CONSTRAINTS = (
+    {"year_min": 1800},
+    {"year_max": 1800},
+    {"year_min": -100},
+    {"rating_min": -1.0},
+    {"rating_min": 11.0},
+)
+_INVERTED_YEAR_RANGE = {"year_min": 2020, "year_max": 2010}
 
 
 class TestQueryConstraintsValidation:
     """Test QueryConstraints validation"""
 
-    def test_valid_year_range(self):
-        """Test valid year range"""
-        constraints = QueryConstraints(year_min=2000, year_max=2023)
-        assert constraints.year_min == 2000
-        assert constraints.year_max == 2023
-
-    def test_year_max_equals_year_min(self):
-        """Test year_max can equal year_min"""
-        constraints = QueryConstraints(year_min=2020, year_max=2020)
-        assert constraints.year_min == 2020
-        assert constraints.year_max == 2020
+    @pytest.mark.parametrize("data", _VALID_CONSTRAINTS)
+    def test_accepts_valid_values(self, data):
+        """Test valid years, ratings and runtimes are kept, other years left unset"""
+        constraints = QueryConstraints.model_validate(data)
+        for field, value in data.items():
+            assert getattr(constraints, field) == value
+        for field in {"year_min", "year_max"} - data.keys():
+            assert getattr(constraints, field) is None
+
+    @pytest.mark.parametrize("data", _OUT_OF_RANGE_CONSTRAINTS)
+    def test_rejects_out_of_range_values(self, data):
+        """Test years before 1900 and ratings outside 0-10 raise ValidationError"""
+        with pytest.raises(ValidationError):
+            QueryConstraints.model_validate(data)
 
     def test_year_max_less_than_year_min_raises(self):
         """Test that year_max < year_min raises ValidationError"""
         with pytest.raises(ValidationError, match="year_max.*must be >= year_min"):
-            QueryConstraints(year_min=2020, year_max=2010)
-
-    def test_year_min_below_1900_raises(self):
-        """Test that year_min < 1900 raises ValidationError"""
-        with pytest.raises(ValidationError):
-            QueryConstraints(year_min=1800)
-
-    def test_year_max_below_1900_raises(self):
-        """Test that year_max < 1900 raises ValidationError"""
-        with pytest.raises(ValidationError):
-            QueryConstraints(year_max=1800)
-
-    def test_only_year_min_valid(self):
-        """Test providing only year_min is valid"""
-        constraints = QueryConstraints(year_min=2000)
-        assert constraints.year_min == 2000
-        assert constraints.year_max is None
-
-    def test_only_year_max_valid(self):
-        """Test providing only year_max is valid"""
-        constraints = QueryConstraints(year_max=2023)
-        assert constraints.year_min is None
-        assert constraints.year_max == 2023
-
-    def test_negative_year_raises(self):
-        """Test negative years are rejected"""
-        with pytest.raises(ValidationError):
-            QueryConstraints(year_min=-100)
-
-    def test_rating_min_validation(self):
-        """Test rating_min is between 0-10"""
-        # Valid
-        constraints = QueryConstraints(rating_min=7.5)
-        assert constraints.rating_min == 7.5
-
-        # Invalid - below 0
-        with pytest.raises(ValidationError):
-            QueryConstraints(rating_min=-1.0)
-
-        # Invalid - above 10
-        with pytest.raises(ValidationError):
-            QueryConstraints(rating_min=11.0)
-
-    def test_runtime_constraints(self):
-        """Test runtime min/max"""
-        constraints = QueryConstraints(runtime_min=90, runtime_max=180)
-        assert constraints.runtime_min == 90
-        assert constraints.runtime_max == 180
+            QueryConstraints.model_validate(_INVERTED_YEAR_RANGE)
 
     def test_media_type_enum(self):
         """Test MediaType enum values"""
@@ -204,3 +180,19 @@ class TestEdgeCases:
         constraints = QueryConstraints(year_min=2025, year_max=2030)
         assert constraints.year_min == 2025
         assert constraints.year_max == 2030
+
+    def test_models_are_frozen(self):
+        """Test parse results reject in-place field assignment"""
+        constraints = QueryConstraints(year_min=2000)
+        with pytest.raises(ValidationError):
+            constraints.year_min = 2010
+        with pytest.raises(ValidationError):
+            QueryIntent(raw_query="test").raw_query = "other"
+
+    def test_merge_with_filters_returns_new_instance(self):
+        """Test merging explicit filters leaves the parsed constraints unchanged"""
+        constraints = QueryConstraints(genres=["Drama"], year_min=2000)
+        merged = constraints.merge_with_filters(SearchFilters(year_min=2010, media_type="movie"))
+
+        assert (merged.year_min, merged.genres, merged.media_type) == (2010, [], MediaType.MOVIE)
+        assert (constraints.year_min, constraints.genres) == (2000, ["Drama"])
@@ -10,17 +10,16 @@ This module tests the Repository pattern implementation:
 from datetime import datetime
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import false, insert
 
-from app.core.database import Base
-from app.models.media import Cast, Genre, Movie
+from app.models.media import Cast, Genre, Media, MediaEmbedding, Movie, media_genres
 from app.repositories.movie_repository import (
     CastRepository,
     GenreRepository,
     KeywordRepository,
     MovieRepository,
 )
+from tests.helpers import count_queries
 
 
 # =============================================================================
@@ -28,19 +27,14 @@ from app.repositories.movie_repository import (
 # =============================================================================
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
+# ``db_session`` comes from tests/conftest.py
 
-    TestingSessionLocal = sessionmaker(bind=engine)
-    session = TestingSessionLocal()
-
-    yield session
-
-    session.close()
-    Base.metadata.drop_all(engine)
+# Release dates for sample_movies, built once (datetimes are immutable)
+_D_1999 = datetime(1999, 10, 15)
+_D_1994 = datetime(1994, 7, 6)
+_D_2010 = datetime(2010, 7, 16)
+_D_2008 = datetime(2008, 7, 18)
+_D_2020 = datetime(2020, 1, 1)
 
 
 @pytest.fixture()
@@ -73,8 +67,7 @@ def sample_movies(db_session, genre_repo):
     # Create genres
     action = Genre(tmdb_id=28, name="Action")
     scifi = Genre(tmdb_id=878, name="Science Fiction")
-    genre_repo.create(action)
-    genre_repo.create(scifi)
+    genre_repo.create_many([action, scifi])
 
     # Create movies
     movies = [
@@ -85,7 +78,7 @@ def sample_movies(db_session, genre_repo):
             popularity=85.0,
             vote_average=8.4,
             vote_count=25000,
-            release_date=datetime(1999, 10, 15),
+            release_date=_D_1999,
             adult=False,
         ),
         Movie(
@@ -95,7 +88,7 @@ def sample_movies(db_session, genre_repo):
             popularity=75.0,
             vote_average=8.5,
             vote_count=30000,
-            release_date=datetime(1994, 7, 6),
+            release_date=_D_1994,
             adult=False,
         ),
         Movie(
@@ -105,9 +98,8 @@ def sample_movies(db_session, genre_repo):
             popularity=90.0,
             vote_average=8.3,
             vote_count=35000,
-            release_date=datetime(2010, 7, 16),
+            release_date=_D_2010,
             adult=False,
-            embedding_vector=[0.1, 0.2, 0.3],
         ),
         Movie(
             tmdb_id=155,
@@ -116,7 +108,7 @@ def sample_movies(db_session, genre_repo):
             popularity=95.0,
             vote_average=8.5,
             vote_count=40000,
-            release_date=datetime(2008, 7, 18),
+            release_date=_D_2008,
             adult=False,
         ),
         Movie(
@@ -126,18 +118,36 @@ def sample_movies(db_session, genre_repo):
             popularity=65.0,
             vote_average=7.5,
             vote_count=5000,
-            release_date=datetime(2020, 1, 1),
+            release_date=_D_2020,
             adult=False,
         ),
     ]
 
-    for movie in movies:
-        db_session.add(movie)
-
-    # Add genres to some movies
-    movies[2].genres.append(action)  # Inception
-    movies[2].genres.append(scifi)
-    movies[3].genres.append(action)  # The Dark Knight
+    # One batched INSERT per table instead of a unit-of-work flush per object:
+    # the media anchors first, then the movies pointing at them
+    media_ids = db_session.scalars(
+        insert(Media).returning(Media.id, sort_by_parameter_order=True),
+        [{"content_type": "Movie"}] * len(movies),
+    ).all()
+    for movie, media_id in zip(movies, media_ids, strict=True):
+        movie.media_id = media_id
+    # return_defaults fetches the generated movie ids the tests look up
+    db_session.bulk_save_objects(movies, return_defaults=True)
+
+    # Only Inception has an embedding
+    db_session.execute(
+        insert(MediaEmbedding), [{"media_id": movies[2].media_id, "embedding": [0.1] * 768}]
+    )
+
+    # Add genres to some movies with a single executemany on the association table
+    db_session.execute(
+        media_genres.insert(),
+        [
+            {"media_id": movies[2].media_id, "genre_id": action.id},  # Inception
+            {"media_id": movies[2].media_id, "genre_id": scifi.id},
+            {"media_id": movies[3].media_id, "genre_id": action.id},  # The Dark Knight
+        ],
+    )
 
     db_session.commit()
 
@@ -154,13 +164,34 @@ class TestBaseRepository:
 
     def test_create(self, movie_repo):
         """Test creating an entity."""
-        movie = Movie(tmdb_id=123, title="Test Movie")
+        movie = Movie(tmdb_id=123, title="Test Movie", media=Media(content_type="Movie"))
         created = movie_repo.create(movie)
 
         assert created.id is not None
         assert created.tmdb_id == 123
         assert created.title == "Test Movie"
 
+    def test_create_many(self, genre_repo):
+        """Test creating several entities in one batch assigns their IDs."""
+        genres = genre_repo.create_many(
+            [Genre(tmdb_id=10, name="Western"), Genre(tmdb_id=11, name="War")]
+        )
+
+        assert all(genre.id is not None for genre in genres)
+        assert genre_repo.count() == 2
+
+    def test_create_many_reloads_batch_in_one_query(self, db_session, genre_repo):
+        """Test created entities come back loaded with one SELECT, not one per object."""
+        db_session.expire_on_commit = True  # As in the app's SessionLocal
+        genres = [Genre(tmdb_id=10 + i, name=f"Genre {i}") for i in range(5)]
+
+        with count_queries(db_session) as queries:
+            genre_repo.create_many(genres)
+            names = [genre.name for genre in genres]
+
+        assert names == [f"Genre {i}" for i in range(5)]
+        assert sum(q.lstrip().upper().startswith("SELECT") for q in queries) == 1
+
     def test_get_by_id(self, movie_repo, sample_movies):
         """Test retrieving entity by ID."""
         movie = sample_movies[0]
@@ -254,6 +285,21 @@ class TestMovieRepository:
         assert len(results) > 0
         assert any(m.title == "Fight Club" for m in results)
 
+    def test_search_by_title_prefix(self, movie_repo, sample_movies):
+        """Test prefix search only matches titles starting with the query."""
+        assert movie_repo.search_by_title("Club", prefix=True) == []
+
+        results = movie_repo.search_by_title("fight", prefix=True)
+        assert [m.title for m in results] == ["Fight Club"]
+
+    def test_search_by_title_matches_wildcards_literally(self, movie_repo, sample_movies):
+        """Test LIKE wildcards in the query match only themselves."""
+        assert movie_repo.search_by_title("%") == []
+        assert movie_repo.search_by_title("_", prefix=True) == []
+
+        movie_repo.upsert_movie({"tmdb_id": 1, "title": "100% Wolf"})
+        assert [m.title for m in movie_repo.search_by_title("100%")] == ["100% Wolf"]
+
     def test_filter_by_language(self, movie_repo, sample_movies):
         """Test filtering movies by language."""
         # Filter English movies
@@ -296,7 +342,7 @@ class TestMovieRepository:
 
         # Verify none have embeddings
         for movie in movies:
-            assert movie.embedding_vector is None
+            assert movie.media.embedding is None
 
     def test_get_movies_with_embeddings(self, movie_repo, sample_movies):
         """Test finding movies with embeddings."""
@@ -338,11 +384,61 @@ class TestMovieRepository:
         assert movie.title == "Fight Club (Updated)"
         assert movie.popularity == 99.9
 
+    def test_upsert_movies_batch(self, movie_repo, sample_movies):
+        """Test upserting several movies at once returns them in input order."""
+        movies = movie_repo.upsert_movies(
+            [
+                {"tmdb_id": 778, "title": "Another New Movie"},
+                {"tmdb_id": 550, "popularity": 99.9},  # Existing Fight Club
+                {"tmdb_id": 777, "title": "New Movie", "original_language": "en"},
+            ]
+        )
+
+        assert [m.tmdb_id for m in movies] == [778, 550, 777]
+        assert movies[1].title == "Fight Club"
+        assert movies[1].popularity == 99.9
+        assert movies[0].media_id != movies[2].media_id
+        assert movie_repo.get_total_movies() == len(sample_movies) + 2
+
+    def test_upsert_movies_deletes_unused_anchor(self, movie_repo, sample_movies, monkeypatch):
+        """Test a movie inserted after the lookup keeps its anchor and no new one is left behind."""
+        fight_club = next(m for m in sample_movies if m.tmdb_id == 550)
+        anchors_before = movie_repo.db.query(Media).count()
+
+        # Make the existing-movie lookup miss, as if Fight Club was inserted concurrently
+        real_query = movie_repo.db.query
+
+        def stale_lookup(*entities):
+            query = real_query(*entities)
+            if len(entities) == 2 and entities[1] is Movie.media_id:
+                query = query.filter(false())
+            return query
+
+        monkeypatch.setattr(movie_repo.db, "query", stale_lookup)
+        [movie] = movie_repo.upsert_movies([{"tmdb_id": 550, "title": "Fight Club (Updated)"}])
+
+        assert movie.title == "Fight Club (Updated)"
+        assert movie.media_id == fight_club.media_id
+        assert real_query(Media).count() == anchors_before
+
+    def test_upsert_movies_requires_tmdb_id(self, movie_repo):
+        """Test upserting a row without tmdb_id raises ValueError."""
+        with pytest.raises(ValueError, match="tmdb_id is required"):
+            movie_repo.upsert_movies([{"tmdb_id": 1, "title": "A"}, {"title": "B"}])
+
     def test_get_total_movies(self, movie_repo, sample_movies):
         """Test counting total movies."""
         total = movie_repo.get_total_movies()
         assert total == len(sample_movies)
 
+    def test_get_total_movies_approx_falls_back_to_exact(self, movie_repo, sample_movies):
+        """Test the estimate is an exact count outside PostgreSQL."""
+        assert movie_repo.get_total_movies_approx() == len(sample_movies)
+
+    def test_get_total_movies_approx_without_fallback(self, movie_repo, sample_movies):
+        """Test no estimate and no exact fallback yields None (SQLite has no pg_class)."""
+        assert movie_repo.get_total_movies_approx(exact_fallback=False) is None
+
 
 # =============================================================================
 # GenreRepository Tests
@@ -378,8 +474,7 @@ class TestGenreRepository:
             Genre(tmdb_id=3, name="Drama"),
         ]
 
-        for genre in genres_data:
-            genre_repo.create(genre)
+        genre_repo.create_many(genres_data)
 
         all_genres = genre_repo.get_all_genres()
 
@@ -415,8 +510,7 @@ class TestCastRepository:
             Cast(tmdb_id=3, name="Leonardo DiCaprio", popularity=88.0),
         ]
 
-        for cast in cast_members:
-            cast_repo.create(cast)
+        cast_repo.create_many(cast_members)
 
         # Search for "Tom" should return both Hanks and Cruise
         results = cast_repo.search_by_name("Tom")
@@ -425,3 +519,15 @@ class TestCastRepository:
         assert all("Tom" in c.name for c in results)
         # Should be ordered by popularity
         assert results[0].name == "Tom Hanks"
+
+    def test_search_by_name_prefix(self, cast_repo):
+        """Test prefix search only matches names starting with the query."""
+        cast_repo.create_many(
+            [
+                Cast(tmdb_id=1, name="Tom Hanks", popularity=95.0),
+                Cast(tmdb_id=2, name="Leonardo DiCaprio", popularity=88.0),
+            ]
+        )
+
+        assert cast_repo.search_by_name("hanks", prefix=True) == []
+        assert [c.name for c in cast_repo.search_by_name("tom", prefix=True)] == ["Tom Hanks"]
@@ -9,12 +9,14 @@ Tests cover:
 - Explanation generation
 """
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.schemas.query import EmotionType, ParsedQuery, QueryConstraints, ToneType
 from app.services.exceptions import LLMClientError, LLMRateLimitError
+from app.services.llm_client import LLMClient, _completion_cache
 from app.services.reranker import (
     LLMReRanker,
     PromptTemplate,
@@ -705,3 +707,43 @@ def test_rerank_candidates_convenience_function(
 
     # Verify LLM was called
     mock_llm.generate_json.assert_called_once()
+
+
+def test_rerank_candidates_reuses_cached_completion(
+    monkeypatch,
+    sample_query,
+    sample_parsed_query,
+    sample_candidates,
+):
+    """Test identical re-rank requests from fresh rerankers call the LLM once"""
+    completion = json.dumps(
+        {
+            "ranked_movies": [{"movie_index": 0, "relevance_score": 0.95, "explanation": "Test"}],
+            "reasoning": "Test",
+        }
+    )
+    calls = []
+
+    def fake_ollama(*args):
+        calls.append(args)
+        return completion
+
+    llm_client = LLMClient(provider="ollama")
+    monkeypatch.setattr(llm_client, "_ollama_completion_with_retry", fake_ollama)
+    _completion_cache.clear()
+    try:
+        results = [
+            rerank_candidates(
+                candidates=sample_candidates,
+                user_query=sample_query,
+                parsed_query=sample_parsed_query,
+                top_k=1,
+                llm_client=llm_client,
+            )
+            for _ in range(2)
+        ]
+    finally:
+        _completion_cache.clear()
+
+    assert len(calls) == 1
+    assert results[0][0]["title"] == results[1][0]["title"] == "Interstellar"
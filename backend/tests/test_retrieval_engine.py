@@ -24,6 +24,10 @@ from app.services.retrieval_engine import (
 )
 
 
+# FP32 like the model's real output, so dtype regressions surface in tests
+_rng = np.random.default_rng(0)
+
+
 # =============================================================================
 # Fixtures
 # =============================================================================
@@ -33,7 +37,7 @@ from app.services.retrieval_engine import (
 def mock_embedding_service():
     """Mock embedding service."""
     service = Mock()
-    service.generate_embedding.return_value = np.random.randn(768)
+    service.generate_embedding.return_value = _rng.standard_normal(768, dtype=np.float32)
     return service
 
 
@@ -316,7 +320,7 @@ class TestVectorSearch:
         self, retrieval_engine, mock_vector_search
     ):
         """Test that _search_similar calls vector search service."""
-        query_embedding = np.random.randn(768)
+        query_embedding = _rng.standard_normal(768, dtype=np.float32)
 
         results = retrieval_engine._search_similar(
             query_embedding=query_embedding,
@@ -331,7 +335,7 @@ class TestVectorSearch:
 
     def test_search_similar_filters_by_similarity(self, retrieval_engine):
         """Test similarity threshold filtering."""
-        query_embedding = np.random.randn(768)
+        query_embedding = _rng.standard_normal(768, dtype=np.float32)
 
         results = retrieval_engine._search_similar(
             query_embedding=query_embedding,
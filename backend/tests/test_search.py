@@ -9,7 +9,7 @@ Follows the same pattern as test_sixty.py:
 """
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import FastAPI
@@ -116,7 +116,7 @@ def _build_search_client(
 
     # Query parser
     mock_parser = MagicMock()
-    mock_parser.parse.return_value = parsed_query or _make_parsed_query()
+    mock_parser.aparse = AsyncMock(return_value=parsed_query or _make_parsed_query())
     app.dependency_overrides[get_query_parser] = lambda: mock_parser
 
     # Retrieval engine
@@ -23,6 +23,7 @@ from app.services.exceptions import (
     IndexValidationError,
 )
 from app.services.vector_search import VectorSearchService, get_vector_search_service
+from app.utils.vector_utils import VectorNormalizer
 
 
 @pytest.fixture()
@@ -509,3 +510,42 @@ class TestSingletonPattern:
 
         # Note: In actual usage, these would be the same instance
         # This test just verifies we can reset for testing purposes
+
+
+class TestInt8Quantization:
+    """Test int8 quantization helpers used for compact similarity scoring"""
+
+    def test_roundtrip_within_tolerance(self, sample_embeddings):
+        """Test dequantized vectors stay within half a quantization step"""
+        embeddings, _ = sample_embeddings
+        codes, scales = VectorNormalizer.quantize_int8(embeddings)
+
+        assert codes.dtype == np.int8
+        assert scales.shape == (len(embeddings),)
+
+        restored = VectorNormalizer.dequantize_int8(codes, scales)
+        error = np.abs(restored - embeddings).max(axis=1)
+        assert np.all(error <= scales / 2 + 1e-6)
+
+    def test_zero_vector(self):
+        """Test all-zero vectors quantize to zero codes and zero similarity"""
+        vectors = np.zeros((2, 8), dtype=np.float32)
+        vectors[1, 0] = 1.0
+        codes, scales = VectorNormalizer.quantize_int8(vectors)
+
+        assert scales[0] == 0.0
+        assert not codes[0].any()
+
+        sims = VectorNormalizer.int8_cosine_similarity(codes[1], codes)
+        assert sims[0] == 0.0
+        assert sims[1] == pytest.approx(1.0)
+
+    def test_similarity_matches_float(self, sample_embeddings):
+        """Test int8 cosine similarity tracks float32 cosine similarity"""
+        embeddings, _ = sample_embeddings
+        codes, _ = VectorNormalizer.quantize_int8(embeddings)
+        sims = VectorNormalizer.int8_cosine_similarity(codes[0], codes)
+
+        normalized = VectorNormalizer.normalize_l2(embeddings)
+        expected = normalized @ normalized[0]
+        np.testing.assert_allclose(sims, expected, atol=1e-2)